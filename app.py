@@ -4,19 +4,30 @@ from src.session_manager import init_session_manager
 from src.middleware import init_middleware, login_required, logout_required, booking_login_required
 from src.error_handlers import init_error_handlers
 from src.logging_config import init_logging
-from src.pdf_generator import create_pdf_generator
-from src.email_service import send_booking_confirmation_email
+from src.pdf_generator import build_booking_pdf_data
+from src.pdf_cache import pdf_cache
+from src.email_service import send_booking_confirmation_email, email_executor
+from src.seat_holds import seat_hold_manager
+from src.poster_cache import poster_cache
+from src.poster_store import poster_store
+from src.poster_derivatives import poster_derivatives
 from src.database import (
     test_database_connection,
+    init_db_connection_scope,
+    init_row_models,
+    init_request_query_tracking,
+    query_budget,
     create_session_token,
     invalidate_session_token,
     validate_session_token,
     get_movies_with_showings_by_date,
     get_showing_by_id,
     get_seats_for_showing,
+    get_seats_by_ids,
     get_booking_by_id,
     get_customers_for_booking,
-    get_bookings_by_account_id,
+    get_bookings_page_by_account_id,
+    get_booking_totals_by_account_id,
     create_complete_booking_secure,
     check_seats_availability,
     get_age_pricing,
@@ -30,7 +41,7 @@ from src.database import (
     validate_signup_passwords,
     validate_login_data,
     is_showing_expired,
-    get_movie_poster,
+    get_movie_posters,
     get_poster_image_data
 )
 
@@ -46,6 +57,12 @@ init_logging(app)
 init_middleware(app)
 init_session_manager(app)
 init_error_handlers(app)
+init_db_connection_scope(app)
+init_row_models(app)
+init_request_query_tracking(app)
+
+# Application logger, configured by init_logging
+logger = app.logger
 
 # Test database connection
 test_database_connection()
@@ -71,6 +88,7 @@ def index():
     return render_template('index.html', storeUrl=True)
 
 @app.route('/movies')
+@query_budget(4)
 def movies():
     # Store this page as the last non-auth page
     session['last_non_auth_page'] = url_for('movies')
@@ -118,9 +136,10 @@ def movies():
             flash('Server unavailable, please try again later.', 'error')
             movies_list = []  # Show empty list instead of crashing
         else:
-            # Add poster information for each movie
+            # Add poster information for all movies with a single lookup
+            posters = get_movie_posters([movie['id'] for movie in movies_list]) or {}
             for movie in movies_list:
-                movie['poster'] = get_movie_poster(movie['id'])
+                movie['poster'] = posters.get(movie['id'])
                 
     except Exception as e:
         flash('Server unavailable, please try again later.', 'error')
@@ -145,21 +164,61 @@ def movies():
 
 @app.route('/poster/<int:poster_id>')
 def serve_poster(poster_id):
-    """Serve movie poster images from database"""
+    """Serve movie poster images from the poster file store, falling back to the database BLOB
+    
+    With a w query parameter, serves the resized variant closest to that
+    width instead, as WebP when the browser accepts it. The original image
+    is served, uncached, while the variants are being generated.
+    """
     try:
-        poster_data = get_poster_image_data(poster_id)
-        if not poster_data:
+        poster = poster_cache.get(poster_id, lambda: get_poster_image_data(poster_id))
+        if not poster:
             abort(404)
         
+        requested_width = request.args.get('w', type=int)
+        derivative_pending = False
+        if requested_width and requested_width > 0:
+            derivative = poster_derivatives.get_path(poster, requested_width,
+                                                     accept_webp='image/webp' in request.headers.get('Accept', ''))
+            if derivative:
+                path, mimetype = derivative
+                response = send_file(path, mimetype=mimetype, conditional=True, etag=True,
+                                     max_age=config.POSTER_DERIVATIVE_MAX_AGE_SECONDS)
+                response.cache_control.public = True
+                response.vary.add('Accept')
+                return response
+            derivative_pending = True
+        
         from flask import Response
-        return Response(
-            poster_data['image_data'],
-            mimetype=poster_data['mime_type'],
-            headers={
-                'Cache-Control': 'public, max-age=86400',  # Cache for 24 hours
-                'Content-Type': poster_data['mime_type']
-            }
-        )
+        # Images the file store couldn't write are only held in memory
+        in_store = poster_store.has(poster.content_hash)
+        if in_store and config.POSTER_ACCEL_REDIRECT_PREFIX:
+            # The front web server sends the file from the poster file store
+            response = Response(mimetype=poster.mime_type)
+            response.headers['X-Accel-Redirect'] = (
+                f"{config.POSTER_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{poster_store.relative_path_for(poster.content_hash)}"
+            )
+        elif in_store:
+            # Streamed from the file store, zero-copy on servers with wsgi.file_wrapper support
+            response = send_file(poster_store.path_for(poster.content_hash), mimetype=poster.mime_type,
+                                 conditional=False, etag=False)
+        else:
+            response = Response(poster.data, mimetype=poster.mime_type)
+        
+        if derivative_pending:
+            # Not cached under the variant URL, so the browser fetches the variant next time
+            response.cache_control.no_store = True
+            return response
+        
+        response.cache_control.public = True
+        response.cache_control.max_age = config.POSTER_CACHE_MAX_AGE_SECONDS
+        
+        # Content-hash ETag, answered with 304 Not Modified when the browser already has it
+        response.set_etag(poster.content_hash)
+        response = response.make_conditional(request)
+        if response.status_code == 304:
+            poster_cache.record_not_modified()
+        return response
     except Exception as e:
         print(f"Error serving poster {poster_id}: {e}")
         abort(404)
@@ -480,6 +539,7 @@ def settings():
         return redirect(url_for('index'))
 
 @app.route('/showing/<int:showing_id>/seats')
+@query_budget(6)
 @booking_login_required
 def showing_seats(showing_id):
     """Display seat selection page for a showing"""
@@ -495,8 +555,8 @@ def showing_seats(showing_id):
             flash('This showing has already finished or does not exist.', 'error')
             abort(404)
         
-        # Get seats for the showing
-        seats = get_seats_for_showing(showing_id)
+        # Get seats for the showing (seats held by other users show as occupied)
+        seats = get_seats_for_showing(showing_id, holder=get_seat_holder())
         if seats is None:
             flash('Unable to load seats. Please try again.', 'error')
             return redirect(url_for('movies'))
@@ -536,7 +596,8 @@ def booking_spectators():
             return redirect(url_for('movies'))
         
         # Verify seats are still available
-        if not check_seats_availability(selected_seats, showing_id):
+        holder = get_seat_holder()
+        if not check_seats_availability(selected_seats, showing_id, holder=holder):
             flash('Some selected seats are no longer available.', 'error')
             return redirect(url_for('showing_seats', showing_id=showing_id))
         
@@ -552,9 +613,13 @@ def booking_spectators():
             flash('This showing has already finished or does not exist.', 'error')
             abort(404)
         
+        # Hold the selected seats while the user fills in spectator information
+        if not seat_hold_manager.hold(showing_id, selected_seats, holder):
+            flash('Some selected seats are no longer available.', 'error')
+            return redirect(url_for('showing_seats', showing_id=showing_id))
+        
         # Get seat details for the selected seats
-        all_seats = get_seats_for_showing(showing_id)
-        selected_seat_details = [seat for seat in all_seats if seat['id'] in selected_seats]
+        selected_seat_details = get_seats_by_ids(showing_id, selected_seats, holder=holder)
         
         # Get logged-in user information for prefilling booker details
         from flask import g
@@ -583,47 +648,31 @@ def booking_spectators():
 def calculate_price():
     """API endpoint to calculate booking price on the server side"""
     try:
-        # Debug: Log the incoming request
-        print(f"DEBUG: Price calculation request received")
-        print(f"DEBUG: Request content type: {request.content_type}")
-        print(f"DEBUG: Request data: {request.get_data()}")
+        # Log the incoming request
+        logger.debug("Price calculation request received")
+        logger.debug("Request content type: %s", request.content_type)
+        logger.debug("Request data: %s", request.get_data())
         
         data = request.get_json()
-        print(f"DEBUG: Parsed JSON data: {data}")
+        logger.debug("Parsed JSON data: %s", data)
         
         showing_id = data.get('showing_id') if data else None
         spectators = data.get('spectators', []) if data else []
         
-        print(f"DEBUG: showing_id: {showing_id}, spectators: {spectators}")
+        logger.debug("showing_id: %s, spectators: %s", showing_id, spectators)
         
         if not showing_id or not spectators:
-            print("DEBUG: Missing required data - showing_id or spectators")
+            logger.debug("Missing required data - showing_id or spectators")
             return jsonify({'success': False, 'error': 'Missing required data'})
         
-        # Get showing info to retrieve base price
-        print(f"DEBUG: Getting showing by ID: {showing_id}")
-        showing = get_showing_by_id(showing_id)
-        print(f"DEBUG: Showing result: {showing}")
-        
-        if not showing:
-            print("DEBUG: Showing not found")
-            return jsonify({'success': False, 'error': 'Showing not found'})
-        
-        # Check if baseprice field exists
-        if 'baseprice' not in showing:
-            print(f"DEBUG: baseprice field not found in showing. Available fields: {list(showing.keys())}")
-            return jsonify({'success': False, 'error': 'Base price not available'})
-        
-        base_price = showing['baseprice']
-        print(f"DEBUG: Base price: {base_price}")
-        
         # Calculate total price using secure server-side function
-        print(f"DEBUG: Calling calculate_booking_price with showing_id={showing_id}, spectators={spectators}")
+        # (base price and age rules come from the shared pricing cache)
+        logger.debug("Calling calculate_booking_price with showing_id=%s, spectators=%s", showing_id, spectators)
         price_result = calculate_booking_price(showing_id, spectators)
-        print(f"DEBUG: Price calculation result: {price_result}")
+        logger.debug("Price calculation result: %s", price_result)
         
         if price_result is None:
-            print("DEBUG: Price calculation returned None")
+            logger.debug("Price calculation returned None (unknown showing or no pricing rules)")
             return jsonify({'success': False, 'error': 'Unable to calculate price'})
         
         result = {
@@ -633,7 +682,7 @@ def calculate_price():
             'spectator_count': len(spectators),
             'price_breakdown': price_result['price_breakdown']
         }
-        print(f"DEBUG: Returning successful result: {result}")
+        logger.debug("Returning successful result: %s", result)
         
         return jsonify(result)
     
@@ -644,6 +693,7 @@ def calculate_price():
         return jsonify({'success': False, 'error': f'Server error: {str(e)}'})
 
 @app.route('/booking/confirm', methods=['POST'])
+@query_budget(16)
 @booking_login_required
 def booking_confirm():
     """Process the complete booking"""
@@ -680,8 +730,8 @@ def booking_confirm():
             return redirect(url_for('movies'))
         
         # Get seat information to determine PMR status
-        all_seats = get_seats_for_showing(showing_id)
-        seat_info_map = {seat['id']: seat for seat in all_seats}
+        selected_seat_details = get_seats_by_ids(showing_id, selected_seat_ids)
+        seat_info_map = {seat['id']: seat for seat in selected_seat_details}
         
         for i in range(num_spectators):
             # Calculate age from birth date
@@ -734,9 +784,18 @@ def booking_confirm():
             'email': booker_email
         }
         
+        # Seats held by another user since our hold expired can't be booked
+        holder = get_seat_holder()
+        if seat_hold_manager.is_any_held(showing_id, selected_seat_ids, exclude_holder=holder):
+            flash('Booking failed. Some seats are no longer available.', 'error')
+            return redirect(url_for('showing_seats', showing_id=showing_id))
+        
         # Use the secure booking function that calculates prices server-side
         booking_result = create_complete_booking_secure(showing_id, account_id, spectators, selected_seat_ids, booker_info)
         
+        # The seats are now either reserved or need to be selected again
+        seat_hold_manager.release(showing_id, holder)
+        
         if booking_result and booking_result.get('success'):
             booking_id = booking_result['booking_id']
             
@@ -747,66 +806,40 @@ def booking_confirm():
                 customers = get_customers_for_booking(booking_id)
                 
                 if booking_data and customers:
-                    # Add customer count to booking data
-                    booking_data['num_spectators'] = len(customers)
-                    
-                    # Get proper booker information using correct field names
-                    booker_name = f"{booking_data.get('booker_first_name', '')} {booking_data.get('booker_last_name', '')}".strip()
-                    booker_email_data = booking_data.get('booker_email', '')
-                    
-                    # Final fallback
-                    if not booker_name:
-                        booker_name = "Anonymous User"
-                    if not booker_email_data:
-                        booker_email_data = "N/A"
-                    
                     # Convert booking and customers to dictionaries for PDF generator (same as website routes)
-                    booking_data_pdf = {
-                        'id': booking_data['id'],
-                        'movie_name': booking_data['movie_name'],
-                        'room_name': booking_data['room_name'],
-                        'date': booking_data['date'],
-                        'starttime': booking_data['starttime'],
-                        'duration': booking_data['duration'],
-                        'price': booking_data['price'],
-                        'booker_name': booker_name,
-                        'booker_email': booker_email_data
-                    }
-                    
-                    tickets_data = []
-                    for customer in customers:
-                        tickets_data.append({
-                            'id': customer.get('id', 'N/A'),
-                            'seat_number': f"{customer.get('seat_row', '')}{customer.get('seat_column', '')}",
-                            'seat_type': customer.get('seat_type', 'Standard'),
-                            'price': booking_data['price'] / len(customers) if customers else 0  # Divide total price
-                        })
-                    
-                    # Generate PDF content for email attachment
-                    pdf_generator = create_pdf_generator()
-                    pdf_buffer = pdf_generator.generate_booking_pdf(booking_data_pdf, tickets_data)
-                    
-                    # Extract bytes from BytesIO buffer
-                    pdf_content = pdf_buffer.getvalue()
-                    
-                    # Send email with PDF attachment
+                    booking_data_pdf, tickets_data = build_booking_pdf_data(booking_data, customers)
+                    expired = is_showing_expired(booking_data)
                     booker_full_name = f"{booker_first_name} {booker_last_name}"
-                    email_sent = send_booking_confirmation_email(
-                        booking_data=booking_data_pdf,
-                        pdf_content=pdf_content,
-                        booker_email=booker_email,
-                        booker_name=booker_full_name
-                    )
                     
-                    if email_sent:
-                        flash('Booking confirmed successfully! A confirmation email with your tickets has been sent.', 'success')
+                    if config.PDF_CACHE_EAGER:
+                        # Render the PDF into the cache and email it without holding up the confirmation page
+                        pdf_future = pdf_cache.generate_in_background(booking_data_pdf, tickets_data, expired)
+                        pdf_future.add_done_callback(
+                            lambda done: email_executor.submit(_send_confirmation_email, done, booking_data_pdf,
+                                                               booker_email, booker_full_name)
+                        )
+                        flash('Booking confirmed successfully! Your confirmation email with your tickets is on its way.', 'success')
                     else:
-                        flash('Booking confirmed successfully! However, we could not send the confirmation email. You can download your tickets below.', 'warning')
+                        # Generate PDF content for email attachment (cached for later downloads)
+                        pdf_content = pdf_cache.get_or_generate(booking_data_pdf, tickets_data, expired)
+                        
+                        # Send email with PDF attachment
+                        email_sent = send_booking_confirmation_email(
+                            booking_data=booking_data_pdf,
+                            pdf_content=pdf_content,
+                            booker_email=booker_email,
+                            booker_name=booker_full_name
+                        )
+                        
+                        if email_sent:
+                            flash('Booking confirmed successfully! A confirmation email with your tickets has been sent.', 'success')
+                        else:
+                            flash('Booking confirmed successfully! However, we could not send the confirmation email. You can download your tickets below.', 'warning')
                 else:
                     flash('Booking confirmed successfully! You can download your tickets below.', 'success')
                     
             except Exception as email_error:
-                print(f"Failed to send confirmation email: {email_error}")
+                logger.error(f"Failed to send confirmation email: {email_error}")
                 flash('Booking confirmed successfully! However, we could not send the confirmation email. You can download your tickets below.', 'warning')
             
             return redirect(url_for('booking_tickets', booking_id=booking_id))
@@ -865,70 +898,20 @@ def download_booking_pdf(booking_id):
         # Get customers/spectators for this booking
         customers = get_customers_for_booking(booking_id)
         
-        # Get proper booker information using correct field names
-        from flask import g
-        booker_name = f"{booking.get('booker_first_name', '')} {booking.get('booker_last_name', '')}".strip()
-        booker_email = booking.get('booker_email', '')
-        
-        # Fall back to current user if booking doesn't have booker info
-        if not booker_name and hasattr(g, 'current_user') and g.current_user:
-            booker_name = f"{g.current_user.get('first_name', '')} {g.current_user.get('last_name', '')}".strip()
-            if not booker_email:
-                booker_email = g.current_user.get('email', '')
-        
-        # Final fallback
-        if not booker_name:
-            booker_name = "Anonymous User"
-        if not booker_email:
-            booker_email = "N/A"
-        
         # Convert booking and customers to dictionaries for PDF generator
-        booking_data = {
-            'id': booking['id'],
-            'movie_name': booking['movie_name'],
-            'room_name': booking['room_name'],
-            'date': booking['date'],
-            'starttime': booking['starttime'],
-            'duration': booking['duration'],
-            'price': booking['price'],
-            'booker_name': booker_name,
-            'booker_email': booker_email
-        }
-        
-        tickets_data = []
-        for customer in customers:
-            tickets_data.append({
-                'id': customer.get('id', 'N/A'),
-                'seat_number': f"{customer.get('seat_row', '')}{customer.get('seat_column', '')}",
-                'seat_type': customer.get('seat_type', 'Standard'),
-                'price': booking['price'] / len(customers) if customers else 0  # Divide total price
-            })
-        
-        # Check if booking is expired
-        from datetime import datetime, date, timedelta
-        is_expired = False
-        try:
-            booking_date = booking['date']
-            if isinstance(booking_date, str):
-                booking_date = datetime.strptime(booking_date, '%Y-%m-%d').date()
-            elif hasattr(booking_date, 'date'):
-                booking_date = booking_date.date()
-            
-            booking_datetime = datetime.combine(booking_date, datetime.min.time()) + timedelta(seconds=booking['starttime'])
-            is_expired = booking_datetime < datetime.now()
-        except:
-            pass
+        from flask import g
+        booking_data, tickets_data = build_booking_pdf_data(booking, customers, g.get('current_user'))
+        booker_name = booking_data['booker_name']
         
-        # Generate PDF
-        pdf_generator = create_pdf_generator()
-        pdf_buffer = pdf_generator.generate_booking_pdf(booking_data, tickets_data, include_expired=is_expired)
+        # Get the PDF from the cache, rendering it on first use (with the expired notice once the showing has ended)
+        pdf_content = pdf_cache.get_or_generate(booking_data, tickets_data, expired=is_showing_expired(booking))
         
         # Create safe filename from booker name
         safe_name = "".join(c for c in booker_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
         safe_name = safe_name.replace(' ', '_') if safe_name else "User"
         
         # Create response
-        response = make_response(pdf_buffer.getvalue())
+        response = make_response(pdf_content)
         response.headers['Content-Type'] = 'application/pdf'
         
         if print_mode:
@@ -978,70 +961,20 @@ def print_booking_tickets(booking_id):
         # Get customers/spectators for this booking
         customers = get_customers_for_booking(booking_id)
         
-        # Get proper booker information using correct field names
-        from flask import g
-        booker_name = f"{booking.get('booker_first_name', '')} {booking.get('booker_last_name', '')}".strip()
-        booker_email = booking.get('booker_email', '')
-        
-        # Fall back to current user if booking doesn't have booker info
-        if not booker_name and hasattr(g, 'current_user') and g.current_user:
-            booker_name = f"{g.current_user.get('first_name', '')} {g.current_user.get('last_name', '')}".strip()
-            if not booker_email:
-                booker_email = g.current_user.get('email', '')
-        
-        # Final fallback
-        if not booker_name:
-            booker_name = "Anonymous User"
-        if not booker_email:
-            booker_email = "N/A"
-        
         # Convert booking and customers to dictionaries for PDF generator
-        booking_data = {
-            'id': booking['id'],
-            'movie_name': booking['movie_name'],
-            'room_name': booking['room_name'],
-            'date': booking['date'],
-            'starttime': booking['starttime'],
-            'duration': booking['duration'],
-            'price': booking['price'],
-            'booker_name': booker_name,
-            'booker_email': booker_email
-        }
-        
-        tickets_data = []
-        for customer in customers:
-            tickets_data.append({
-                'id': customer.get('id', 'N/A'),
-                'seat_number': f"{customer.get('seat_row', '')}{customer.get('seat_column', '')}",
-                'seat_type': customer.get('seat_type', 'Standard'),
-                'price': booking['price'] / len(customers) if customers else 0  # Divide total price
-            })
-        
-        # Check if booking is expired
-        from datetime import datetime, date, timedelta
-        is_expired = False
-        try:
-            booking_date = booking['date']
-            if isinstance(booking_date, str):
-                booking_date = datetime.strptime(booking_date, '%Y-%m-%d').date()
-            elif hasattr(booking_date, 'date'):
-                booking_date = booking_date.date()
-            
-            booking_datetime = datetime.combine(booking_date, datetime.min.time()) + timedelta(seconds=booking['starttime'])
-            is_expired = booking_datetime < datetime.now()
-        except:
-            pass
+        from flask import g
+        booking_data, tickets_data = build_booking_pdf_data(booking, customers, g.get('current_user'))
+        booker_name = booking_data['booker_name']
         
-        # Generate PDF
-        pdf_generator = create_pdf_generator()
-        pdf_buffer = pdf_generator.generate_booking_pdf(booking_data, tickets_data, include_expired=is_expired)
+        # Get the PDF from the cache, rendering it on first use (with the expired notice once the showing has ended)
+        pdf_content = pdf_cache.get_or_generate(booking_data, tickets_data, expired=is_showing_expired(booking))
         
         # Create safe filename from booker name
         safe_name = "".join(c for c in booker_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
         safe_name = safe_name.replace(' ', '_') if safe_name else "User"
         
         # Return PDF for inline viewing (will trigger browser print)
-        response = make_response(pdf_buffer.getvalue())
+        response = make_response(pdf_content)
         response.headers['Content-Type'] = 'application/pdf'
         response.headers['Content-Disposition'] = f'inline; filename="{safe_name}_Tickets.pdf"'
         response.headers['X-Auto-Print'] = 'true'  # Custom header for our use
@@ -1067,8 +1000,11 @@ def my_tickets():
         
         user_id = g.current_user['id']
         
-        # Get only non-expired bookings for this user
-        bookings = get_bookings_by_account_id(user_id, expired=False)
+        # Get one page of non-expired bookings for this user
+        bookings, next_cursor = get_bookings_page_by_account_id(
+            user_id, expired=False, after=request.args.get('after'),
+            page_size=config.TICKET_HISTORY_PAGE_SIZE
+        )
         
         # Add today's date for comparison in template
         from datetime import date
@@ -1080,7 +1016,11 @@ def my_tickets():
                 # If it's a datetime object, extract the date part
                 booking['date'] = booking['date'].date()
         
-        return render_template('my_tickets.html', bookings=bookings, today=today)
+        # Totals over every page, not just this one
+        totals = get_booking_totals_by_account_id(user_id, expired=False)
+        
+        return render_template('my_tickets.html', bookings=bookings, today=today, totals=totals,
+                               next_cursor=next_cursor, is_first_page=not request.args.get('after'))
     
     except Exception as e:
         flash('Server unavailable, please try again later.', 'error')
@@ -1101,8 +1041,11 @@ def expired_tickets():
         
         user_id = g.current_user['id']
         
-        # Get only expired bookings for this user
-        bookings = get_bookings_by_account_id(user_id, expired=True)
+        # Get one page of expired bookings for this user
+        bookings, next_cursor = get_bookings_page_by_account_id(
+            user_id, expired=True, after=request.args.get('after'),
+            page_size=config.TICKET_HISTORY_PAGE_SIZE
+        )
         
         # Add today's date for comparison in template
         from datetime import date
@@ -1114,13 +1057,32 @@ def expired_tickets():
                 # If it's a datetime object, extract the date part
                 booking['date'] = booking['date'].date()
         
-        return render_template('expired_tickets.html', bookings=bookings, today=today)
+        # Totals over every page, not just this one
+        totals = get_booking_totals_by_account_id(user_id, expired=True)
+        
+        return render_template('expired_tickets.html', bookings=bookings, today=today, totals=totals,
+                               next_cursor=next_cursor, is_first_page=not request.args.get('after'))
     
     except Exception as e:
         flash('Server unavailable, please try again later.', 'error')
         print(f"Expired tickets error: {e}")
         return redirect(url_for('index'))
 
+# Helper function to identify who holds seats during the booking flow
+def get_seat_holder():
+    """Get the seat hold owner for the current user session"""
+    return session.get('session_token')
+
+# Helper function to email a booking PDF rendered in the background
+def _send_confirmation_email(pdf_future, booking_data, booker_email, booker_name):
+    """Send the confirmation email once the background PDF rendering is done, runs on the email executor"""
+    try:
+        if not send_booking_confirmation_email(booking_data=booking_data, pdf_content=pdf_future.result(),
+                                               booker_email=booker_email, booker_name=booker_name):
+            logger.error(f"Failed to send confirmation email for booking {booking_data['id']}")
+    except Exception as e:
+        logger.error(f"Failed to send confirmation email for booking {booking_data['id']}: {e}")
+
 # Helper function to check if a URL is an authentication page
 def is_auth_page(url):
     """Check if a URL is a login or signup page"""
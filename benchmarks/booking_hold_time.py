@@ -0,0 +1,149 @@
+"""
+Booking transaction hold time against party size.
+
+Runs create_complete_booking_secure against an in-memory fake database that
+adds a fixed round-trip latency to every statement, and reports how long
+the booking transaction stays open (first statement to commit) and how many
+statements it runs. The per-row column replays the statement pattern the
+booking path used before multi-row inserts: one customer INSERT and one
+seatreservation INSERT per spectator.
+
+Usage:
+    python benchmarks/booking_hold_time.py [--latency-ms 1.0] [--runs 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('DB_POOL_PREWARM', 'False')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import database as database_core
+from src.database.database_modify import create_complete_booking_secure
+from src.database.database_pool import ElasticConnectionPool
+from tests.fakes import FakeDatabase
+
+PARTY_SIZES = (1, 2, 5, 10, 20, 50)
+SHOWING_ID = 1
+
+
+class LatencyDatabase(FakeDatabase):
+    """Fake database with a round-trip delay per statement that times transactions."""
+
+    def __init__(self, latency_seconds):
+        super().__init__()
+        self.latency_seconds = latency_seconds
+        self.hold_times = []
+        self.statement_counts = []
+        self._open_transactions = {}
+
+    def execute(self, connection, operation, params):
+        time.sleep(self.latency_seconds)
+        if connection not in self._open_transactions:
+            self._open_transactions[connection] = (time.perf_counter(), len(self.executed))
+        return super().execute(connection, operation, params)
+
+    def commit(self, connection):
+        started = self._open_transactions.pop(connection, None)
+        if started is not None:
+            # The COMMIT itself is one more round trip
+            time.sleep(self.latency_seconds)
+            self.hold_times.append(time.perf_counter() - started[0])
+            self.statement_counts.append(len(self.executed) - started[1] + 1)
+
+    def rollback(self, connection):
+        self._open_transactions.pop(connection, None)
+
+
+def _install(database):
+    pool = ElasticConnectionPool({}, pool_name='benchmark_pool', pool_size=2, max_overflow=0, pool_timeout=5)
+    pool._connect = database.connect
+    database_core.connection_pool = pool
+    database_core.replica_pool = None
+
+
+def _add_rules(database, party):
+    database.on(r'FROM ageprice', rows=[
+        {'id': 1, 'name': 'Enfant', 'agemin': 0, 'agemax': 11, 'factor': 0.5},
+        {'id': 2, 'name': 'Adulte', 'agemin': 12, 'agemax': 150, 'factor': 1.0},
+    ])
+    database.on(r'SELECT id, baseprice\s+FROM showing', rows=[{'id': SHOWING_ID, 'baseprice': 1000}])
+    database.on(r'SELECT id FROM customer', handler=lambda conn, operation, params: [
+        {'id': params[0] * 100 + number} for number in range(party['size'])
+    ])
+
+
+def _spectators(size):
+    return [{'firstname': f"First{number}", 'lastname': f"Last{number}", 'age': 30, 'pmr': 0}
+            for number in range(size)]
+
+
+def _book(size, booking_number):
+    seats = [booking_number * 1000 + seat for seat in range(size)]
+    booker = {'first_name': 'Bench', 'last_name': 'Mark', 'email': 'bench@example.com'}
+    result = create_complete_booking_secure(SHOWING_ID, 1, _spectators(size), seats, booker)
+    if not result or not result.get('success'):
+        raise RuntimeError(f"Booking failed: {result}")
+
+
+def _book_per_row(database, size):
+    """Replay the per-row statement pattern on one connection"""
+    conn = database.connect()
+    cursor = conn.cursor(dictionary=True)
+    conn.start_transaction()
+    cursor.execute("SELECT seat_id FROM seatreservation WHERE showing_id = %s AND seat_id IN (%s)", (SHOWING_ID, 0))
+    cursor.execute("INSERT INTO booking (price, account_id, showing_id) VALUES (%s, %s, %s)", (10.0, 1, SHOWING_ID))
+    for number in range(size):
+        cursor.execute("INSERT INTO customer (firstname, lastname, age, pmr, booking_id) VALUES (%s, %s, %s, %s, %s)",
+                       ('First', 'Last', 30, 0, 1))
+        cursor.execute("INSERT INTO seatreservation (customer_id, showing_id, seat_id) VALUES (%s, %s, %s)",
+                       (number, SHOWING_ID, number))
+    conn.commit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Booking transaction hold time against party size")
+    parser.add_argument('--latency-ms', type=float, default=1.0, help="Simulated round trip per statement")
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    party = {'size': 1}
+    database = LatencyDatabase(args.latency_ms / 1000.0)
+    _add_rules(database, party)
+    _install(database)
+
+    # Warm the pricing cache, as on a running server
+    _book(1, 0)
+
+    print(f"Round trip latency: {args.latency_ms} ms, {args.runs} runs per party size\n")
+    print(f"{'party':>5}  {'statements':>10}  {'hold ms':>8}  {'per-row statements':>18}  {'per-row hold ms':>15}")
+
+    booking_number = 1
+    for size in PARTY_SIZES:
+        party['size'] = size
+
+        database.hold_times.clear()
+        database.statement_counts.clear()
+        for run in range(args.runs):
+            _book(size, booking_number)
+            booking_number += 1
+        hold_ms = statistics.median(database.hold_times) * 1000
+        statements = database.statement_counts[-1]
+
+        database.hold_times.clear()
+        database.statement_counts.clear()
+        for run in range(args.runs):
+            _book_per_row(database, size)
+        per_row_hold_ms = statistics.median(database.hold_times) * 1000
+        per_row_statements = database.statement_counts[-1]
+
+        print(f"{size:>5}  {statements:>10}  {hold_ms:>8.2f}  {per_row_statements:>18}  {per_row_hold_ms:>15.2f}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Booking PDFs per second with the shared PDF generator.
+
+Builds booking PDFs with the shared generator of create_pdf_generator()
+and, for comparison, replays the setup every PDF paid before styles and
+static paragraphs were prebuilt: a new stylesheet with the custom ticket
+styles and freshly parsed title, separator and footer paragraphs. Also
+reports the throughput of several threads sharing the generator.
+
+Usage:
+    python benchmarks/pdf_generation.py [--tickets 4] [--pdfs 200] [--threads 4]
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.pdf_generator import TicketPDFGenerator, _build_static_paragraphs, _build_stylesheet, create_pdf_generator
+
+
+def _booking(ticket_count):
+    booking_data = {
+        'id': 1, 'movie_name': 'Benchmark Movie', 'room_name': 'Room 1',
+        'date': datetime.date.today() + datetime.timedelta(days=1), 'starttime': 72000.0, 'duration': 120,
+        'end_at': datetime.datetime.now() + datetime.timedelta(days=1), 'price': 10.0 * ticket_count,
+        'booker_name': 'Bench Mark', 'booker_email': 'bench@example.com',
+    }
+    tickets_data = [{'id': number, 'seat_number': f"C{number}", 'seat_type': 'standard', 'price': 10.0}
+                    for number in range(1, ticket_count + 1)]
+    return booking_data, tickets_data
+
+
+def _shared(booking):
+    create_pdf_generator().generate_booking_pdf(*booking)
+
+
+def _rebuilt_setup(booking):
+    """Pay the per-PDF setup of a new generator as it was before sharing"""
+    generator = TicketPDFGenerator()
+    generator.styles = _build_stylesheet()
+    _build_static_paragraphs()
+    generator.generate_booking_pdf(*booking)
+
+
+def _pdfs_per_second(build, booking, pdfs, threads=1):
+    per_thread = max(1, pdfs // threads)
+    start = threading.Barrier(threads + 1)
+
+    def worker():
+        start.wait()
+        for number in range(per_thread):
+            build(booking)
+
+    workers = [threading.Thread(target=worker) for number in range(threads)]
+    for worker_thread in workers:
+        worker_thread.start()
+    start.wait()
+    started = time.perf_counter()
+    for worker_thread in workers:
+        worker_thread.join()
+    return per_thread * threads / (time.perf_counter() - started)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Booking PDFs per second with the shared PDF generator")
+    parser.add_argument('--tickets', type=int, default=4, help="Tickets per booking PDF")
+    parser.add_argument('--pdfs', type=int, default=200, help="PDFs built per measurement")
+    parser.add_argument('--threads', type=int, default=4, help="Threads sharing the generator")
+    args = parser.parse_args(argv)
+
+    booking = _booking(args.tickets)
+    # Warm ReportLab's font and glyph caches
+    _shared(booking)
+
+    print(f"{args.tickets} tickets per PDF, {args.pdfs} PDFs per measurement\n")
+    print(f"{'generator':<34}  {'PDFs/s':>8}")
+    print(f"{'setup rebuilt per PDF':<34}  {_pdfs_per_second(_rebuilt_setup, booking, args.pdfs):>8.1f}")
+    print(f"{'shared':<34}  {_pdfs_per_second(_shared, booking, args.pdfs):>8.1f}")
+    print(f"{f'shared, {args.threads} threads':<34}  "
+          f"{_pdfs_per_second(_shared, booking, args.pdfs, threads=args.threads):>8.1f}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Python-side conversion cost per row with the C extension.
+
+Given a converter class, the C extension fetches raw rows and converts every
+column in Python through converter.to_python. Without one it converts
+natively and the pool's TrackedCursor converts only the TIME and DECIMAL
+columns. This measures the Python work of both for rows shaped like the
+ticket history; the native conversion done in C by the second path needs a
+MySQL server and is not included.
+
+Usage:
+    python benchmarks/row_conversion.py [--rows 1000] [--runs 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+os.environ.setdefault('DB_POOL_PREWARM', 'False')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mysql.connector.constants import FieldType
+from src.database.database_converter import CinemaConverter
+from src.database.database_pool import TrackedCursor
+
+# Ticket history columns: (name, field type, raw value, native value)
+COLUMNS = [
+    ('id', FieldType.LONG, b'900', 900),
+    ('price', FieldType.NEWDECIMAL, b'20.00', Decimal('20.00')),
+    ('account_id', FieldType.LONG, b'7', 7),
+    ('showing_id', FieldType.LONG, b'42', 42),
+    ('num_spectators', FieldType.LONG, b'2', 2),
+    ('date', FieldType.DATE, b'2026-02-01', date(2026, 2, 1)),
+    ('starttime', FieldType.TIME, b'20:00:00', timedelta(hours=20)),
+    ('baseprice', FieldType.LONG, b'1000', 1000),
+    ('start_at', FieldType.DATETIME, b'2026-02-01 20:00:00', datetime(2026, 2, 1, 20)),
+    ('end_at', FieldType.DATETIME, b'2026-02-01 22:00:00', datetime(2026, 2, 1, 22)),
+    ('movie_name', FieldType.VAR_STRING, b'Movie 1', 'Movie 1'),
+    ('duration', FieldType.LONG, b'120', 120),
+    ('room_name', FieldType.VAR_STRING, b'Room 1', 'Room 1'),
+]
+DESCRIPTION = [(name, field_type, None, None, None, None, True, 0, 0) for name, field_type, raw, native in COLUMNS]
+
+
+class NativeCursor:
+    """Cursor returning rows already converted by the C extension."""
+
+    description = DESCRIPTION
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def execute(self, operation, params=None):
+        pass
+
+    def fetchall(self):
+        return [dict(row) for row in self._rows]
+
+
+def _converter_class_rows(raw_rows):
+    """What the C extension does per row with a converter class"""
+    converter = CinemaConverter()
+    return [{column[0]: converter.to_python(column, value) for column, value in zip(DESCRIPTION, row)}
+            for row in raw_rows]
+
+
+def _native_rows(native_rows):
+    cursor = TrackedCursor(NativeCursor(native_rows), native_types=True)
+    cursor.execute("SELECT ...")
+    return cursor.fetchall()
+
+
+def _median_ms(call, runs):
+    timings = []
+    for run in range(runs):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Python-side conversion cost per row with the C extension")
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    raw_rows = [tuple(raw for name, field_type, raw, native in COLUMNS)] * args.rows
+    native_rows = [{name: native for name, field_type, raw, native in COLUMNS}] * args.rows
+    assert _converter_class_rows(raw_rows[:1]) == _native_rows(native_rows[:1])
+
+    converter_ms = _median_ms(lambda: _converter_class_rows(raw_rows), args.runs)
+    native_ms = _median_ms(lambda: _native_rows(native_rows), args.runs)
+
+    print(f"{args.rows} rows of {len(COLUMNS)} columns, median of {args.runs} runs\n")
+    print(f"{'path':<44}  {'ms':>8}  {'us/row':>7}")
+    print(f"{'converter class (every column in Python)':<44}  {converter_ms:>8.2f}  {converter_ms * 1000 / args.rows:>7.2f}")
+    print(f"{'native + TIME/DECIMAL columns in Python':<44}  {native_ms:>8.2f}  {native_ms * 1000 / args.rows:>7.2f}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
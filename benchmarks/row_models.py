@@ -0,0 +1,123 @@
+"""
+Memory and allocations of dictionary rows against row models.
+
+Calls get_seats_for_showing, get_bookings_by_account_id and
+get_movies_with_showings_by_date against an in-memory fake database, once
+with DB_ROW_MODELS off (dictionaries) and once with it on (__slots__ row
+models), and reports with tracemalloc the memory the result keeps, the
+peak allocated during the call and the number of allocations it keeps.
+
+Usage:
+    python benchmarks/row_models.py [--seats 300] [--bookings 1000] [--runs 20]
+"""
+
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+os.environ.setdefault('DB_POOL_PREWARM', 'False')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import database as database_core
+from src.database import database_retrieve
+from src.database.database_cache import schedule_cache, seat_map_cache
+from src.database.database_pool import ElasticConnectionPool
+from tests.fakes import FakeDatabase
+
+SHOWING_ID = 1
+ACCOUNT_ID = 1
+SEATS_PER_ROW = 20
+
+
+def _install(database):
+    pool = ElasticConnectionPool({}, pool_name='benchmark_pool', pool_size=2, max_overflow=0, pool_timeout=5)
+    pool._connect = database.connect
+    database_core.connection_pool = pool
+    database_core.replica_pool = None
+
+
+def _add_rules(database, seats, bookings):
+    day = date.today() + timedelta(days=1)
+    start_at = datetime.combine(day, datetime.min.time()) + timedelta(hours=20)
+
+    database.on(r'SELECT room_id FROM showing', rows=[{'room_id': 1}])
+    database.on(r'FROM seat\s+WHERE room_id', rows=[
+        {'id': seat_id, 'type': 'standard', 'seat_row': (seat_id - 1) // SEATS_PER_ROW + 1,
+         'seat_column': (seat_id - 1) % SEATS_PER_ROW + 1}
+        for seat_id in range(1, seats + 1)
+    ])
+    database.on(r'SELECT seat_id FROM seatreservation', rows=[{'seat_id': seat_id} for seat_id in range(1, seats + 1, 3)])
+    database.on(r'FROM booking b\s+JOIN showing s', rows=[{
+        'id': booking_id, 'price': 20.0, 'account_id': ACCOUNT_ID, 'showing_id': booking_id, 'num_spectators': 2,
+        'date': day, 'starttime': 72000.0, 'baseprice': 1000, 'start_at': start_at,
+        'end_at': start_at + timedelta(minutes=120), 'movie_name': f"Movie {booking_id % 50}",
+        'duration': 120, 'room_name': 'Room 1',
+    } for booking_id in range(1, bookings + 1)])
+    database.on(r'FROM showing s\s+INNER JOIN movie m', rows=[{
+        'id': movie_id, 'name': f"Movie {movie_id:02d}", 'duration': 120,
+        'showing_id': movie_id * 10 + number, 'showing_date': day, 'showing_starttime': float((14 + 2 * number) * 3600),
+        'showing_baseprice': 1000, 'showing_room_id': 1, 'showing_end_at': start_at + timedelta(hours=number),
+    } for movie_id in range(1, 31) for number in range(4)])
+    return day
+
+
+def _measure(call, runs):
+    """Return (kept bytes, peak bytes, kept allocations, median ms) of call()"""
+    call()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    start_size = tracemalloc.get_traced_memory()[0]
+    result = call()
+    kept, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    kept_allocations = sum(stat.count_diff for stat in after.compare_to(before, 'lineno') if stat.count_diff > 0)
+    del result
+
+    timings = []
+    for run in range(runs):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return kept - start_size, peak - start_size, kept_allocations, statistics.median(timings) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory and allocations of dictionary rows against row models")
+    parser.add_argument('--seats', type=int, default=300, help="Seats in the room")
+    parser.add_argument('--bookings', type=int, default=1000, help="Bookings in the ticket history")
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    database = FakeDatabase()
+    day = _add_rules(database, args.seats, args.bookings)
+    _install(database)
+
+    cases = [
+        (f"seat map ({args.seats} seats)", lambda: database_retrieve.get_seats_for_showing(SHOWING_ID)),
+        (f"ticket history ({args.bookings} bookings)", lambda: database_retrieve.get_bookings_by_account_id(ACCOUNT_ID)),
+        ("daily schedule (120 showings)", lambda: database_retrieve.get_movies_with_showings_by_date(day.isoformat())),
+    ]
+
+    print(f"{'result':<30}  {'rows':>11}  {'kept KiB':>9}  {'peak KiB':>9}  {'kept allocs':>11}  {'ms':>7}")
+    for name, call in cases:
+        for row_models in (False, True):
+            database_retrieve.config.DB_ROW_MODELS = row_models
+            schedule_cache.clear()
+            seat_map_cache.clear()
+            kept, peak, allocations, milliseconds = _measure(call, args.runs)
+            print(f"{name:<30}  {'row models' if row_models else 'dicts':>11}  {kept / 1024:>9.1f}  "
+                  f"{peak / 1024:>9.1f}  {allocations:>11}  {milliseconds:>7.3f}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
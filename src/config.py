@@ -24,16 +24,97 @@ class Config:
     DB_USER = os.getenv('DB_USER', 'root')
     DB_PASSWORD = os.getenv('DB_PASSWORD', '')
     DB_NAME = os.getenv('DB_NAME', 'cinemacousas')
+    # Pure Python connector instead of the C extension (see database_converter)
+    DB_USE_PURE = os.getenv('DB_USE_PURE', 'False').lower() in ['true', '1', 'yes']
     
     # Database Pool Configuration
     DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
     DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
     DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
     DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 3600))
+    DB_POOL_PRE_PING_SECONDS = int(os.getenv('DB_POOL_PRE_PING_SECONDS', 30))
+    DB_POOL_PREWARM = os.getenv('DB_POOL_PREWARM', 'True').lower() in ['true', '1', 'yes']
+    # Database Metrics Configuration
+    DB_METRICS_ENABLED = os.getenv('DB_METRICS_ENABLED', 'True').lower() in ['true', '1', 'yes']
+    DB_SLOW_QUERY_MS = int(os.getenv('DB_SLOW_QUERY_MS', 200))
+    DB_SLOW_QUERY_EXPLAIN = os.getenv('DB_SLOW_QUERY_EXPLAIN', 'False').lower() in ['true', '1', 'yes']
+    # Slow calls waiting for EXPLAIN at most, later ones are not explained
+    DB_SLOW_QUERY_EXPLAIN_QUEUE_SIZE = int(os.getenv('DB_SLOW_QUERY_EXPLAIN_QUEUE_SIZE', 8))
+    DB_QUERY_DEBUG_HEADERS = os.getenv('DB_QUERY_DEBUG_HEADERS', str(DEBUG)).lower() in ['true', '1', 'yes']
+    DB_QUERY_BUDGET_STRICT = os.getenv('DB_QUERY_BUDGET_STRICT', 'False').lower() in ['true', '1', 'yes']
+    DB_REPEATED_STATEMENT_THRESHOLD = int(os.getenv('DB_REPEATED_STATEMENT_THRESHOLD', 5))
+    
+    # Read Replica Configuration (disabled when DB_REPLICA_HOST is empty)
+    DB_REPLICA_HOST = os.getenv('DB_REPLICA_HOST', '')
+    DB_REPLICA_PORT = int(os.getenv('DB_REPLICA_PORT', DB_PORT))
+    DB_REPLICA_USER = os.getenv('DB_REPLICA_USER', DB_USER)
+    DB_REPLICA_PASSWORD = os.getenv('DB_REPLICA_PASSWORD', DB_PASSWORD)
+    DB_REPLICA_POOL_SIZE = int(os.getenv('DB_REPLICA_POOL_SIZE', DB_POOL_SIZE))
+    # Seconds a user's reads stay on the primary after they wrote something
+    DB_READ_YOUR_WRITES_SECONDS = int(os.getenv('DB_READ_YOUR_WRITES_SECONDS', 10))
+    
+    # Reuse one pooled connection for every database call of a Flask request
+    DB_REQUEST_SCOPED_CONNECTION = os.getenv('DB_REQUEST_SCOPED_CONNECTION', 'False').lower() in ['true', '1', 'yes']
+    
+    # Return seat maps, daily showings and ticket history as __slots__ row models instead of dicts
+    DB_ROW_MODELS = os.getenv('DB_ROW_MODELS', 'False').lower() in ['true', '1', 'yes']
+    
+    # Schedule Cache Configuration
+    SCHEDULE_CACHE_TTL_SECONDS = int(os.getenv('SCHEDULE_CACHE_TTL_SECONDS', 60))
+    SCHEDULE_CACHE_STALE_SECONDS = int(os.getenv('SCHEDULE_CACHE_STALE_SECONDS', 600))
+    SCHEDULE_CACHE_MAX_ENTRIES = int(os.getenv('SCHEDULE_CACHE_MAX_ENTRIES', 32))
+    
+    # Pricing Cache Configuration
+    PRICING_CACHE_TTL_SECONDS = int(os.getenv('PRICING_CACHE_TTL_SECONDS', 300))
+    
+    # Booking Configuration
+    # 'optimistic' relies on the unique (showing_id, seat_id) index of migration 0001,
+    # 'check' looks up reserved seats before inserting
+    BOOKING_SEAT_LOCKING = os.getenv('BOOKING_SEAT_LOCKING', 'check')
+    BOOKING_DEADLOCK_RETRIES = int(os.getenv('BOOKING_DEADLOCK_RETRIES', 3))
+    BOOKING_RETRY_BACKOFF_MS = int(os.getenv('BOOKING_RETRY_BACKOFF_MS', 50))
+    
+    # Seat Map Cache Configuration
+    SEAT_MAP_LAYOUT_TTL_SECONDS = int(os.getenv('SEAT_MAP_LAYOUT_TTL_SECONDS', 3600))
+    SEAT_MAP_OCCUPANCY_TTL_SECONDS = int(os.getenv('SEAT_MAP_OCCUPANCY_TTL_SECONDS', 30))
+    SEAT_MAP_MAX_SHOWINGS = int(os.getenv('SEAT_MAP_MAX_SHOWINGS', 500))
+    
+    # Ticket History Configuration
+    TICKET_HISTORY_PAGE_SIZE = int(os.getenv('TICKET_HISTORY_PAGE_SIZE', 20))
+    
+    # Seat Hold Configuration
+    SEAT_HOLD_TTL_SECONDS = int(os.getenv('SEAT_HOLD_TTL_SECONDS', 600))
+    SEAT_HOLD_SWEEP_INTERVAL_SECONDS = int(os.getenv('SEAT_HOLD_SWEEP_INTERVAL_SECONDS', 30))
+    
+    # Poster File Store Configuration
+    POSTER_STORE_DIR = os.getenv('POSTER_STORE_DIR', os.path.join('media', 'posters'))
+    # Internal location mapped to POSTER_STORE_DIR by the front web server (e.g. nginx),
+    # posters are then delivered with X-Accel-Redirect instead of by Flask
+    POSTER_ACCEL_REDIRECT_PREFIX = os.getenv('POSTER_ACCEL_REDIRECT_PREFIX', '')
+    
+    # Poster Cache Configuration
+    POSTER_CACHE_DIR = os.getenv('POSTER_CACHE_DIR', os.path.join('cache', 'posters'))
+    POSTER_CACHE_MEMORY_BYTES = int(os.getenv('POSTER_CACHE_MEMORY_MB', 32)) * 1024 * 1024
+    POSTER_CACHE_MAX_AGE_SECONDS = int(os.getenv('POSTER_CACHE_MAX_AGE_SECONDS', 86400))
+    
+    # Poster Derivative Configuration (resized JPEG/WebP variants served by /poster/<id>?w=)
+    POSTER_DERIVATIVE_DIR = os.getenv('POSTER_DERIVATIVE_DIR', os.path.join('cache', 'poster_derivatives'))
+    POSTER_DERIVATIVE_WIDTHS = [int(width) for width in os.getenv('POSTER_DERIVATIVE_WIDTHS', '160,320,640').split(',')]
+    POSTER_DERIVATIVE_WORKERS = int(os.getenv('POSTER_DERIVATIVE_WORKERS', 2))
+    POSTER_DERIVATIVE_MAX_AGE_SECONDS = int(os.getenv('POSTER_DERIVATIVE_MAX_AGE_SECONDS', 30 * 24 * 3600))
+    POSTER_DERIVATIVE_FAILURE_TTL_SECONDS = int(os.getenv('POSTER_DERIVATIVE_FAILURE_TTL_SECONDS', 300))
+    
+    # Booking PDF Cache Configuration
+    PDF_CACHE_DIR = os.getenv('PDF_CACHE_DIR', os.path.join('cache', 'pdfs'))
+    PDF_CACHE_MAX_BYTES = int(os.getenv('PDF_CACHE_MAX_MB', 256)) * 1024 * 1024
+    # Render the booking PDF and send the confirmation email in the background after booking
+    PDF_CACHE_EAGER = os.getenv('PDF_CACHE_EAGER', 'False').lower() in ['true', '1', 'yes']
     
     # Session Configuration
     SESSION_LIFETIME_HOURS = int(os.getenv('SESSION_LIFETIME_HOURS', 24))
     SESSION_CLEANUP_INTERVAL_HOURS = int(os.getenv('SESSION_CLEANUP_INTERVAL_HOURS', 1))
+    SESSION_CACHE_TTL_SECONDS = int(os.getenv('SESSION_CACHE_TTL_SECONDS', 60))
+    SESSION_CACHE_MAX_ENTRIES = int(os.getenv('SESSION_CACHE_MAX_ENTRIES', 10000))
     
     # Security Configuration
     BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
@@ -45,6 +126,8 @@ class Config:
     EMAIL_USERNAME = os.getenv('EMAIL_USERNAME', '')
     EMAIL_PASSWORD = os.getenv('EMAIL_PASSWORD', '')
     EMAIL_FROM = os.getenv('EMAIL_FROM', '')
+    # Threads sending the confirmation emails of PDF_CACHE_EAGER in the background
+    EMAIL_SEND_WORKERS = int(os.getenv('EMAIL_SEND_WORKERS', 2))
     
     @classmethod
     def get_database_config(cls):
@@ -58,22 +141,53 @@ class Config:
             'charset': 'utf8mb4',
             'collation': 'utf8mb4_unicode_ci',
             'autocommit': False,
-            'raise_on_warnings': True
+            'raise_on_warnings': True,
+            'use_pure': cls.DB_USE_PURE
         }
     
+    @classmethod
+    def get_replica_database_config(cls):
+        """Get read replica database configuration, None if no replica is configured."""
+        if not cls.DB_REPLICA_HOST:
+            return None
+        
+        replica_config = cls.get_database_config()
+        replica_config.update({
+            'host': cls.DB_REPLICA_HOST,
+            'port': cls.DB_REPLICA_PORT,
+            'user': cls.DB_REPLICA_USER,
+            'password': cls.DB_REPLICA_PASSWORD
+        })
+        return replica_config
+    
+    @classmethod
+    def get_replica_pool_config(cls):
+        """Get read replica pool configuration as a dictionary."""
+        pool_config = cls.get_pool_config()
+        pool_config.update({
+            'pool_name': 'cinema_replica_pool',
+            'pool_size': cls.DB_REPLICA_POOL_SIZE
+        })
+        return pool_config
+    
     @classmethod
     def get_pool_config(cls):
         """Get database pool configuration as a dictionary."""
         return {
             'pool_name': 'cinema_pool',
             'pool_size': cls.DB_POOL_SIZE,
-            'pool_reset_session': True
+            'max_overflow': cls.DB_MAX_OVERFLOW,
+            'pool_timeout': cls.DB_POOL_TIMEOUT,
+            'pool_recycle': cls.DB_POOL_RECYCLE,
+            'pool_reset_session': True,
+            'pool_pre_ping_seconds': cls.DB_POOL_PRE_PING_SECONDS
         }
 
 class DevelopmentConfig(Config):
     """Development configuration."""
     DEBUG = True
     ENVIRONMENT = 'development'
+    DB_QUERY_DEBUG_HEADERS = True
 
 class ProductionConfig(Config):
     """Production configuration."""
@@ -86,6 +200,9 @@ class TestingConfig(Config):
     ENVIRONMENT = 'testing'
     # Use different database for testing
     DB_NAME = os.getenv('TEST_DB_NAME', 'cinemacousas_test')
+    # Fail requests that exceed the query budget of their route
+    DB_QUERY_DEBUG_HEADERS = True
+    DB_QUERY_BUDGET_STRICT = True
 
 # Configuration dictionary
 config = {
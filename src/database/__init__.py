@@ -3,9 +3,15 @@ Database package for the Cinema application.
 This package provides database connectivity and operations split into modules:
 
 - database: Core database connection and utilities
+- database_pool: Elastic connection pool used by the core module
+- database_converter: MySQL type conversion used by the core module
+- database_metrics: Per-function latency metrics and slow query log
 - database_retrieve: Functions to retrieve data from the database
 - database_validate: Functions to validate data according to database rules
 - database_modify: Functions to modify/add data to the database
+- database_cache: In-process caches in front of hot database reads
+- database_rows: Opt-in __slots__ row models for the largest results
+- database_migrate: Schema migration runner and EXPLAIN check (command line)
 """
 
 # Import core database functionality
@@ -13,10 +19,42 @@ from .database import (
     get_db_connection,
     test_database_connection,
     handle_db_errors,
+    init_db_connection_scope,
+    get_pool_stats,
     DB_CONFIG,
     logger
 )
 
+# Import metrics functionality
+from .database_metrics import (
+    get_db_metrics,
+    reset_db_metrics,
+    get_request_query_counts,
+    init_request_query_tracking,
+    query_budget,
+    QueryBudgetExceeded
+)
+
+# Import cache functionality
+from .database_cache import (
+    schedule_cache,
+    session_cache,
+    pricing_cache,
+    seat_map_cache,
+    bump_schedule_version,
+    bump_pricing_version,
+    get_session_cache_stats
+)
+
+# Import row models
+from .database_rows import (
+    RowModel,
+    SeatRow,
+    ShowingRow,
+    BookingSummaryRow,
+    init_row_models
+)
+
 # Import retrieve functions
 from .database_retrieve import (
     get_user_by_id,
@@ -26,13 +64,18 @@ from .database_retrieve import (
     get_movies_with_showings_by_date,
     get_showing_by_id,
     get_seats_for_showing,
+    get_seats_by_ids,
     get_age_pricing,
     calculate_booking_price,
+    calculate_booking_prices,
     get_booking_by_id,
     get_customers_for_booking,
     get_bookings_by_account_id,
+    get_bookings_page_by_account_id,
+    get_booking_totals_by_account_id,
     is_showing_expired,
     get_movie_poster,
+    get_movie_posters,
     get_poster_image_data
 )
 
@@ -61,9 +104,35 @@ __all__ = [
     'get_db_connection',
     'test_database_connection',
     'handle_db_errors',
+    'init_db_connection_scope',
+    'get_pool_stats',
     'DB_CONFIG',
     'logger',
     
+    # Metrics
+    'get_db_metrics',
+    'reset_db_metrics',
+    'get_request_query_counts',
+    'init_request_query_tracking',
+    'query_budget',
+    'QueryBudgetExceeded',
+    
+    # Caches
+    'schedule_cache',
+    'session_cache',
+    'pricing_cache',
+    'seat_map_cache',
+    'bump_schedule_version',
+    'bump_pricing_version',
+    'get_session_cache_stats',
+    
+    # Row models
+    'RowModel',
+    'SeatRow',
+    'ShowingRow',
+    'BookingSummaryRow',
+    'init_row_models',
+    
     # Retrieve functions
     'get_user_by_id',
     'get_user_by_username',
@@ -72,13 +141,18 @@ __all__ = [
     'get_movies_with_showings_by_date',
     'get_showing_by_id',
     'get_seats_for_showing',
+    'get_seats_by_ids',
     'get_age_pricing',
     'calculate_booking_price',
+    'calculate_booking_prices',
     'get_booking_by_id',
     'get_customers_for_booking',
     'get_bookings_by_account_id',
+    'get_bookings_page_by_account_id',
+    'get_booking_totals_by_account_id',
     'is_showing_expired',
     'get_movie_poster',
+    'get_movie_posters',
     'get_poster_image_data',
     
     # Validation functions
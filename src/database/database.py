@@ -1,8 +1,13 @@
 import mysql.connector
 import logging
+import time
 from contextlib import contextmanager
-from mysql.connector import pooling
+from functools import wraps
+from flask import g, has_request_context, session
 from ..config import get_config
+from .database_pool import ElasticConnectionPool
+from .database_converter import CinemaConverter, uses_converter_class
+from .database_metrics import track_call
 
 # Get configuration
 config = get_config()
@@ -12,43 +17,113 @@ logging.basicConfig(level=logging.ERROR)
 logger = logging.getLogger(__name__)
 
 def handle_db_errors(default_return=None):
-    """Decorator to handle database errors consistently"""
+    """Decorator to handle database errors consistently
+    
+    Also records call counts, latency, rows returned and pool wait time per
+    function, and logs slow calls (see database_metrics).
+    """
     def decorator(func):
+        @wraps(func)
         def wrapper(*args, **kwargs):
-            try:
-                return func(*args, **kwargs)
-            except mysql.connector.Error as e:
-                logger.error(f"Database error in {func.__name__}: {e}")
-                return default_return
-            except Exception as e:
-                logger.error(f"Unexpected error in {func.__name__}: {e}")
-                return default_return
+            with track_call(func.__name__) as set_result:
+                try:
+                    result = func(*args, **kwargs)
+                except mysql.connector.Error as e:
+                    logger.error(f"Database error in {func.__name__}: {e}")
+                    return default_return
+                except Exception as e:
+                    logger.error(f"Unexpected error in {func.__name__}: {e}")
+                    return default_return
+                set_result(result)
+                return result
         return wrapper
     return decorator
 
-# Database connection configuration from config class
+# Database connection configuration from config class, with TIME and DECIMAL
+# columns converted to float during fetch by the pure Python connector, or
+# after it by the pool's cursors with the C extension (see database_converter)
 DB_CONFIG = config.get_database_config()
+if uses_converter_class(DB_CONFIG):
+    DB_CONFIG['converter_class'] = CinemaConverter
 POOL_CONFIG = config.get_pool_config()
 
 # Create connection pool
-try:
-    connection_pool = pooling.MySQLConnectionPool(
-        **DB_CONFIG,
-        **POOL_CONFIG
-    )
-    logger.info("Database connection pool created successfully")
-except mysql.connector.Error as e:
-    logger.error(f"Error creating connection pool: {e}")
-    connection_pool = None
+connection_pool = ElasticConnectionPool(DB_CONFIG, **POOL_CONFIG)
+logger.info("Database connection pool created successfully")
+
+# Open the idle connections up front; the pool opens them on demand if the database is down now
+if config.DB_POOL_PREWARM:
+    try:
+        connection_pool.prewarm()
+    except mysql.connector.Error as e:
+        logger.error(f"Error pre-warming connection pool: {e}")
+
+# Create read replica pool when a replica is configured
+REPLICA_DB_CONFIG = config.get_replica_database_config()
+if REPLICA_DB_CONFIG:
+    if uses_converter_class(REPLICA_DB_CONFIG):
+        REPLICA_DB_CONFIG['converter_class'] = CinemaConverter
+    replica_pool = ElasticConnectionPool(REPLICA_DB_CONFIG, **config.get_replica_pool_config())
+    logger.info("Read replica connection pool created successfully")
+    
+    if config.DB_POOL_PREWARM:
+        try:
+            replica_pool.prewarm()
+        except mysql.connector.Error as e:
+            logger.error(f"Error pre-warming read replica pool: {e}")
+else:
+    replica_pool = None
+
+def get_pool_stats():
+    """Get connection pool usage, checkout and wait time counters"""
+    stats = {'primary': connection_pool.get_stats()}
+    if replica_pool is not None:
+        stats['replica'] = replica_pool.get_stats()
+    return stats
+
+def _is_primary_sticky():
+    """Check if the current user wrote recently and must read from the primary"""
+    if not has_request_context():
+        return False
+    return session.get('_db_primary_until', 0) > time.time()
+
+def _mark_primary_sticky():
+    """Send the current user's reads to the primary for a short window after a write"""
+    if has_request_context():
+        session['_db_primary_until'] = time.time() + config.DB_READ_YOUR_WRITES_SECONDS
 
 @contextmanager
-def get_db_connection():
-    """Get a database connection from the pool with context manager"""
-    if connection_pool is None:
-        # Fallback to direct connection if pool failed
-        conn = mysql.connector.connect(**DB_CONFIG)
+def get_db_connection(readonly=False):
+    """Get a database connection from the pool with context manager
+    
+    Read-only callers get a connection to the read replica when one is
+    configured, unless the current user committed a write within the last
+    DB_READ_YOUR_WRITES_SECONDS, so they always see their own writes.
+    
+    With DB_REQUEST_SCOPED_CONNECTION enabled, the first call inside a Flask
+    request borrows a connection that is reused by every later call of the
+    same request and returned to the pool at teardown.
+    """
+    pool = connection_pool
+    if readonly and replica_pool is not None and not _is_primary_sticky():
+        pool = replica_pool
+    
+    if config.DB_REQUEST_SCOPED_CONNECTION and has_request_context():
+        connection_scope = _request_scoped_connection(pool)
     else:
-        conn = connection_pool.get_connection()
+        connection_scope = _pooled_connection(pool)
+    
+    with connection_scope as conn:
+        commits_before = conn.commits
+        yield conn
+        # Without a replica every read already goes to the primary, so the session cookie is left alone
+        if replica_pool is not None and pool is connection_pool and conn.commits > commits_before:
+            _mark_primary_sticky()
+
+@contextmanager
+def _pooled_connection(pool):
+    """Check out a connection for the duration of the block"""
+    conn = pool.get_connection()
     
     try:
         yield conn
@@ -59,6 +134,42 @@ def get_db_connection():
     finally:
         conn.close()
 
+@contextmanager
+def _request_scoped_connection(pool):
+    """Lend the connection stored on flask.g for this pool, checking it out on first use"""
+    connections = g.setdefault('_db_connections', {})
+    scope = connections.get(pool.pool_name)
+    if scope is None:
+        scope = [pool.get_connection(), 0]
+        connections[pool.pool_name] = scope
+    
+    conn = scope[0]
+    scope[1] += 1
+    try:
+        yield conn
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Database transaction error: {e}")
+        raise
+    finally:
+        scope[1] -= 1
+        # End whatever the caller left open, as returning a connection to the pool would
+        if scope[1] == 0 and conn.in_transaction:
+            conn.rollback()
+
+def release_request_connection(exception=None):
+    """Return the request-scoped connections to their pools"""
+    connections = g.pop('_db_connections', None) or {}
+    for conn, depth in connections.values():
+        try:
+            conn.close()
+        except Exception as e:
+            logger.error(f"Error releasing request connection: {e}")
+
+def init_db_connection_scope(app):
+    """Return request-scoped connections to the pool when the app context ends"""
+    app.teardown_appcontext(release_request_connection)
+
 def test_database_connection():
     """Test database connection and return account count"""
     try:
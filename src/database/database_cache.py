@@ -0,0 +1,517 @@
+"""
+In-process caches in front of hot database reads.
+
+Each cache is a plain object guarded by a lock so it can be shared between
+request threads and the background refresh threads it starts itself.
+"""
+
+import hashlib
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from .database import logger
+from ..config import get_config
+
+# Get configuration
+config = get_config()
+
+
+class _ScheduleEntry:
+    """A cached schedule listing for one date."""
+
+    __slots__ = ('value', 'version', 'loaded_at')
+
+    def __init__(self, value, version, loaded_at):
+        self.value = value
+        self.version = version
+        self.loaded_at = loaded_at
+
+
+class ScheduleCache:
+    """Versioned TTL cache for per-date schedule listings with stale-while-revalidate.
+
+    An entry is fresh for ``ttl_seconds``. After that, and for up to
+    ``stale_seconds`` more, it is still served while a background thread
+    reloads it. Bumping the version forces the next read to reload, but any
+    existing entry is still served if the database cannot be reached.
+    """
+
+    def __init__(self, ttl_seconds, stale_seconds, max_entries):
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.version = 0
+        self._entries = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get(self, key, loader):
+        """Return the cached value for key, loading it with loader() when needed"""
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            version = self.version
+
+        if entry is not None and entry.version == version:
+            age = now - entry.loaded_at
+            if age < self.ttl_seconds:
+                return entry.value
+            if age < self.ttl_seconds + self.stale_seconds:
+                self._refresh_in_background(key, loader)
+                return entry.value
+
+        try:
+            return self._load(key, loader, version)
+        except Exception as e:
+            if entry is None:
+                raise
+            logger.warning(f"Serving stale schedule for {key} after load failure: {e}")
+            return entry.value
+
+    def bump_version(self):
+        """Mark every cached listing as outdated (call after showings change)"""
+        with self._lock:
+            self.version += 1
+
+    def clear(self):
+        """Drop every cached listing"""
+        with self._lock:
+            self._entries.clear()
+
+    def _load(self, key, loader, version):
+        value = loader()
+        with self._lock:
+            # Don't overwrite with data loaded before a version bump
+            if version == self.version:
+                self._entries[key] = _ScheduleEntry(value, version, time.monotonic())
+                self._evict_locked()
+        return value
+
+    def _evict_locked(self):
+        while len(self._entries) > self.max_entries:
+            oldest_key = min(self._entries, key=lambda k: self._entries[k].loaded_at)
+            del self._entries[oldest_key]
+
+    def _refresh_in_background(self, key, loader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            version = self.version
+
+        def refresh():
+            try:
+                self._load(key, loader, version)
+            except Exception as e:
+                logger.warning(f"Background schedule refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name=f"schedule-refresh-{key}", daemon=True).start()
+
+
+class SessionCache:
+    """Bounded LRU/TTL cache of validated sessions keyed by token hash.
+
+    Raw session tokens are never kept in memory as keys, only their SHA-256.
+    A reverse index by account lets profile changes evict every session of
+    that account at once. Every invalidation bumps a generation counter;
+    put() drops data read before an invalidation, so a validation racing a
+    logout can't cache the revoked session.
+    """
+
+    def __init__(self, ttl_seconds, max_entries):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._keys_by_account = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(session_token):
+        return hashlib.sha256(session_token.encode('utf-8')).hexdigest()
+
+    def get(self, session_token):
+        """Return a copy of the cached session data, or None on a miss"""
+        key = self._key(session_token)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                session_data, cached_at = entry
+                expires_at = session_data.get('expires_at')
+                if now - cached_at >= self.ttl_seconds or (expires_at is not None and expires_at <= datetime.now()):
+                    self._remove_locked(key)
+                    entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[0])
+
+    def generation(self):
+        """Return the invalidation generation, read before loading the data to put()"""
+        with self._lock:
+            return self._generation
+
+    def put(self, session_token, session_data, generation=None):
+        """Cache the session data returned for a valid token
+
+        With generation, the data is not cached if any session was
+        invalidated since generation() returned it.
+        """
+        key = self._key(session_token)
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._remove_locked(key)
+            self._entries[key] = (dict(session_data), time.monotonic())
+            self._keys_by_account.setdefault(session_data.get('account_id'), set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                self._remove_locked(oldest_key)
+
+    def invalidate_token(self, session_token):
+        """Evict the session for a single token"""
+        with self._lock:
+            self._generation += 1
+            self._remove_locked(self._key(session_token))
+
+    def invalidate_account(self, account_id):
+        """Evict every cached session belonging to an account"""
+        with self._lock:
+            self._generation += 1
+            for key in list(self._keys_by_account.get(account_id, ())):
+                self._remove_locked(key)
+
+    def invalidate_expired(self):
+        """Evict every cached session whose expiry time has passed"""
+        now = datetime.now()
+        with self._lock:
+            expired_keys = [
+                key for key, (session_data, cached_at) in self._entries.items()
+                if session_data.get('expires_at') is not None and session_data['expires_at'] <= now
+            ]
+            for key in expired_keys:
+                self._remove_locked(key)
+
+    def clear(self):
+        """Drop every cached session"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._keys_by_account.clear()
+
+    def get_stats(self):
+        """Return hit/miss counters and current size for sizing the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'max_entries': self.max_entries
+            }
+
+    def _remove_locked(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.evictions += 1
+        account_id = entry[0].get('account_id')
+        account_keys = self._keys_by_account.get(account_id)
+        if account_keys is not None:
+            account_keys.discard(key)
+            if not account_keys:
+                del self._keys_by_account[account_id]
+
+
+class AgePriceTable:
+    """Age pricing rules compiled into a direct age -> rule lookup array."""
+
+    MAX_AGE = 150
+
+    __slots__ = ('rules', 'fallback', '_rule_by_age')
+
+    def __init__(self, rules):
+        self.rules = rules
+        # Fallback to adult pricing if no rule matches
+        self.fallback = next((rule for rule in rules if rule['name'] == 'Adulte'), rules[0])
+        self._rule_by_age = [self._match(age) for age in range(self.MAX_AGE + 1)]
+
+    def _match(self, age):
+        for rule in self.rules:
+            if rule['agemin'] <= age <= rule['agemax']:
+                return rule
+        return self.fallback
+
+    def lookup(self, age):
+        """Return the pricing rule applying to an age"""
+        if 0 <= age <= self.MAX_AGE:
+            return self._rule_by_age[age]
+        return self._match(age)
+
+
+class PricingCache:
+    """Compiled age pricing table and showing base prices.
+
+    Both are reloaded after ``ttl_seconds`` or as soon as the pricing
+    version is bumped.
+    """
+
+    def __init__(self, ttl_seconds):
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._age_table = None
+        self._age_table_version = None
+        self._age_table_loaded_at = 0.0
+        self._base_prices = {}
+        self._lock = threading.Lock()
+
+    def get_age_table(self, loader):
+        """Return the compiled AgePriceTable, loading it with loader() when needed"""
+        now = time.monotonic()
+        with self._lock:
+            version = self.version
+            if (self._age_table is not None and self._age_table_version == version
+                    and now - self._age_table_loaded_at < self.ttl_seconds):
+                return self._age_table
+
+        age_table = loader()
+        if age_table is not None:
+            with self._lock:
+                if version == self.version:
+                    self._age_table = age_table
+                    self._age_table_version = version
+                    self._age_table_loaded_at = time.monotonic()
+        return age_table
+
+    def get_base_prices(self, showing_ids, loader):
+        """Return {showing_id: base price in cents}, calling loader(missing_ids) for uncached showings"""
+        now = time.monotonic()
+        base_prices = {}
+        missing_ids = []
+
+        with self._lock:
+            version = self.version
+            for showing_id in showing_ids:
+                entry = self._base_prices.get(showing_id)
+                if entry is not None and entry[1] == version and now - entry[2] < self.ttl_seconds:
+                    base_prices[showing_id] = entry[0]
+                else:
+                    missing_ids.append(showing_id)
+
+        if missing_ids:
+            loaded_prices = loader(missing_ids)
+            base_prices.update(loaded_prices)
+            with self._lock:
+                if version == self.version:
+                    loaded_at = time.monotonic()
+                    for showing_id, base_price_cents in loaded_prices.items():
+                        self._base_prices[showing_id] = (base_price_cents, version, loaded_at)
+
+        return base_prices
+
+    def bump_version(self):
+        """Mark the age table and every base price as outdated"""
+        with self._lock:
+            self.version += 1
+            self._base_prices.clear()
+
+
+class RoomLayout:
+    """Static seat grid of a room with a seat id -> position index."""
+
+    __slots__ = ('room_id', 'seats', 'position_by_seat_id')
+
+    def __init__(self, room_id, seats):
+        self.room_id = room_id
+        # (id, type, seat_row, seat_column) tuples ordered by row and column
+        self.seats = tuple(seats)
+        self.position_by_seat_id = {seat[0]: position for position, seat in enumerate(self.seats)}
+
+    def to_bitmap(self, seat_ids):
+        """Build an occupancy bitmap with the bits of the given seats set"""
+        bitmap = 0
+        for seat_id in seat_ids:
+            position = self.position_by_seat_id.get(seat_id)
+            if position is not None:
+                bitmap |= 1 << position
+        return bitmap
+
+
+class SeatMapCache:
+    """Room seat layouts cached per room and occupancy bitmaps per showing.
+
+    Layouts and the room of each showing almost never change and are kept
+    for ``layout_ttl_seconds``. Occupancy is updated in place on every
+    booking commit from this process, and reloaded after
+    ``occupancy_ttl_seconds`` to pick up bookings made by other processes
+    and seats freed since.
+    """
+
+    def __init__(self, layout_ttl_seconds, occupancy_ttl_seconds, max_showings):
+        self.layout_ttl_seconds = layout_ttl_seconds
+        self.occupancy_ttl_seconds = occupancy_ttl_seconds
+        self.max_showings = max_showings
+        self._layouts = {}
+        self._room_by_showing = OrderedDict()
+        self._occupancy = OrderedDict()
+        # Seats marked by booking commits while occupancy loads: {showing_id: {load_id: seat_ids}}
+        self._pending_marks = {}
+        self._load_ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def get_room_id(self, showing_id, loader):
+        """Return the room of a showing, calling loader() when unknown or outdated"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._room_by_showing.get(showing_id)
+            if entry is not None and now - entry[1] < self.layout_ttl_seconds:
+                self._room_by_showing.move_to_end(showing_id)
+                return entry[0]
+
+        room_id = loader()
+        if room_id is not None:
+            with self._lock:
+                self._room_by_showing[showing_id] = (room_id, time.monotonic())
+                self._room_by_showing.move_to_end(showing_id)
+                while len(self._room_by_showing) > self.max_showings:
+                    self._room_by_showing.popitem(last=False)
+        return room_id
+
+    def get_layout(self, room_id, loader):
+        """Return the RoomLayout of a room, calling loader() when missing or outdated"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._layouts.get(room_id)
+            if entry is not None and now - entry[1] < self.layout_ttl_seconds:
+                return entry[0]
+
+        layout = loader()
+        with self._lock:
+            self._layouts[room_id] = (layout, time.monotonic())
+        return layout
+
+    def get_occupancy(self, showing_id, layout, loader):
+        """Return the occupancy bitmap of a showing, calling loader() for the reserved seat ids when needed"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._occupancy.get(showing_id)
+            if entry is not None and entry[1] is layout and now - entry[2] < self.occupancy_ttl_seconds:
+                self._occupancy.move_to_end(showing_id)
+                return entry[0]
+
+            load_id = next(self._load_ids)
+            self._pending_marks.setdefault(showing_id, {})[load_id] = set()
+
+        try:
+            bitmap = layout.to_bitmap(loader())
+        except BaseException:
+            with self._lock:
+                self._end_load_locked(showing_id, load_id)
+            raise
+
+        with self._lock:
+            # Keep seats booked by this process while the reservations were loading,
+            # the rest of the previous bitmap is outdated (seats may have been freed)
+            bitmap |= layout.to_bitmap(self._end_load_locked(showing_id, load_id))
+            self._occupancy[showing_id] = [bitmap, layout, time.monotonic()]
+            self._occupancy.move_to_end(showing_id)
+            while len(self._occupancy) > self.max_showings:
+                self._occupancy.popitem(last=False)
+        return bitmap
+
+    def _end_load_locked(self, showing_id, load_id):
+        """Stop recording marks for an occupancy load, returns the seat ids marked during it"""
+        loads = self._pending_marks[showing_id]
+        marks = loads.pop(load_id)
+        if not loads:
+            del self._pending_marks[showing_id]
+        return marks
+
+    def mark_occupied(self, showing_id, seat_ids):
+        """Set the bits of newly reserved seats after a booking commit"""
+        with self._lock:
+            entry = self._occupancy.get(showing_id)
+            if entry is not None:
+                entry[0] |= entry[1].to_bitmap(seat_ids)
+            for marks in self._pending_marks.get(showing_id, {}).values():
+                marks.update(seat_ids)
+
+    def invalidate_showing(self, showing_id):
+        """Drop the room and occupancy of a showing, e.g. after reservations were removed"""
+        with self._lock:
+            self._room_by_showing.pop(showing_id, None)
+            self._occupancy.pop(showing_id, None)
+
+    def invalidate_room(self, room_id):
+        """Drop the layout of a room and the occupancy of its showings"""
+        with self._lock:
+            self._layouts.pop(room_id, None)
+            for showing_id in [showing_id for showing_id, entry in self._room_by_showing.items()
+                               if entry[0] == room_id]:
+                del self._room_by_showing[showing_id]
+            stale_showings = [showing_id for showing_id, entry in self._occupancy.items()
+                              if entry[1].room_id == room_id]
+            for showing_id in stale_showings:
+                del self._occupancy[showing_id]
+
+    def clear(self):
+        """Drop every cached layout and occupancy bitmap"""
+        with self._lock:
+            self._layouts.clear()
+            self._room_by_showing.clear()
+            self._occupancy.clear()
+
+
+# Global cache instances
+schedule_cache = ScheduleCache(
+    ttl_seconds=config.SCHEDULE_CACHE_TTL_SECONDS,
+    stale_seconds=config.SCHEDULE_CACHE_STALE_SECONDS,
+    max_entries=config.SCHEDULE_CACHE_MAX_ENTRIES
+)
+
+session_cache = SessionCache(
+    ttl_seconds=config.SESSION_CACHE_TTL_SECONDS,
+    max_entries=config.SESSION_CACHE_MAX_ENTRIES
+)
+
+pricing_cache = PricingCache(ttl_seconds=config.PRICING_CACHE_TTL_SECONDS)
+
+seat_map_cache = SeatMapCache(
+    layout_ttl_seconds=config.SEAT_MAP_LAYOUT_TTL_SECONDS,
+    occupancy_ttl_seconds=config.SEAT_MAP_OCCUPANCY_TTL_SECONDS,
+    max_showings=config.SEAT_MAP_MAX_SHOWINGS
+)
+
+
+def bump_schedule_version():
+    """Invalidate cached schedule listings after showings or movies change"""
+    schedule_cache.bump_version()
+
+
+def bump_pricing_version():
+    """Invalidate the compiled age pricing table and cached base prices"""
+    pricing_cache.bump_version()
+
+
+def get_session_cache_stats():
+    """Get hit/miss counters of the session validation cache"""
+    return session_cache.get_stats()
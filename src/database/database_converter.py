@@ -0,0 +1,56 @@
+"""
+MySQL type conversion for the Cinema application.
+
+The connector's default converter returns TIME columns as timedelta and
+DECIMAL columns as Decimal, which every caller then rewrote row by row.
+Rows reach the application with:
+
+- TIME (showing.starttime): float seconds since midnight
+- DECIMAL (prices, age price factors): float
+
+The pure Python connector does this during fetch with CinemaConverter. The
+C extension switches to raw rows and converts every column in Python when
+given a converter class, so it keeps its native conversion instead and the
+pool's cursors convert only the TIME and DECIMAL columns afterwards (see
+native_column_converters).
+"""
+
+from datetime import timedelta
+import mysql.connector
+from mysql.connector.constants import FieldType
+from mysql.connector.conversion import MySQLConverter
+
+# Conversion of the C extension's native values of the columns CinemaConverter changes
+NATIVE_CONVERTERS = {
+    FieldType.TIME: timedelta.total_seconds,
+    FieldType.DECIMAL: float,
+    FieldType.NEWDECIMAL: float,
+}
+
+def uses_converter_class(db_config):
+    """Check if connections opened with db_config run the pure Python connector"""
+    return bool(db_config.get('use_pure')) or not mysql.connector.HAVE_CEXT
+
+def native_column_converters(description):
+    """Return (position, name, convert) for each column of a result needing conversion"""
+    return [(position, column[0], NATIVE_CONVERTERS[column[1]])
+            for position, column in enumerate(description or ())
+            if column[1] in NATIVE_CONVERTERS]
+
+
+class CinemaConverter(MySQLConverter):
+    """Converter class passed to the connector as converter_class."""
+
+    # The connector looks the converters up as _<field type name in lower case>_to_python
+    def _time_to_python(self, value, dsc=None):
+        """Return TIME values as seconds (float) instead of timedelta"""
+        time_value = super()._time_to_python(value, dsc)
+        if time_value is None:
+            return None
+        return time_value.total_seconds()
+
+    def _decimal_to_python(self, value, desc=None):
+        """Return DECIMAL values as float instead of Decimal"""
+        return float(value.decode(self.charset))
+
+    _newdecimal_to_python = _decimal_to_python
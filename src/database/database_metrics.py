@@ -0,0 +1,358 @@
+"""
+Database call metrics for the Cinema application.
+
+Every function wrapped by handle_db_errors is timed here. Statements run
+through pooled cursors and time spent waiting for the pool are attributed to
+the innermost tracked call, and calls slower than DB_SLOW_QUERY_MS are
+written to the slow query log with their SQL.
+
+Statements and pool checkouts are also counted per Flask request, to report
+them in debug headers, spot repeated per-row queries and enforce the query
+budgets declared on routes with query_budget.
+
+capture_statements collects the statements run in a block, for tools such
+as the EXPLAIN check of database_migrate.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from flask import g, has_request_context, request
+from ..config import get_config
+
+# Get configuration
+config = get_config()
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger(__name__ + '.slow_query')
+
+# Upper bounds (in milliseconds) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_current_call = ContextVar('db_current_call', default=None)
+_statement_capture = ContextVar('db_statement_capture', default=None)
+
+
+class _CallRecord:
+    """Statements and pool wait time of one tracked call."""
+
+    __slots__ = ('name', 'statements', 'pool_wait_seconds')
+
+    def __init__(self, name):
+        self.name = name
+        self.statements = []
+        self.pool_wait_seconds = 0.0
+
+
+class _FunctionStats:
+    """Aggregated metrics of one database function."""
+
+    __slots__ = ('calls', 'errors', 'total_seconds', 'max_seconds', 'rows',
+                 'statements', 'pool_wait_seconds', 'slow_calls', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.statements = 0
+        self.pool_wait_seconds = 0.0
+        self.slow_calls = 0
+        # One bucket per LATENCY_BUCKETS_MS bound plus one for slower calls
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def to_dict(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'total_ms': self.total_seconds * 1000,
+            'avg_ms': self.total_seconds * 1000 / self.calls if self.calls else 0.0,
+            'max_ms': self.max_seconds * 1000,
+            'rows': self.rows,
+            'statements': self.statements,
+            'pool_wait_ms': self.pool_wait_seconds * 1000,
+            'slow_calls': self.slow_calls,
+            'histogram': {
+                **{f"le_{bound}ms": count for bound, count in zip(LATENCY_BUCKETS_MS, self.histogram)},
+                'le_inf': self.histogram[-1]
+            }
+        }
+
+
+class DatabaseMetrics:
+    """Per-function call counts, latency histograms, rows and pool wait time."""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, call, elapsed_seconds, rows, error):
+        with self._lock:
+            stats = self._stats.get(call.name)
+            if stats is None:
+                stats = self._stats[call.name] = _FunctionStats()
+            stats.calls += 1
+            stats.errors += 1 if error else 0
+            stats.total_seconds += elapsed_seconds
+            stats.max_seconds = max(stats.max_seconds, elapsed_seconds)
+            stats.rows += rows
+            stats.statements += len(call.statements)
+            stats.pool_wait_seconds += call.pool_wait_seconds
+            stats.histogram[bisect_left(LATENCY_BUCKETS_MS, elapsed_seconds * 1000)] += 1
+            if elapsed_seconds * 1000 >= config.DB_SLOW_QUERY_MS:
+                stats.slow_calls += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in sorted(self._stats.items())}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+# Global metrics instance
+db_metrics = DatabaseMetrics()
+
+
+def _count_rows(result):
+    """Number of rows a database function returned"""
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    if isinstance(result, dict):
+        return 1
+    return 0
+
+
+@contextmanager
+def track_call(name):
+    """Time a database function call and collect what it ran
+
+    Yields a callback taking the function's result, used to count rows.
+    """
+    if not config.DB_METRICS_ENABLED:
+        yield lambda result: None
+        return
+
+    call = _CallRecord(name)
+    token = _current_call.set(call)
+    outcome = {'rows': 0, 'error': True}
+
+    def set_result(result):
+        outcome['rows'] = _count_rows(result)
+        outcome['error'] = False
+
+    start = time.perf_counter()
+    try:
+        yield set_result
+    finally:
+        elapsed_seconds = time.perf_counter() - start
+        _current_call.reset(token)
+        db_metrics.record(call, elapsed_seconds, outcome['rows'], outcome['error'])
+        if elapsed_seconds * 1000 >= config.DB_SLOW_QUERY_MS:
+            _log_slow_call(call, elapsed_seconds)
+
+
+def record_statement(operation, params=None):
+    """Attribute an executed statement to the current call and request"""
+    call = _current_call.get()
+    if call is not None:
+        call.statements.append((operation, params))
+
+    captured = _statement_capture.get()
+    if captured is not None:
+        captured.append((operation, params))
+
+    if has_request_context():
+        counts = _get_request_counts()
+        counts['statements'] += 1
+        counts['by_statement'][operation] = counts['by_statement'].get(operation, 0) + 1
+
+
+@contextmanager
+def capture_statements():
+    """Collect the (operation, params) of every statement executed in the block
+
+    Works whether or not DB_METRICS_ENABLED is set.
+    """
+    captured = []
+    token = _statement_capture.set(captured)
+    try:
+        yield captured
+    finally:
+        _statement_capture.reset(token)
+
+
+def record_checkout(wait_seconds):
+    """Attribute a pool checkout and its wait time to the current call and request"""
+    call = _current_call.get()
+    if call is not None:
+        call.pool_wait_seconds += wait_seconds
+
+    if has_request_context():
+        _get_request_counts()['checkouts'] += 1
+
+
+def _get_request_counts():
+    counts = g.get('_db_request_counts')
+    if counts is None:
+        counts = g._db_request_counts = {'statements': 0, 'checkouts': 0, 'by_statement': {}}
+    return counts
+
+
+def get_request_query_counts():
+    """Get the statements and checkouts counted so far in the current request"""
+    counts = _get_request_counts()
+    return {'statements': counts['statements'], 'checkouts': counts['checkouts']}
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a route runs more statements or checkouts than its declared budget."""
+
+
+def query_budget(max_statements, max_checkouts=None):
+    """Declare the most statements (and checkouts) a route may run per request
+
+    Place it right under @app.route. Exceeding the budget is logged, and
+    raises QueryBudgetExceeded when DB_QUERY_BUDGET_STRICT is enabled (the
+    default in the testing configuration).
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            return f(*args, **kwargs)
+        decorated_function.query_budget = (max_statements, max_checkouts)
+        return decorated_function
+    return decorator
+
+
+def init_request_query_tracking(app):
+    """Report per-request query counts, detect repeated statements and check query budgets"""
+
+    @app.after_request
+    def check_request_queries(response):
+        counts = g.get('_db_request_counts')
+        if counts is None:
+            return response
+
+        if config.DB_QUERY_DEBUG_HEADERS:
+            response.headers['X-DB-Statements'] = str(counts['statements'])
+            response.headers['X-DB-Checkouts'] = str(counts['checkouts'])
+        logger.debug(f"{request.method} {request.path}: {counts['statements']} statements, {counts['checkouts']} checkouts")
+
+        # The same SQL run many times in one request is usually a per-row query
+        for operation, executions in counts['by_statement'].items():
+            if executions >= config.DB_REPEATED_STATEMENT_THRESHOLD:
+                logger.warning(
+                    f"Possible N+1 query in {request.method} {request.path}: statement ran {executions} times: "
+                    f"{' '.join(operation.split())[:200]}"
+                )
+
+        view_function = app.view_functions.get(request.endpoint)
+        budget = getattr(view_function, 'query_budget', None)
+        if budget is not None:
+            max_statements, max_checkouts = budget
+            if counts['statements'] > max_statements or (max_checkouts is not None and counts['checkouts'] > max_checkouts):
+                message = (
+                    f"Query budget exceeded for {request.endpoint}: {counts['statements']} statements "
+                    f"(budget {max_statements}), {counts['checkouts']} checkouts (budget {max_checkouts})"
+                )
+                if config.DB_QUERY_BUDGET_STRICT:
+                    raise QueryBudgetExceeded(message)
+                logger.warning(message)
+
+        return response
+
+
+def get_db_metrics():
+    """Get per-function database metrics"""
+    return db_metrics.snapshot()
+
+
+def reset_db_metrics():
+    """Clear every collected database metric"""
+    db_metrics.reset()
+
+
+def _log_slow_call(call, elapsed_seconds):
+    """Write a slow call and its statements to the slow query log"""
+    statements = '\n'.join(' '.join(operation.split()) for operation, params in call.statements)
+    slow_query_logger.warning(
+        f"Slow database call {call.name}: {elapsed_seconds * 1000:.1f} ms, "
+        f"{len(call.statements)} statements, pool wait {call.pool_wait_seconds * 1000:.1f} ms\n{statements}"
+    )
+
+    if config.DB_SLOW_QUERY_EXPLAIN:
+        selects = [(operation, params) for operation, params in call.statements
+                   if operation.lstrip().upper().startswith('SELECT')]
+        if selects:
+            # EXPLAIN on its own connection so the slow request isn't delayed further
+            explain_queue.submit(call.name, selects)
+
+
+class ExplainQueue:
+    """Runs EXPLAIN for slow calls on a single background worker.
+
+    At most ``max_pending`` calls wait or run at a time; slow calls arriving
+    when the queue is full are not explained, so a burst of slow queries
+    (usually a loaded database) doesn't take more pool connections.
+    """
+
+    def __init__(self, max_pending):
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, name, statements):
+        """Queue the EXPLAIN of a slow call's statements, returns False if the queue is full"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.dropped += 1
+            logger.debug(f"EXPLAIN queue full, not explaining slow call {name}")
+            return False
+
+        try:
+            future = self._get_executor().submit(_explain_statements, name, statements)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda done: self._slots.release())
+        return True
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='slow-query-explain')
+            return self._executor
+
+
+# Global EXPLAIN queue instance
+explain_queue = ExplainQueue(config.DB_SLOW_QUERY_EXPLAIN_QUEUE_SIZE)
+
+
+def _explain_statements(name, statements):
+    """Log the EXPLAIN plan of the SELECT statements of a slow call"""
+    from .database import get_db_connection
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                # EXPLAIN emits a note that raise_on_warnings would turn into an error
+                cursor.execute("SET SESSION sql_notes = 0")
+                for operation, params in statements:
+                    cursor.execute(f"EXPLAIN {operation}", params)
+                    plan = cursor.fetchall()
+                    slow_query_logger.warning(f"EXPLAIN for slow call {name}: {' '.join(operation.split())}\n{plan}")
+            finally:
+                cursor.close()
+    except Exception as e:
+        logger.error(f"Failed to EXPLAIN slow call {name}: {e}")
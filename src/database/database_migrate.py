@@ -0,0 +1,330 @@
+"""
+Versioned schema migrations for the Cinema application.
+
+Applies the SQL files of the migrations directory in order and records each
+applied version in the schema_migration table. Also provides an EXPLAIN
+check that runs the queries of database_retrieve against a seeded database
+and flags full table scans.
+
+Usage:
+    python -m src.database.database_migrate status
+    python -m src.database.database_migrate upgrade [--target VERSION]
+    python -m src.database.database_migrate mark VERSION
+    python -m src.database.database_migrate explain
+"""
+
+import argparse
+import os
+import sys
+import mysql.connector
+from ..config import get_config
+
+# Get configuration
+config = get_config()
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+# Tables that are small lookup tables, read whole on purpose
+EXPECTED_FULL_SCAN_TABLES = {'ageprice'}
+
+
+def _connect():
+    """Open a dedicated connection for schema changes
+
+    MySQL reports harmless notes (e.g. DROP TRIGGER IF EXISTS on a missing
+    trigger) as warnings, which the application's raise_on_warnings would
+    turn into errors.
+    """
+    db_config = dict(config.get_database_config())
+    db_config['raise_on_warnings'] = False
+    return mysql.connector.connect(**db_config)
+
+
+def list_migrations():
+    """Return the (version, path) of every migration file, in order"""
+    migrations = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        if filename.endswith('.sql'):
+            migrations.append((filename[:-len('.sql')], os.path.join(MIGRATIONS_DIR, filename)))
+    return migrations
+
+
+def migration_number(version):
+    """Return the numeric prefix of a migration version, e.g. 4 for 0004_hot_path_indexes"""
+    return int(version.split('_', 1)[0])
+
+
+def resolve_target(target):
+    """Return the number of the migration a --target names, by full version or numeric prefix
+
+    Raises:
+        ValueError: If no migration matches the target
+    """
+    for version, path in list_migrations():
+        if target == version or (target.isdigit() and int(target) == migration_number(version)):
+            return migration_number(version)
+    raise ValueError(f"Unknown migration {target}")
+
+
+def split_statements(sql):
+    """Split a migration file into statements
+
+    Lines starting with -- are comments, and a statement ends with a ; at the
+    end of a line. Triggers must therefore be single statements.
+    """
+    statements = []
+    current = []
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith('--'):
+            continue
+        current.append(line)
+        if stripped.endswith(';'):
+            statements.append('\n'.join(current).rstrip().rstrip(';'))
+            current = []
+    if current:
+        statements.append('\n'.join(current))
+    return statements
+
+
+def _ensure_migration_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migration (
+            version VARCHAR(255) NOT NULL PRIMARY KEY,
+            applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def _get_applied_versions(cursor):
+    cursor.execute("SELECT version FROM schema_migration")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def get_migration_status():
+    """Return the (version, applied) status of every migration"""
+    conn = _connect()
+    try:
+        cursor = conn.cursor()
+        try:
+            _ensure_migration_table(cursor)
+            applied = _get_applied_versions(cursor)
+            return [(version, version in applied) for version, path in list_migrations()]
+        finally:
+            cursor.close()
+    finally:
+        conn.close()
+
+
+def upgrade(target=None):
+    """Apply every pending migration up to and including target
+
+    target is a migration version or its numeric prefix (0004 or 4).
+    MySQL commits DDL statements implicitly, so a migration that fails half
+    way is not rolled back and has to be fixed by hand before running again.
+
+    Returns:
+        list: Versions applied
+    """
+    target_number = resolve_target(target) if target is not None else None
+
+    conn = _connect()
+    applied_now = []
+    try:
+        cursor = conn.cursor()
+        try:
+            _ensure_migration_table(cursor)
+            applied = _get_applied_versions(cursor)
+
+            for version, path in list_migrations():
+                if target_number is not None and migration_number(version) > target_number:
+                    break
+                if version in applied:
+                    continue
+
+                with open(path, encoding='utf-8') as migration_file:
+                    statements = split_statements(migration_file.read())
+
+                print(f"Applying {version} ({len(statements)} statements)")
+                for statement in statements:
+                    cursor.execute(statement)
+                cursor.execute("INSERT INTO schema_migration (version) VALUES (%s)", (version,))
+                conn.commit()
+                applied_now.append(version)
+        finally:
+            cursor.close()
+    finally:
+        conn.close()
+    return applied_now
+
+
+def mark_applied(version):
+    """Record a migration as applied without running it, for databases migrated by hand"""
+    if version not in {known for known, path in list_migrations()}:
+        raise ValueError(f"Unknown migration {version}")
+
+    conn = _connect()
+    try:
+        cursor = conn.cursor()
+        try:
+            _ensure_migration_table(cursor)
+            cursor.execute("INSERT IGNORE INTO schema_migration (version) VALUES (%s)", (version,))
+            conn.commit()
+        finally:
+            cursor.close()
+    finally:
+        conn.close()
+
+
+def _load_sample_arguments(cursor):
+    """Pick existing rows of the seeded database to call the retrieve functions with"""
+    samples = {}
+    queries = {
+        'account': "SELECT id, username, email FROM account ORDER BY id LIMIT 1",
+        'session': "SELECT session_token FROM account_session LIMIT 1",
+        'showing': "SELECT id, date FROM showing ORDER BY id LIMIT 1",
+        'seat': "SELECT s.id FROM seat s JOIN showing sh ON sh.room_id = s.room_id ORDER BY sh.id, s.id LIMIT 1",
+        'booking': "SELECT id, account_id FROM booking ORDER BY id LIMIT 1",
+        'movie': "SELECT id FROM movie ORDER BY id LIMIT 1",
+        'poster': "SELECT id FROM movieposter ORDER BY id LIMIT 1",
+    }
+    for name, query in queries.items():
+        cursor.execute(query)
+        samples[name] = cursor.fetchone()
+    return samples
+
+
+def _retrieve_calls(samples):
+    """Return (name, call) pairs exercising every query of database_retrieve"""
+    from . import database_retrieve as retrieve
+
+    calls = []
+    account, session, showing = samples['account'], samples['session'], samples['showing']
+    seat, booking, movie, poster = samples['seat'], samples['booking'], samples['movie'], samples['poster']
+
+    if account:
+        calls += [
+            ('get_user_by_id', lambda: retrieve.get_user_by_id(account['id'])),
+            ('get_user_by_username', lambda: retrieve.get_user_by_username(account['username'])),
+            ('get_user_by_email', lambda: retrieve.get_user_by_email(account['email'])),
+        ]
+    if session:
+        calls.append(('validate_session_token', lambda: retrieve.validate_session_token(session['session_token'])))
+    if showing:
+        calls += [
+            ('get_movies_with_showings_by_date', lambda: retrieve.get_movies_with_showings_by_date(str(showing['date'])[:10])),
+            ('get_showing_by_id', lambda: retrieve.get_showing_by_id(showing['id'])),
+            ('get_seats_for_showing', lambda: retrieve.get_seats_for_showing(showing['id'])),
+            ('calculate_booking_price', lambda: retrieve.calculate_booking_price(showing['id'], [{'age': 30}])),
+        ]
+    if showing and seat:
+        calls.append(('get_seats_by_ids', lambda: retrieve.get_seats_by_ids(showing['id'], [seat['id']])))
+    calls.append(('get_age_pricing', retrieve.get_age_pricing))
+    if booking:
+        calls += [
+            ('get_booking_by_id', lambda: retrieve.get_booking_by_id(booking['id'])),
+            ('get_customers_for_booking', lambda: retrieve.get_customers_for_booking(booking['id'])),
+            ('get_bookings_by_account_id (current)',
+             lambda: retrieve.get_bookings_by_account_id(booking['account_id'], expired=False)),
+            ('get_bookings_by_account_id (expired)',
+             lambda: retrieve.get_bookings_by_account_id(booking['account_id'], expired=True)),
+        ]
+    if movie:
+        calls += [
+            ('get_movie_poster', lambda: retrieve.get_movie_poster(movie['id'])),
+            ('get_movie_posters', lambda: retrieve.get_movie_posters([movie['id']])),
+        ]
+    if poster:
+        calls.append(('get_poster_image_data', lambda: retrieve.get_poster_image_data(poster['id'])))
+    return calls
+
+
+def explain_retrieve_queries():
+    """Run EXPLAIN on every query of database_retrieve and flag full table scans
+
+    The retrieve functions are called with rows picked from the database, so
+    it must be seeded. Caches are cleared first so every query reaches it.
+
+    Returns:
+        list: (function name, table, statement) of each unexpected full scan
+    """
+    from .database_cache import schedule_cache, session_cache, pricing_cache, seat_map_cache
+    from .database_metrics import capture_statements
+
+    for cache in (schedule_cache, session_cache, seat_map_cache):
+        cache.clear()
+    pricing_cache.bump_version()
+
+    full_scans = []
+    conn = _connect()
+    try:
+        cursor = conn.cursor(dictionary=True)
+        try:
+            samples = _load_sample_arguments(cursor)
+            for name, call in _retrieve_calls(samples):
+                with capture_statements() as statements:
+                    call()
+
+                selects = [(operation, params) for operation, params in statements
+                           if operation.lstrip().upper().startswith('SELECT')]
+                if not selects:
+                    print(f"- {name}: no query run")
+                    continue
+
+                for operation, params in selects:
+                    cursor.execute(f"EXPLAIN {operation}", params)
+                    for row in cursor.fetchall():
+                        if row['type'] == 'ALL' and row['table'] not in EXPECTED_FULL_SCAN_TABLES:
+                            full_scans.append((name, row['table'], ' '.join(operation.split())))
+                            print(f"❌ {name}: full scan of {row['table']} (~{row['rows']} rows)")
+                        else:
+                            print(f"✓ {name}: {row['table']} via {row['key'] or row['type']}")
+        finally:
+            cursor.close()
+    finally:
+        conn.close()
+    return full_scans
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cinema database schema migrations")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('status', help="List migrations and whether they are applied")
+    upgrade_parser = subparsers.add_parser('upgrade', help="Apply pending migrations")
+    upgrade_parser.add_argument('--target', help="Last migration version (or its number) to apply")
+    mark_parser = subparsers.add_parser('mark', help="Record a migration as applied without running it")
+    mark_parser.add_argument('version')
+    subparsers.add_parser('explain', help="EXPLAIN the retrieve queries and flag full table scans")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'status':
+        for version, applied in get_migration_status():
+            print(f"{'✓' if applied else ' '} {version}")
+        return 0
+
+    if args.command == 'upgrade':
+        try:
+            applied = upgrade(args.target)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"✓ Applied {len(applied)} migrations" if applied else "✓ Database is up to date")
+        return 0
+
+    if args.command == 'mark':
+        mark_applied(args.version)
+        print(f"✓ Marked {args.version} as applied")
+        return 0
+
+    full_scans = explain_retrieve_queries()
+    if full_scans:
+        print(f"❌ {len(full_scans)} full table scans found")
+        return 1
+    print("✓ No full table scans found")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,7 +3,9 @@ import secrets
 from datetime import datetime, timedelta
 from werkzeug.security import generate_password_hash
 from .database import get_db_connection, handle_db_errors, logger
+from .database_cache import session_cache, seat_map_cache
 from ..config import get_config
+from ..seat_holds import seat_hold_manager
 
 # Get configuration
 config = get_config()
@@ -32,7 +34,14 @@ def create_session_token(account_id, ip_address=None, user_agent=None):
 
 @handle_db_errors(default_return=False)
 def invalidate_session_token(session_token):
-    """Mark a session token as inactive"""
+    """Mark a session token as inactive
+    
+    The cached session is evicted again after the commit: a request validating
+    the token while the UPDATE runs still sees it active, and the eviction also
+    stops that request from caching what it read (see SessionCache.put).
+    """
+    session_cache.invalidate_token(session_token)
+    
     with get_db_connection() as conn:
         cursor = conn.cursor()
         
@@ -43,6 +52,7 @@ def invalidate_session_token(session_token):
                 WHERE session_token = %s
             """, (session_token,))
             conn.commit()
+            session_cache.invalidate_token(session_token)
             return True
         finally:
             cursor.close()
@@ -61,6 +71,7 @@ def cleanup_expired_sessions():
             """)
             conn.commit()
             affected_rows = cursor.rowcount
+            session_cache.invalidate_expired()
             logger.info(f"Cleaned up {affected_rows} expired sessions.")
             return True
         finally:
@@ -154,6 +165,9 @@ def modify_account_profile(user_id, first_name, last_name, email, username, birt
             conn.commit()
             affected_rows = cursor.rowcount
             
+            # Cached sessions carry the old profile fields
+            session_cache.invalidate_account(user_id)
+            
             if affected_rows == 0:
                 return {"success": False, "error": "User not found"}
             
@@ -240,8 +254,14 @@ def modify_account_password(user_id, current_password, new_password):
         return {"success": False, "error": "Server unavailable, please try again later."}
 
 @handle_db_errors(default_return=False)
-def check_seats_availability(seat_ids, showing_id):
-    """Check if the given seats are available for the showing"""
+def check_seats_availability(seat_ids, showing_id, holder=None):
+    """Check if the given seats are available for the showing
+    
+    Seats temporarily held by anyone but holder count as unavailable.
+    """
+    if seat_hold_manager.is_any_held(showing_id, seat_ids, exclude_holder=holder):
+        return False
+    
     with get_db_connection() as conn:
         cursor = conn.cursor()
         
@@ -262,11 +282,141 @@ def check_seats_availability(seat_ids, showing_id):
         finally:
             cursor.close()
 
+def _insert_booking(conn, cursor, showing_id, account_id, spectators, selected_seats, booker_info):
+    """Run one booking attempt inside an open transaction
+    
+    Returns:
+        Result dictionary for create_complete_booking_secure
+    """
+    from .database_retrieve import _calculate_prices
+    
+    # Calculate the price server-side, on this connection if the pricing cache misses
+    price_info = _calculate_prices([(showing_id, spectators)], lambda: cursor)[0]
+    if not price_info:
+        conn.rollback()
+        return {'success': False, 'error': 'Could not calculate price'}
+    
+    # In optimistic mode the unique (showing_id, seat_id) index detects taken seats
+    if config.BOOKING_SEAT_LOCKING != 'optimistic':
+        # Verify seats are still available
+        placeholders = ','.join(['%s'] * len(selected_seats))
+        cursor.execute(f"""
+            SELECT seat_id FROM seatreservation 
+            WHERE showing_id = %s AND seat_id IN ({placeholders})
+        """, [showing_id] + selected_seats)
+        
+        occupied_seats = cursor.fetchall()
+        if occupied_seats:
+            conn.rollback()
+            return {'success': False, 'error': 'Some seats are no longer available'}
+    
+    # Create booking record with calculated price and booker information
+    cursor.execute("""
+        INSERT INTO booking (price, account_id, showing_id, first_name, last_name, email, num_spectators)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """, (
+        price_info['total_price'], 
+        account_id, 
+        showing_id,
+        booker_info['first_name'],
+        booker_info['last_name'],
+        booker_info['email'],
+        len(spectators)
+    ))
+    
+    booking_id = cursor.lastrowid
+    
+    # Create all customer records in one multi-row insert
+    customer_values = []
+    for spectator in spectators:
+        customer_values.extend([
+            spectator['firstname'],
+            spectator['lastname'],
+            int(spectator['age']),
+            spectator.get('pmr', 0),
+            booking_id
+        ])
+    
+    cursor.execute(f"""
+        INSERT INTO customer (firstname, lastname, age, pmr, booking_id)
+        VALUES {','.join(['(%s, %s, %s, %s, %s)'] * len(spectators))}
+    """, customer_values)
+    
+    # Auto-increment ids follow insertion order within the statement
+    cursor.execute("""
+        SELECT id FROM customer 
+        WHERE booking_id = %s 
+        ORDER BY id
+    """, (booking_id,))
+    customer_ids = [row['id'] for row in cursor.fetchall()]
+    
+    # Create all seat reservations in one multi-row insert
+    reservation_values = []
+    for customer_id, seat_id in zip(customer_ids, selected_seats):
+        reservation_values.extend([customer_id, showing_id, seat_id])
+    
+    cursor.execute(f"""
+        INSERT INTO seatreservation (customer_id, showing_id, seat_id)
+        VALUES {','.join(['(%s, %s, %s)'] * len(selected_seats))}
+    """, reservation_values)
+    
+    # Commit transaction
+    conn.commit()
+    
+    seat_map_cache.mark_occupied(int(showing_id), selected_seats)
+    
+    return {
+        'success': True,
+        'booking_id': booking_id,
+        'price_info': price_info
+    }
+
+def _book_once(showing_id, account_id, spectators, selected_seats, booker_info):
+    """Run one booking attempt on its own connection
+    
+    Returns:
+        Result dictionary for create_complete_booking_secure, or None when the
+        transaction hit a deadlock or lock wait timeout and can be retried
+    """
+    from mysql.connector import errorcode
+    
+    with get_db_connection() as conn:
+        cursor = conn.cursor(dictionary=True)
+        
+        try:
+            # Start transaction
+            conn.start_transaction()
+            return _insert_booking(conn, cursor, showing_id, account_id, spectators, selected_seats, booker_info)
+        
+        except mysql.connector.Error as e:
+            conn.rollback()
+            
+            if e.errno == errorcode.ER_DUP_ENTRY:
+                return {'success': False, 'error': 'Some seats are no longer available'}
+            
+            if e.errno not in (errorcode.ER_LOCK_DEADLOCK, errorcode.ER_LOCK_WAIT_TIMEOUT):
+                raise
+            
+            logger.warning(f"Lock conflict booking showing {showing_id}: {e}")
+            return None
+        finally:
+            cursor.close()
+
 @handle_db_errors(default_return=None)
 def create_complete_booking_secure(showing_id, account_id, spectators, selected_seats, booker_info=None):
     """
     Create a complete booking with server-side price calculation
     
+    The price is calculated and the booking written on a single connection, with
+    a fixed number of statements whatever the party size: seat check, booking
+    insert, one multi-row customer insert, customer id lookup and one multi-row
+    seat reservation insert.
+    
+    With BOOKING_SEAT_LOCKING = 'optimistic' the seat check is skipped and a
+    duplicate key on the unique (showing_id, seat_id) index is reported as a
+    taken seat. Deadlocks and lock wait timeouts are retried with backoff, the
+    connection going back to the pool while waiting.
+    
     Args:
         showing_id: ID of the showing
         account_id: ID of the account (None for anonymous)
@@ -277,99 +427,46 @@ def create_complete_booking_secure(showing_id, account_id, spectators, selected_
     Returns:
         Dictionary with booking_id and calculated price info
     """
+    import random
+    import time
     
-    # First, calculate the price server-side
-    from .database_retrieve import calculate_booking_price
-    
-    price_info = calculate_booking_price(showing_id, spectators)
-    if not price_info:
-        return {'success': False, 'error': 'Could not calculate price'}
+    if not selected_seats:
+        return {'success': False, 'error': 'No seats selected'}
     
     # Validate that number of spectators matches number of seats
     if len(spectators) != len(selected_seats):
         return {'success': False, 'error': 'Number of spectators must match number of seats'}
     
-    with get_db_connection() as conn:
-        cursor = conn.cursor(dictionary=True)
-        
-        try:
-            # Start transaction
-            conn.start_transaction()
-            
-            # Verify seats are still available
-            placeholders = ','.join(['%s'] * len(selected_seats))
-            cursor.execute(f"""
-                SELECT seat_id FROM seatreservation 
-                WHERE showing_id = %s AND seat_id IN ({placeholders})
-            """, [showing_id] + selected_seats)
-            
-            occupied_seats = cursor.fetchall()
-            if occupied_seats:
-                conn.rollback()
-                return {'success': False, 'error': 'Some seats are no longer available'}
-            
-            # Use account_id = 1 for anonymous bookings if none provided
-            if account_id is None:
-                account_id = 1
-            
-            # Ensure we have booker info for the booking table
-            if not booker_info:
-                # Use default values for anonymous bookings
-                booker_info = {
-                    'first_name': 'Anonymous',
-                    'last_name': 'User',
-                    'email': 'anonymous@cinemacousas.com'
-                }
-            
-            # Create booking record with calculated price and booker information
-            cursor.execute("""
-                INSERT INTO booking (price, account_id, showing_id, first_name, last_name, email)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (
-                price_info['total_price'], 
-                account_id, 
-                showing_id,
-                booker_info['first_name'],
-                booker_info['last_name'],
-                booker_info['email']
-            ))
-            
-            booking_id = cursor.lastrowid
-            
-            # Create customer records and seat reservations
-            for i, (spectator, seat_id) in enumerate(zip(spectators, selected_seats)):
-                # Create customer record
-                cursor.execute("""
-                    INSERT INTO customer (firstname, lastname, age, pmr, booking_id)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (
-                    spectator['firstname'],
-                    spectator['lastname'],
-                    int(spectator['age']),
-                    spectator.get('pmr', 0),
-                    booking_id
-                ))
-                
-                customer_id = cursor.lastrowid
-                
-                # Create seat reservation
-                cursor.execute("""
-                    INSERT INTO seatreservation (customer_id, showing_id, seat_id)
-                    VALUES (%s, %s, %s)
-                """, (customer_id, showing_id, seat_id))
-            
-            # Commit transaction
-            conn.commit()
-            
-            return {
-                'success': True,
-                'booking_id': booking_id,
-                'price_info': price_info
-            }
-            
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Error creating secure booking: {e}")
-            return {'success': False, 'error': 'Database error occurred'}
-        finally:
-            cursor.close()
+    # Use account_id = 1 for anonymous bookings if none provided
+    if account_id is None:
+        account_id = 1
+    
+    # Ensure we have booker info for the booking table
+    if not booker_info:
+        # Use default values for anonymous bookings
+        booker_info = {
+            'first_name': 'Anonymous',
+            'last_name': 'User',
+            'email': 'anonymous@cinemacousas.com'
+        }
+    
+    try:
+        attempt = 0
+        while True:
+            result = _book_once(showing_id, account_id, spectators, selected_seats, booker_info)
+            if result is not None:
+                return result
+            
+            if attempt >= config.BOOKING_DEADLOCK_RETRIES:
+                logger.error(f"Booking for showing {showing_id} still conflicting after {attempt} retries")
+                return {'success': False, 'error': 'The booking service is busy, please try again'}
+            
+            # Exponential backoff with jitter before retrying
+            delay = config.BOOKING_RETRY_BACKOFF_MS / 1000.0 * (2 ** attempt)
+            time.sleep(delay * random.uniform(0.5, 1.5))
+            attempt += 1
+            logger.warning(f"Retrying booking for showing {showing_id} after lock conflict (attempt {attempt})")
+    
+    except Exception as e:
+        logger.error(f"Error creating secure booking: {e}")
+        return {'success': False, 'error': 'Database error occurred'}
@@ -0,0 +1,314 @@
+"""
+Elastic connection pool for the Cinema application.
+
+Replaces mysql-connector's fixed-size pool: it can open overflow connections
+under load, blocks callers for a bounded time when exhausted, recycles old
+connections and pings connections that sat idle before lending them out.
+"""
+
+import collections
+import logging
+import threading
+import time
+import mysql.connector
+from mysql.connector.errors import PoolError
+from .database_converter import native_column_converters
+from .database_metrics import record_checkout, record_statement
+
+logger = logging.getLogger(__name__)
+
+
+class _ConnectionRecord:
+    """A raw connection with the bookkeeping the pool needs."""
+
+    __slots__ = ('conn', 'created_at', 'last_used_at')
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+
+
+class TrackedCursor:
+    """Cursor proxy that reports every executed statement to the metrics module.
+
+    With native_types, the connection converts values itself (C extension)
+    and the TIME and DECIMAL columns of fetched rows are converted here.
+    """
+
+    def __init__(self, cursor, native_types=False):
+        self._cursor = cursor
+        self._native_types = native_types
+        self._converters = ()
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        record_statement(operation, params)
+        result = self._cursor.execute(operation, params, *args, **kwargs)
+        if self._native_types:
+            self._converters = native_column_converters(getattr(self._cursor, 'description', None))
+        return result
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        record_statement(operation, seq_params)
+        return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        return self._convert(row) if self._converters and row is not None else row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        return [self._convert(row) for row in rows] if self._converters else rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        return [self._convert(row) for row in rows] if self._converters else rows
+
+    def __iter__(self):
+        if self._converters:
+            return (self._convert(row) for row in self._cursor)
+        return iter(self._cursor)
+
+    def _convert(self, row):
+        if isinstance(row, dict):
+            for position, name, convert in self._converters:
+                value = row[name]
+                if value is not None:
+                    row[name] = convert(value)
+            return row
+
+        values = list(row)
+        for position, name, convert in self._converters:
+            if values[position] is not None:
+                values[position] = convert(values[position])
+        return tuple(values)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class PooledConnection:
+    """Connection lent by ElasticConnectionPool; close() hands it back to the pool."""
+
+    def __init__(self, pool, record):
+        self._pool = pool
+        self._record = record
+        self.commits = 0
+
+    def commit(self):
+        """Commit the current transaction, counting commits so writes can be detected"""
+        if self._record is None:
+            raise PoolError("Connection has already been returned to the pool")
+        self._record.conn.commit()
+        self.commits += 1
+
+    def cursor(self, *args, **kwargs):
+        """Open a cursor whose statements are tracked"""
+        if self._record is None:
+            raise PoolError("Connection has already been returned to the pool")
+        return TrackedCursor(self._record.conn.cursor(*args, **kwargs), native_types=self._pool.native_types)
+
+    def close(self):
+        """Return the connection to the pool"""
+        record, self._record = self._record, None
+        if record is not None:
+            self._pool._release(record)
+
+    def __getattr__(self, name):
+        if self._record is None:
+            raise PoolError("Connection has already been returned to the pool")
+        return getattr(self._record.conn, name)
+
+
+class ElasticConnectionPool:
+    """Thread-safe MySQL connection pool with overflow, timeout and recycling.
+
+    Up to ``pool_size`` connections are kept idle between uses. Under load up
+    to ``max_overflow`` extra connections are opened and closed again when
+    returned. When every connection is in use, callers wait up to
+    ``pool_timeout`` seconds before a PoolError is raised.
+    """
+
+    def __init__(self, db_config, pool_name='cinema_pool', pool_size=10, max_overflow=20,
+                 pool_timeout=30, pool_recycle=3600, pool_reset_session=True,
+                 pool_pre_ping_seconds=30):
+        self.db_config = db_config
+        # Without CinemaConverter, cursors convert TIME and DECIMAL columns themselves
+        self.native_types = 'converter_class' not in db_config
+        self.pool_name = pool_name
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self.pool_recycle = pool_recycle
+        self.pool_reset_session = pool_reset_session
+        self.pool_pre_ping_seconds = pool_pre_ping_seconds
+
+        self._idle = collections.deque()
+        self._open_count = 0
+        self._condition = threading.Condition()
+
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.recycled = 0
+        self.failed_pings = 0
+
+    def prewarm(self, count=None):
+        """Open idle connections up front, returns the number opened"""
+        count = self.pool_size if count is None else min(count, self.pool_size)
+        opened = 0
+
+        while True:
+            with self._condition:
+                if self._open_count >= count:
+                    break
+                self._open_count += 1
+
+            try:
+                record = _ConnectionRecord(self._connect())
+            except Exception:
+                with self._condition:
+                    self._open_count -= 1
+                    self._condition.notify()
+                raise
+
+            with self._condition:
+                self._idle.append(record)
+                self._condition.notify()
+            opened += 1
+
+        logger.info(f"Pool {self.pool_name} pre-warmed with {opened} connections")
+        return opened
+
+    def get_connection(self):
+        """Borrow a connection, waiting up to pool_timeout seconds if the pool is exhausted"""
+        start = time.monotonic()
+        deadline = start + self.pool_timeout
+        waited = False
+        record = None
+
+        with self._condition:
+            while True:
+                if self._idle:
+                    # LIFO keeps the most recently used connections warm
+                    record = self._idle.pop()
+                    break
+                if self._open_count < self.pool_size + self.max_overflow:
+                    self._open_count += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolError(f"Pool {self.pool_name} exhausted, no connection available after {self.pool_timeout}s")
+                waited = True
+                self._condition.wait(remaining)
+
+        try:
+            if record is None:
+                record = _ConnectionRecord(self._connect())
+            else:
+                record = self._revalidate(record)
+        except Exception:
+            with self._condition:
+                self._open_count -= 1
+                self._condition.notify()
+            raise
+
+        wait_seconds = time.monotonic() - start
+        with self._condition:
+            self.checkouts += 1
+            if self._open_count > self.pool_size:
+                self.overflow_checkouts += 1
+            if waited:
+                self.waits += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+        record_checkout(wait_seconds)
+
+        return PooledConnection(self, record)
+
+    def get_stats(self):
+        """Return pool size, usage and wait time counters"""
+        with self._condition:
+            idle = len(self._idle)
+            return {
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'open': self._open_count,
+                'idle': idle,
+                'in_use': self._open_count - idle,
+                'checkouts': self.checkouts,
+                'overflow_checkouts': self.overflow_checkouts,
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+                'total_wait_seconds': self.total_wait_seconds,
+                'avg_wait_seconds': self.total_wait_seconds / self.checkouts if self.checkouts else 0.0,
+                'max_wait_seconds': self.max_wait_seconds,
+                'recycled': self.recycled,
+                'failed_pings': self.failed_pings
+            }
+
+    def close_all(self):
+        """Close every idle connection"""
+        with self._condition:
+            idle, self._idle = list(self._idle), collections.deque()
+            self._open_count -= len(idle)
+            self._condition.notify_all()
+
+        for record in idle:
+            self._close_quietly(record.conn)
+
+    def _connect(self):
+        return mysql.connector.connect(**self.db_config)
+
+    def _revalidate(self, record):
+        """Replace a connection that is too old or no longer answers a ping"""
+        now = time.monotonic()
+
+        if self.pool_recycle and now - record.created_at > self.pool_recycle:
+            self._close_quietly(record.conn)
+            with self._condition:
+                self.recycled += 1
+            return _ConnectionRecord(self._connect())
+
+        if now - record.last_used_at > self.pool_pre_ping_seconds and not record.conn.is_connected():
+            self._close_quietly(record.conn)
+            with self._condition:
+                self.failed_pings += 1
+            return _ConnectionRecord(self._connect())
+
+        return record
+
+    def _release(self, record):
+        """Take a connection back, closing it if it is overflow or broken"""
+        try:
+            if record.conn.in_transaction:
+                record.conn.rollback()
+            if self.pool_reset_session:
+                record.conn.reset_session()
+            healthy = True
+        except Exception as e:
+            logger.warning(f"Discarding connection from pool {self.pool_name}: {e}")
+            healthy = False
+
+        with self._condition:
+            if healthy and len(self._idle) < self.pool_size:
+                record.last_used_at = time.monotonic()
+                self._idle.append(record)
+                record = None
+            else:
+                self._open_count -= 1
+            self._condition.notify()
+
+        if record is not None:
+            self._close_quietly(record.conn)
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
@@ -1,9 +1,20 @@
 from .database import get_db_connection, handle_db_errors, logger
+from .database_cache import schedule_cache, session_cache, pricing_cache, seat_map_cache, AgePriceTable, RoomLayout
+from .database_rows import SeatRow, ShowingRow, BookingSummaryRow
+from ..config import get_config
+from ..seat_holds import seat_hold_manager
+
+# Get configuration
+config = get_config()
+
+# Showing start and end times for rows migrations 0002 and 0003 haven't filled in yet (s: showing, m: movie)
+SHOWING_START_AT_SQL = "COALESCE(s.start_at, TIMESTAMP(s.date, s.starttime))"
+SHOWING_END_AT_SQL = "COALESCE(s.end_at, TIMESTAMP(s.date, s.starttime) + INTERVAL m.duration MINUTE)"
 
 @handle_db_errors(default_return=None)
 def get_user_by_id(user_id):
     """Get user from database by ID with full profile information"""
-    with get_db_connection() as conn:
+    with get_db_connection(readonly=True) as conn:
         cursor = conn.cursor(dictionary=True)
         
         try:
@@ -16,7 +27,7 @@ def get_user_by_id(user_id):
 @handle_db_errors(default_return=None)
 def get_user_by_username(username):
     """Get user from database by username"""
-    with get_db_connection() as conn:
+    with get_db_connection(readonly=True) as conn:
         cursor = conn.cursor(dictionary=True)
         
         try:
@@ -29,7 +40,7 @@ def get_user_by_username(username):
 @handle_db_errors(default_return=None)
 def get_user_by_email(email):
     """Get user from database by email"""
-    with get_db_connection() as conn:
+    with get_db_connection(readonly=True) as conn:
         cursor = conn.cursor(dictionary=True)
         
         try:
@@ -41,13 +52,24 @@ def get_user_by_email(email):
 
 @handle_db_errors(default_return=None)
 def validate_session_token(session_token):
-    """Validate if a session token is active and not expired"""
-    with get_db_connection() as conn:
+    """Validate if a session token is active and not expired
+    
+    The returned (and cached) session data doesn't include the token itself.
+    """
+    cached_session = session_cache.get(session_token)
+    if cached_session is not None:
+        return cached_session
+    
+    # A logout committing while the row is read makes put() skip caching it
+    generation = session_cache.generation()
+    
+    with get_db_connection(readonly=True) as conn:
         cursor = conn.cursor(dictionary=True)
         
         try:
             cursor.execute("""
-                SELECT s.*, a.username, a.email, a.first_name, a.last_name, a.birthday 
+                SELECT s.account_id, s.expires_at, s.ip_address, s.user_agent,
+                       a.username, a.email, a.first_name, a.last_name, a.birthday 
                 FROM account_session s
                 JOIN account a ON s.account_id = a.id
                 WHERE s.session_token = %s 
@@ -55,93 +77,105 @@ def validate_session_token(session_token):
                 AND (s.expires_at IS NULL OR s.expires_at > NOW())
             """, (session_token,))
             
-            return cursor.fetchone()
+            session_data = cursor.fetchone()
+            if session_data:
+                session_cache.put(session_token, session_data, generation)
+            return session_data
         finally:
             cursor.close()
 
 @handle_db_errors(default_return=[])
 def get_movies_with_showings_by_date(target_date):
-    """Get movies that have non-expired showings on a specific date"""
-    with get_db_connection() as conn:
+    """Get movies that have non-expired showings on a specific date
+    
+    The full listing for the day comes from the schedule cache; showings that
+    have already ended are filtered out here, at read time, so they drop out
+    on time even while the cached listing is reused.
+    """
+    from datetime import date, datetime
+    
+    day = date.fromisoformat(str(target_date))
+    schedule = schedule_cache.get(day, lambda: _load_schedule_for_date(day))
+    current_time = datetime.now()
+    
+    movies_with_valid_showings = []
+    for movie, showings in schedule:
+        # Copies, so callers updating a showing never change the cached schedule
+        valid_showings = [showing.copy() for show_end, showing in showings if show_end >= current_time]
+        
+        # Only include movie if it has at least one valid showing
+        if valid_showings:
+            movie = dict(movie)
+            movie['showings'] = valid_showings
+            movies_with_valid_showings.append(movie)
+    
+    return movies_with_valid_showings
+
+def _load_schedule_for_date(day):
+    """Load every showing of a day with its movie in a single joined query
+    
+    Returns:
+        list: (movie, [(show_end, showing), ...]) tuples ordered by movie name and start time
+    """
+    with get_db_connection(readonly=True) as conn:
         cursor = conn.cursor(dictionary=True)
         
         try:
             from datetime import datetime, timedelta
-            current_time = datetime.now()
-            
-            # Get movies that have showings on the target date
-            cursor.execute("""
-                SELECT DISTINCT m.* 
-                FROM movie m
-                INNER JOIN showing s ON m.id = s.movie_id
-                WHERE DATE(s.date) = %s
-                ORDER BY m.name
-            """, (target_date,))
-            movies = cursor.fetchall()
-            
-            # For each movie, get its non-expired showings for the target date
-            movies_with_valid_showings = []
             
-            for movie in movies:
-                cursor.execute("""
-                    SELECT id, date, starttime, baseprice, room_id 
-                    FROM showing 
-                    WHERE movie_id = %s AND DATE(date) = %s
-                    ORDER BY starttime
-                """, (movie['id'], target_date))
-                all_showings = cursor.fetchall()
-                
-                # Filter out expired showings using Python datetime calculations
-                valid_showings = []
+            # Range predicate on the indexed start_at column (migration 0003)
+            day_start = datetime.combine(day, datetime.min.time())
+            cursor.execute(f"""
+                SELECT m.*,
+                       s.id AS showing_id, s.date AS showing_date,
+                       s.starttime AS showing_starttime,
+                       s.baseprice AS showing_baseprice,
+                       s.room_id AS showing_room_id,
+                       {SHOWING_END_AT_SQL} AS showing_end_at
+                FROM showing s
+                INNER JOIN movie m ON m.id = s.movie_id
+                WHERE s.start_at >= %s AND s.start_at < %s
+                ORDER BY m.name, m.id, s.start_at
+            """, (day_start, day_start + timedelta(days=1)))
+            rows = cursor.fetchall()
+            
+            movie_columns = [column for column in cursor.column_names
+                             if not column.startswith('showing_')]
+            
+            # Group showings under their movie in one pass
+            schedule = []
+            showings_by_movie_id = {}
+            
+            for row in rows:
+                if row['showing_end_at'] is None:
+                    # No end_at and no movie duration: the showing can't be listed
+                    logger.warning(f"Skipping showing {row['showing_id']} without an end time")
+                    continue
                 
-                for showing in all_showings:
-                    # Calculate show start time
-                    show_date = showing['date']
-                    start_time = showing['starttime']
-                    duration = movie['duration']
-                    
-                    # Convert starttime to seconds if it's a timedelta
-                    if hasattr(start_time, 'total_seconds'):
-                        start_seconds = int(start_time.total_seconds())
-                    else:
-                        start_seconds = int(start_time)
-                    
-                    # Calculate show start datetime
-                    start_hour = start_seconds // 3600
-                    start_minute = (start_seconds % 3600) // 60
-                    start_second = start_seconds % 60
-                    
-                    show_start = datetime.combine(show_date, datetime.min.time().replace(
-                        hour=start_hour, minute=start_minute, second=start_second
-                    ))
-                    
-                    # Calculate show end time
-                    show_end = show_start + timedelta(minutes=duration)
-                    
-                    # Only include showing if it hasn't ended yet
-                    if show_end >= current_time:
-                        # Convert timedelta objects to total seconds for JSON serialization
-                        if hasattr(showing['starttime'], 'total_seconds'):
-                            showing['starttime'] = showing['starttime'].total_seconds()
-                        valid_showings.append(showing)
+                showings = showings_by_movie_id.get(row['id'])
+                if showings is None:
+                    showings = []
+                    showings_by_movie_id[row['id']] = showings
+                    schedule.append(({column: row[column] for column in movie_columns}, showings))
                 
-                # Only include movie if it has at least one valid showing
-                if valid_showings:
-                    movie['showings'] = valid_showings
-                    movies_with_valid_showings.append(movie)
+                showing_values = (row['showing_id'], row['showing_date'], row['showing_starttime'],
+                                  row['showing_baseprice'], row['showing_room_id'])
+                if config.DB_ROW_MODELS:
+                    showing = ShowingRow(*showing_values)
+                else:
+                    showing = dict(zip(ShowingRow.__slots__, showing_values))
+                showings.append((row['showing_end_at'], showing))
             
-            print(f"DEBUG: Movies with non-expired showings on {target_date}: {len(movies_with_valid_showings)}")
-            for movie in movies_with_valid_showings:
-                print(f"  - {movie['name']}: {len(movie['showings'])} showings")
+            logger.debug(f"Loaded schedule for {day}: {len(schedule)} movies")
             
-            return movies_with_valid_showings
+            return schedule
         finally:
             cursor.close()
 
 @handle_db_errors(default_return=None)
 def get_showing_by_id(showing_id):
     """Get showing details by ID with movie and room information"""
-    with get_db_connection() as conn:
+    with get_db_connection(readonly=True) as conn:
         cursor = conn.cursor(dictionary=True)
         
         try:
@@ -154,105 +188,173 @@ def get_showing_by_id(showing_id):
                 WHERE s.id = %s
             """, (showing_id,))
             
-            showing = cursor.fetchone()
-            
-            if showing and hasattr(showing['starttime'], 'total_seconds'):
-                showing['starttime'] = showing['starttime'].total_seconds()
-                
-            return showing
+            return cursor.fetchone()
         finally:
             cursor.close()
 
 
+def _showing_start_at(showing):
+    """Start time of a showing, from date + starttime when start_at is NULL"""
+    from datetime import datetime, timedelta
+    
+    if showing.get('start_at'):
+        return showing['start_at']
+    
+    day, starttime = showing.get('date'), showing.get('starttime')
+    if not day or starttime is None:
+        return None
+    
+    if not isinstance(starttime, timedelta):
+        starttime = timedelta(seconds=float(starttime))
+    return datetime.combine(day, datetime.min.time()) + starttime
+
+def _showing_end_at(showing):
+    """End time of a showing, from date + starttime + duration when end_at is NULL"""
+    from datetime import timedelta
+    
+    if showing.get('end_at'):
+        return showing['end_at']
+    
+    start_at, duration = _showing_start_at(showing), showing.get('duration')
+    if start_at is None or duration is None:
+        return None
+    return start_at + timedelta(minutes=duration)
+
 def is_showing_expired(showing):
-    """Check if a showing has expired based on end time (start time + movie duration)
+    """Check if a showing has expired based on its precomputed end time
     
     Args:
-        showing: A showing dictionary with date, starttime, and duration fields
+        showing: A showing (or booking) dictionary with the end_at field of migration 0002,
+            or its date, starttime and duration when end_at is NULL
         
     Returns:
         bool: True if the showing has expired (ended), False otherwise
     """
-    from datetime import datetime, timedelta
+    from datetime import datetime
     
-    if not showing:
+    end_at = _showing_end_at(showing) if showing else None
+    if end_at is None:
         return True
     
-    try:
-        current_time = datetime.now()
-        show_date = showing['date']
-        start_time = showing['starttime'] 
-        duration = showing['duration']
-        
-        # Convert starttime to seconds if it's a timedelta
-        if hasattr(start_time, 'total_seconds'):
-            start_seconds = int(start_time.total_seconds())
-        else:
-            start_seconds = int(start_time)
-        
-        # Calculate show start datetime
-        start_hour = start_seconds // 3600
-        start_minute = (start_seconds % 3600) // 60
-        start_second = start_seconds % 60
-        
-        show_start = datetime.combine(show_date, datetime.min.time().replace(
-            hour=start_hour, minute=start_minute, second=start_second
-        ))
-        
-        # Calculate show end time
-        show_end = show_start + timedelta(minutes=duration)
-        
-        # Return True if the show has ended
-        is_expired = show_end < current_time
-        
-        print(f"DEBUG: Checking expiration for showing {showing.get('id', 'unknown')}")
-        print(f"  Show start: {show_start}")
-        print(f"  Show end: {show_end}")
-        print(f"  Current time: {current_time}")
-        print(f"  Is expired: {is_expired}")
-        print("---")
+    return end_at < datetime.now()
+
+def _lazy_cursor(stack):
+    """Return a function that checks out one connection and dictionary cursor on first use
+    
+    The connection and cursor are released when the given ExitStack closes.
+    """
+    cursor = None
+    
+    def get_cursor():
+        nonlocal cursor
+        if cursor is None:
+            conn = stack.enter_context(get_db_connection(readonly=True))
+            cursor = conn.cursor(dictionary=True)
+            stack.callback(cursor.close)
+        return cursor
+    
+    return get_cursor
+
+def _load_showing_room_id(cursor, showing_id):
+    """Load the room of a showing"""
+    cursor.execute("SELECT room_id FROM showing WHERE id = %s", (showing_id,))
+    showing = cursor.fetchone()
+    return showing['room_id'] if showing else None
+
+def _load_room_layout(cursor, room_id):
+    """Load the static seat grid of a room"""
+    cursor.execute("""
+        SELECT id, type, seat_row, seat_column
+        FROM seat
+        WHERE room_id = %s
+        ORDER BY seat_row, seat_column
+    """, (room_id,))
+    
+    return RoomLayout(room_id, [
+        (seat['id'], seat['type'], seat['seat_row'], seat['seat_column'])
+        for seat in cursor.fetchall()
+    ])
+
+def _load_reserved_seat_ids(cursor, showing_id):
+    """Load the ids of the seats reserved for a showing"""
+    cursor.execute("SELECT seat_id FROM seatreservation WHERE showing_id = %s", (showing_id,))
+    return [row['seat_id'] for row in cursor.fetchall()]
+
+def _get_seat_map(showing_id):
+    """Get the cached room layout and occupancy bitmap of a showing
+    
+    Returns:
+        tuple: (RoomLayout, occupancy bitmap), or (None, 0) if the showing doesn't exist
+    """
+    from contextlib import ExitStack
+    
+    with ExitStack() as stack:
+        get_cursor = _lazy_cursor(stack)
         
-        return is_expired
+        room_id = seat_map_cache.get_room_id(showing_id, lambda: _load_showing_room_id(get_cursor(), showing_id))
+        if room_id is None:
+            return None, 0
         
-    except Exception as e:
-        print(f"ERROR: Failed to check showing expiration: {e}")
-        # In case of error, consider expired to be safe
-        return True
+        layout = seat_map_cache.get_layout(room_id, lambda: _load_room_layout(get_cursor(), room_id))
+        occupancy = seat_map_cache.get_occupancy(showing_id, layout, lambda: _load_reserved_seat_ids(get_cursor(), showing_id))
+        return layout, occupancy
+
+def _seat_dict(layout, position, occupancy, held_seat_ids):
+    """Build the seat dictionary (or SeatRow with DB_ROW_MODELS) for a layout position"""
+    seat_id, seat_type, seat_row, seat_column = layout.seats[position]
+    is_occupied = 1 if (occupancy >> position) & 1 or seat_id in held_seat_ids else 0
+    if config.DB_ROW_MODELS:
+        return SeatRow(seat_id, seat_type, seat_row, seat_column, is_occupied)
+    return {
+        'id': seat_id,
+        'type': seat_type,
+        'seat_row': seat_row,
+        'seat_column': seat_column,
+        'is_occupied': is_occupied
+    }
 
 @handle_db_errors(default_return=[])
-def get_seats_for_showing(showing_id):
-    """Get all seats for a showing with their reservation status"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor(dictionary=True)
-        
-        try:
-            # First get the room_id from the showing
-            cursor.execute("SELECT room_id FROM showing WHERE id = %s", (showing_id,))
-            showing = cursor.fetchone()
-            
-            if not showing:
-                return []
-            
-            room_id = showing['room_id']
-            
-            # Get all seats for this room with their reservation status
-            cursor.execute("""
-                SELECT s.id, s.type, s.seat_row, s.seat_column,
-                       CASE WHEN sr.seat_id IS NOT NULL THEN 1 ELSE 0 END as is_occupied
-                FROM seat s
-                LEFT JOIN seatreservation sr ON s.id = sr.seat_id AND sr.showing_id = %s
-                WHERE s.room_id = %s
-                ORDER BY s.seat_row, s.seat_column
-            """, (showing_id, room_id))
-            
-            return cursor.fetchall()
-        finally:
-            cursor.close()
+def get_seats_for_showing(showing_id, holder=None):
+    """Get all seats for a showing with their reservation status
+    
+    The seat grid comes from the room layout cache and reservations from the
+    showing's occupancy bitmap, so a warm seat map needs no database access.
+    Seats temporarily held by anyone but holder are reported as occupied.
+    """
+    showing_id = int(showing_id)
+    layout, occupancy = _get_seat_map(showing_id)
+    if layout is None:
+        return []
+    
+    held_seat_ids = seat_hold_manager.get_held_seat_ids(showing_id, exclude_holder=holder)
+    
+    return [_seat_dict(layout, position, occupancy, held_seat_ids) for position in range(len(layout.seats))]
+
+@handle_db_errors(default_return=[])
+def get_seats_by_ids(showing_id, seat_ids, holder=None):
+    """Get only the given seats of a showing with their reservation status
+    
+    Uses the seat id index of the cached room layout, so the cost depends on
+    the number of requested seats rather than the size of the room. Seats
+    are returned in room order, unknown ids are skipped.
+    """
+    showing_id = int(showing_id)
+    layout, occupancy = _get_seat_map(showing_id)
+    if layout is None:
+        return []
+    
+    held_seat_ids = seat_hold_manager.get_held_seat_ids(showing_id, exclude_holder=holder)
+    
+    positions = sorted(
+        position for position in (layout.position_by_seat_id.get(int(seat_id)) for seat_id in set(seat_ids))
+        if position is not None
+    )
+    return [_seat_dict(layout, position, occupancy, held_seat_ids) for position in positions]
 
 @handle_db_errors(default_return=[])
 def get_age_pricing():
     """Get all age pricing rules"""
-    with get_db_connection() as conn:
+    with get_db_connection(readonly=True) as conn:
         cursor = conn.cursor(dictionary=True)
         
         try:
@@ -265,6 +367,92 @@ def get_age_pricing():
         finally:
             cursor.close()
 
+def _load_age_price_table(cursor):
+    """Load the age pricing rules and compile them into an AgePriceTable"""
+    cursor.execute("""
+        SELECT id, name, agemin, agemax, factor
+        FROM ageprice
+        ORDER BY agemin
+    """)
+    
+    age_rules = cursor.fetchall()
+    if not age_rules:
+        return None
+    
+    return AgePriceTable(age_rules)
+
+def _load_base_prices(cursor, showing_ids):
+    """Load the base price (in cents) of several showings in one query"""
+    placeholders = ','.join(['%s'] * len(showing_ids))
+    cursor.execute(f"""
+        SELECT id, baseprice 
+        FROM showing 
+        WHERE id IN ({placeholders})
+    """, list(showing_ids))
+    
+    return {row['id']: row['baseprice'] for row in cursor.fetchall()}
+
+def _price_spectators(base_price_cents, spectators, age_table):
+    """Price a list of spectators against a base price and the compiled age table"""
+    # Convert base price from cents to euros
+    base_price = base_price_cents / 100.0
+    
+    total_price = 0.0
+    price_breakdown = []
+    
+    # Calculate price for each spectator
+    for spectator in spectators:
+        age = int(spectator['age'])
+        rule = age_table.lookup(age)
+        
+        # Calculate price for this spectator (already in euros)
+        spectator_price = base_price * rule['factor']
+        total_price += spectator_price
+        
+        price_breakdown.append({
+            'age': age,
+            'category': rule['name'],
+            'factor': rule['factor'],
+            'price': round(spectator_price, 2)
+        })
+    
+    return {
+        'total_price': round(total_price, 2),
+        'base_price': base_price,
+        'spectator_count': len(spectators),
+        'price_breakdown': price_breakdown
+    }
+
+def _calculate_prices(quotes, get_cursor):
+    """Price (showing_id, spectators) quotes using the pricing cache
+    
+    get_cursor is only called when the age table or a base price has to be
+    loaded from the database, and must return a dictionary cursor.
+    """
+    age_table = pricing_cache.get_age_table(lambda: _load_age_price_table(get_cursor()))
+    if age_table is None:
+        return [None] * len(quotes)
+    
+    showing_ids = list(dict.fromkeys(int(showing_id) for showing_id, spectators in quotes))
+    base_prices = pricing_cache.get_base_prices(showing_ids, lambda missing_ids: _load_base_prices(get_cursor(), missing_ids))
+    
+    results = []
+    for showing_id, spectators in quotes:
+        base_price_cents = base_prices.get(int(showing_id))
+        if base_price_cents is None:
+            results.append(None)
+        else:
+            results.append(_price_spectators(base_price_cents, spectators, age_table))
+    return results
+
+def _calculate_prices_with_pool(quotes):
+    """Price quotes, checking out a pooled connection only on a pricing cache miss"""
+    from contextlib import ExitStack
+    
+    # Only check out a connection if something is missing from the pricing cache
+    with ExitStack() as stack:
+        return _calculate_prices(quotes, _lazy_cursor(stack))
+
 @handle_db_errors(default_return=None)
 def calculate_booking_price(showing_id, spectators):
     """
@@ -277,84 +465,31 @@ def calculate_booking_price(showing_id, spectators):
     Returns:
         Dictionary with total_price and price_breakdown
     """
-    with get_db_connection() as conn:
-        cursor = conn.cursor(dictionary=True)
-        try:
-            # Get showing base price
-            cursor.execute("""
-                SELECT baseprice 
-                FROM showing 
-                WHERE id = %s
-            """, (showing_id,))
-            
-            showing = cursor.fetchone()
-            if not showing:
-                return None
-                
-            # Convert base price from cents to euros
-            base_price_cents = float(showing['baseprice'])
-            base_price = base_price_cents / 100.0  # Convert cents to euros
-            
-            # Get age pricing rules
-            cursor.execute("""
-                SELECT id, name, agemin, agemax, factor
-                FROM ageprice
-                ORDER BY agemin
-            """)
-            
-            age_rules = cursor.fetchall()
-            
-            if not age_rules:
-                return None
-            
-            total_price = 0.0
-            price_breakdown = []
-            
-            # Calculate price for each spectator
-            for spectator in spectators:
-                age = int(spectator['age'])
-                
-                # Find appropriate age rule
-                applicable_rule = None
-                for rule in age_rules:
-                    if rule['agemin'] <= age <= rule['agemax']:
-                        applicable_rule = rule
-                        break
-                
-                if not applicable_rule:
-                    # Fallback to adult pricing if no rule matches
-                    applicable_rule = next((r for r in age_rules if r['name'] == 'Adulte'), age_rules[0])
-                
-                # Calculate price for this spectator (already in euros)
-                spectator_price = base_price * float(applicable_rule['factor'])
-                total_price += spectator_price
-                
-                price_breakdown.append({
-                    'age': age,
-                    'category': applicable_rule['name'],
-                    'factor': float(applicable_rule['factor']),
-                    'price': round(spectator_price, 2)
-                })
-            
-            return {
-                'total_price': round(total_price, 2),
-                'base_price': base_price,
-                'spectator_count': len(spectators),
-                'price_breakdown': price_breakdown
-            }
-            
-        finally:
-            cursor.close()
+    return _calculate_prices_with_pool([(showing_id, spectators)])[0]
+
+@handle_db_errors(default_return=None)
+def calculate_booking_prices(quotes):
+    """
+    Calculate several booking prices in one call
+    
+    Args:
+        quotes: List of (showing_id, spectators) tuples, spectators being dictionaries with 'age' key
+    
+    Returns:
+        List with one price dictionary per quote (None for unknown showings), see calculate_booking_price
+    """
+    return _calculate_prices_with_pool(quotes)
 
 @handle_db_errors(default_return=None)
 def get_booking_by_id(booking_id):
     """Get booking details with showing and movie information"""
-    with get_db_connection() as conn:
+    with get_db_connection(readonly=True) as conn:
         cursor = conn.cursor(dictionary=True)
         
         try:
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT b.*, s.date, s.starttime, s.baseprice,
+                       {SHOWING_START_AT_SQL} AS start_at, {SHOWING_END_AT_SQL} AS end_at,
                        m.name as movie_name, m.duration,
                        r.name as room_name,
                        b.first_name as booker_first_name,
@@ -367,19 +502,14 @@ def get_booking_by_id(booking_id):
                 WHERE b.id = %s
             """, (booking_id,))
             
-            booking = cursor.fetchone()
-            
-            if booking and hasattr(booking['starttime'], 'total_seconds'):
-                booking['starttime'] = booking['starttime'].total_seconds()
-                
-            return booking
+            return cursor.fetchone()
         finally:
             cursor.close()
 
 @handle_db_errors(default_return=[])
 def get_customers_for_booking(booking_id):
     """Get all customers/spectators for a booking with their seat information"""
-    with get_db_connection() as conn:
+    with get_db_connection(readonly=True) as conn:
         cursor = conn.cursor(dictionary=True)
         
         try:
@@ -396,102 +526,132 @@ def get_customers_for_booking(booking_id):
         finally:
             cursor.close()
 
+def encode_booking_cursor(booking):
+    """Build the keyset pagination cursor pointing after a booking, None if it has no start time"""
+    start_at = _showing_start_at(booking)
+    if start_at is None:
+        return None
+    return f"{start_at.isoformat()}_{booking['id']}"
+
+def decode_booking_cursor(cursor_value):
+    """Parse a booking cursor into (start_at, id), None if it is missing or invalid"""
+    from datetime import datetime
+    
+    if not cursor_value:
+        return None
+    try:
+        start_at, booking_id = cursor_value.rsplit('_', 1)
+        return datetime.fromisoformat(start_at), int(booking_id)
+    except ValueError:
+        return None
+
 @handle_db_errors(default_return=[])
-def get_bookings_by_account_id(account_id, expired=False):
+def get_bookings_by_account_id(account_id, expired=False, after=None, limit=None):
     """Get bookings for a specific account with movie and showing information
     
+    Bookings are ordered from the latest showing to the oldest, and split on
+    the showing start and end times precomputed by migrations 0002 and 0003,
+    or derived from date, starttime and duration where those are NULL.
+    
     Args:
         account_id: The account ID to get bookings for
         expired: If True, get only expired tickets. If False, get only non-expired tickets.
+        after: Cursor from encode_booking_cursor, only bookings after it are returned
+        limit: Maximum number of bookings to return, all of them if None
+    """
+    from datetime import datetime
+    
+    # Python's clock rather than NOW(), the database may run in another timezone
+    query = f"""
+        SELECT b.id, b.price, b.account_id, b.showing_id, b.num_spectators,
+               s.date, s.starttime, s.baseprice,
+               {SHOWING_START_AT_SQL} AS start_at, {SHOWING_END_AT_SQL} AS end_at,
+               m.name as movie_name, m.duration,
+               r.name as room_name
+        FROM booking b
+        JOIN showing s ON b.showing_id = s.id
+        JOIN movie m ON s.movie_id = m.id
+        JOIN room r ON s.room_id = r.id
+        WHERE b.account_id = %s AND {SHOWING_END_AT_SQL} {'<' if expired else '>='} %s
+    """
+    params = [account_id, datetime.now()]
+    
+    position = decode_booking_cursor(after)
+    if position is not None:
+        after_start_at, after_id = position
+        query += f" AND ({SHOWING_START_AT_SQL} < %s OR ({SHOWING_START_AT_SQL} = %s AND b.id < %s))"
+        params += [after_start_at, after_start_at, after_id]
+    
+    query += " ORDER BY start_at DESC, b.id DESC"
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit)
+    
+    with get_db_connection(readonly=True) as conn:
+        cursor = conn.cursor(dictionary=not config.DB_ROW_MODELS)
+        
+        try:
+            cursor.execute(query, params)
+            if config.DB_ROW_MODELS:
+                return BookingSummaryRow.from_cursor(cursor)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+@handle_db_errors(default_return=None)
+def get_booking_totals_by_account_id(account_id, expired=False):
+    """Get the number of bookings and tickets and the amount spent over all of an account's bookings
+    
+    Args:
+        account_id: The account ID to get the totals for
+        expired: If True, total only expired bookings. If False, only non-expired ones.
+    
+    Returns:
+        dict: bookings, tickets and price totals
     """
-    with get_db_connection() as conn:
+    from datetime import datetime
+    
+    with get_db_connection(readonly=True) as conn:
         cursor = conn.cursor(dictionary=True)
         
         try:
-            # Get all bookings first, then filter in Python for accurate timezone handling
-            cursor.execute("""
-                SELECT b.id, b.price, b.account_id, b.showing_id,
-                       s.date, s.starttime, s.baseprice,
-                       m.name as movie_name, m.duration,
-                       r.name as room_name,
-                       COUNT(c.id) as num_spectators
+            cursor.execute(f"""
+                SELECT COUNT(*) AS bookings,
+                       COALESCE(SUM(b.num_spectators), 0) AS tickets,
+                       COALESCE(SUM(b.price), 0) AS price
                 FROM booking b
                 JOIN showing s ON b.showing_id = s.id
                 JOIN movie m ON s.movie_id = m.id
-                JOIN room r ON s.room_id = r.id
-                LEFT JOIN customer c ON b.id = c.booking_id
-                WHERE b.account_id = %s
-                GROUP BY b.id, b.price, b.account_id, b.showing_id, s.date, s.starttime, s.baseprice, m.name, m.duration, r.name
-                ORDER BY s.date DESC, s.starttime DESC
-            """, (account_id,))
+                WHERE b.account_id = %s AND {SHOWING_END_AT_SQL} {'<' if expired else '>='} %s
+            """, (account_id, datetime.now()))
             
-            all_bookings = cursor.fetchall()
-            
-            # Filter bookings using Python datetime calculations for accuracy
-            from datetime import datetime, timedelta
-            current_time = datetime.now()
-            
-            print(f"DEBUG: Total bookings found: {len(all_bookings)}")
-            print(f"DEBUG: Current Python time: {current_time}")
-            
-            filtered_bookings = []
-            
-            for booking in all_bookings:
-                # Calculate show start time
-                show_date = booking['date']
-                start_time = booking['starttime']
-                duration = booking['duration']
-                
-                # Convert starttime to seconds if it's a timedelta
-                if hasattr(start_time, 'total_seconds'):
-                    start_seconds = int(start_time.total_seconds())
-                else:
-                    start_seconds = int(start_time)
-                
-                # Calculate show start datetime
-                start_hour = start_seconds // 3600
-                start_minute = (start_seconds % 3600) // 60
-                start_second = start_seconds % 60
-                
-                show_start = datetime.combine(show_date, datetime.min.time().replace(
-                    hour=start_hour, minute=start_minute, second=start_second
-                ))
-                
-                # Calculate show end time
-                show_end = show_start + timedelta(minutes=duration)
-                
-                # Determine if expired
-                is_expired = show_end < current_time
-                
-                print(f"DEBUG: Booking {booking['id']} - Movie: {booking['movie_name']}")
-                print(f"  Show date: {show_date}, Start time: {start_hour:02d}:{start_minute:02d}, Duration: {duration} min")
-                print(f"  Show start: {show_start}")
-                print(f"  Show end: {show_end}")
-                print(f"  Current time: {current_time}")
-                print(f"  Is expired: {is_expired}")
-                print("---")
-                
-                # Filter based on expired parameter
-                if expired and is_expired:
-                    filtered_bookings.append(booking)
-                elif not expired and not is_expired:
-                    filtered_bookings.append(booking)
-            
-            print(f"DEBUG: Filtered bookings ({'expired' if expired else 'current'}): {len(filtered_bookings)}")
-            
-            # Convert timedelta objects to total seconds for display
-            for booking in filtered_bookings:
-                if hasattr(booking['starttime'], 'total_seconds'):
-                    booking['starttime'] = booking['starttime'].total_seconds()
-                    
-            return filtered_bookings
+            totals = cursor.fetchone()
+            return {
+                'bookings': int(totals['bookings']),
+                'tickets': int(totals['tickets']),
+                'price': float(totals['price'])
+            }
         finally:
             cursor.close()
 
+def get_bookings_page_by_account_id(account_id, expired=False, after=None, page_size=20):
+    """Get one page of an account's bookings and the cursor of the next page
+    
+    Returns:
+        tuple: (bookings, next_cursor), next_cursor is None on the last page
+    """
+    # One extra row tells whether another page follows
+    bookings = get_bookings_by_account_id(account_id, expired=expired, after=after, limit=page_size + 1)
+    if len(bookings) <= page_size:
+        return bookings, None
+    
+    bookings = bookings[:page_size]
+    return bookings, encode_booking_cursor(bookings[-1])
+
 @handle_db_errors(default_return=None)
 def get_movie_poster(movie_id):
     """Get the primary poster for a movie (without image blob data)"""
-    with get_db_connection() as conn:
+    with get_db_connection(readonly=True) as conn:
         cursor = conn.cursor(dictionary=True)
         
         try:
@@ -506,15 +666,54 @@ def get_movie_poster(movie_id):
         finally:
             cursor.close()
 
+@handle_db_errors(default_return=None)
+def get_movie_posters(movie_ids):
+    """Get the primary posters for several movies in one query (without image blob data)
+    
+    Args:
+        movie_ids: List of movie IDs
+        
+    Returns:
+        dict: Mapping of movie ID to its primary poster, movies without a poster are omitted
+    """
+    movie_ids = list(dict.fromkeys(movie_ids))
+    if not movie_ids:
+        return {}
+    
+    with get_db_connection(readonly=True) as conn:
+        cursor = conn.cursor(dictionary=True)
+        
+        try:
+            placeholders = ','.join(['%s'] * len(movie_ids))
+            cursor.execute(f"""
+                SELECT id, movie_id, name, mime_type, file_size
+                FROM movieposter 
+                WHERE movie_id IN ({placeholders}) AND is_primary = 1
+                ORDER BY id
+            """, movie_ids)
+            
+            posters = {}
+            for poster in cursor.fetchall():
+                movie_id = poster.pop('movie_id')
+                # Keep the first primary poster, like the LIMIT 1 of get_movie_poster
+                posters.setdefault(movie_id, poster)
+            return posters
+        finally:
+            cursor.close()
+
 @handle_db_errors(default_return=None)
 def get_poster_image_data(poster_id):
-    """Get the actual image blob data for a poster"""
-    with get_db_connection() as conn:
+    """Get the image of a poster
+    
+    Posters moved to the poster file store (migration 0005) only return their
+    content_hash, image_data is None; the BLOB is only read for the others.
+    """
+    with get_db_connection(readonly=True) as conn:
         cursor = conn.cursor()
         
         try:
             cursor.execute("""
-                SELECT image, mime_type
+                SELECT CASE WHEN content_hash IS NULL THEN image END, mime_type, content_hash
                 FROM movieposter 
                 WHERE id = %s
             """, (poster_id,))
@@ -523,7 +722,8 @@ def get_poster_image_data(poster_id):
             if result:
                 return {
                     'image_data': result[0],
-                    'mime_type': result[1]
+                    'mime_type': result[1],
+                    'content_hash': result[2]
                 }
             return None
         finally:
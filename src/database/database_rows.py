@@ -0,0 +1,115 @@
+"""
+Compact row models for the Cinema application.
+
+Dictionary cursors allocate one dict per row. With DB_ROW_MODELS enabled,
+the largest results (seat maps, daily showings and ticket history) are
+returned as __slots__ objects instead, built from plain tuple rows through
+a column index computed once per query.
+
+Row models behave like the dictionaries they replace for reading and
+updating fields: row['id'], row.get('id'), row.id in templates, dict(row),
+row.copy() and JSON responses through RowModelJSONProvider.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+
+class RowModel:
+    """Base class of the row models; subclasses list their columns in __slots__."""
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    @classmethod
+    def column_index(cls, column_names):
+        """Return the position of each model field in a cursor's columns"""
+        return tuple(column_names.index(name) for name in cls.__slots__)
+
+    @classmethod
+    def from_cursor(cls, cursor):
+        """Fetch every remaining row of a tuple cursor as models"""
+        index = cls.column_index(list(cursor.column_names))
+        return [cls(*[row[position] for position in index]) for row in cursor.fetchall()]
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def keys(self):
+        return self.__slots__
+
+    def values(self):
+        return [getattr(self, name) for name in self.__slots__]
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.__slots__]
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def copy(self):
+        return type(self)(*self.values())
+
+    def __eq__(self, other):
+        if isinstance(other, RowModel):
+            return type(self) is type(other) and self.values() == other.values()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class SeatRow(RowModel):
+    """A seat of a showing with its reservation status."""
+
+    __slots__ = ('id', 'type', 'seat_row', 'seat_column', 'is_occupied')
+
+
+class ShowingRow(RowModel):
+    """A showing of the daily schedule."""
+
+    __slots__ = ('id', 'date', 'starttime', 'baseprice', 'room_id')
+
+
+class BookingSummaryRow(RowModel):
+    """A booking of the ticket history with its showing, movie and room."""
+
+    __slots__ = ('id', 'price', 'account_id', 'showing_id', 'num_spectators',
+                 'date', 'starttime', 'baseprice', 'start_at', 'end_at',
+                 'movie_name', 'duration', 'room_name')
+
+
+class RowModelJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes row models as objects."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, RowModel):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
+
+
+def init_row_models(app):
+    """Let jsonify and the tojson template filter serialize row models"""
+    app.json = RowModelJSONProvider(app)
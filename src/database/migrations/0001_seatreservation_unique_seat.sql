@@ -0,0 +1,5 @@
+-- A seat can only be reserved once per showing.
+-- Optimistic booking (BOOKING_SEAT_LOCKING=optimistic) relies on this index
+-- and reports the duplicate key error as a taken seat.
+ALTER TABLE seatreservation
+    ADD UNIQUE INDEX uq_seatreservation_showing_seat (showing_id, seat_id);
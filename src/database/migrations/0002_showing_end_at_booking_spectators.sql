@@ -0,0 +1,29 @@
+-- Precomputed showing end time, so expired and current bookings can be
+-- filtered in SQL. Triggers keep it in sync with the showing's date and
+-- start time and with the movie's duration.
+ALTER TABLE showing
+    ADD COLUMN end_at DATETIME NULL;
+
+UPDATE showing s
+    JOIN movie m ON s.movie_id = m.id
+    SET s.end_at = TIMESTAMP(s.date, s.starttime) + INTERVAL m.duration MINUTE;
+
+CREATE TRIGGER showing_end_at_insert BEFORE INSERT ON showing
+    FOR EACH ROW SET NEW.end_at = TIMESTAMP(NEW.date, NEW.starttime)
+        + INTERVAL (SELECT duration FROM movie WHERE id = NEW.movie_id) MINUTE;
+
+CREATE TRIGGER showing_end_at_update BEFORE UPDATE ON showing
+    FOR EACH ROW SET NEW.end_at = TIMESTAMP(NEW.date, NEW.starttime)
+        + INTERVAL (SELECT duration FROM movie WHERE id = NEW.movie_id) MINUTE;
+
+CREATE TRIGGER movie_duration_update AFTER UPDATE ON movie
+    FOR EACH ROW UPDATE showing
+        SET end_at = TIMESTAMP(date, starttime) + INTERVAL NEW.duration MINUTE
+        WHERE movie_id = NEW.id AND NEW.duration <> OLD.duration;
+
+-- Number of spectators stored on the booking instead of counted from customer.
+ALTER TABLE booking
+    ADD COLUMN num_spectators INT NOT NULL DEFAULT 0;
+
+UPDATE booking b
+    SET b.num_spectators = (SELECT COUNT(*) FROM customer c WHERE c.booking_id = b.id);
@@ -0,0 +1,27 @@
+-- Precomputed showing start time next to end_at (migration 0002), so
+-- date listings and expiry checks use range predicates on indexed columns.
+ALTER TABLE showing
+    ADD COLUMN start_at DATETIME NULL AFTER starttime;
+
+UPDATE showing
+    SET start_at = TIMESTAMP(date, starttime);
+
+-- Replace the end_at triggers of migration 0002 with ones maintaining both columns
+DROP TRIGGER IF EXISTS showing_end_at_insert;
+
+DROP TRIGGER IF EXISTS showing_end_at_update;
+
+CREATE TRIGGER showing_start_end_at_insert BEFORE INSERT ON showing
+    FOR EACH ROW SET NEW.start_at = TIMESTAMP(NEW.date, NEW.starttime),
+                     NEW.end_at = TIMESTAMP(NEW.date, NEW.starttime)
+                         + INTERVAL (SELECT duration FROM movie WHERE id = NEW.movie_id) MINUTE;
+
+CREATE TRIGGER showing_start_end_at_update BEFORE UPDATE ON showing
+    FOR EACH ROW SET NEW.start_at = TIMESTAMP(NEW.date, NEW.starttime),
+                     NEW.end_at = TIMESTAMP(NEW.date, NEW.starttime)
+                         + INTERVAL (SELECT duration FROM movie WHERE id = NEW.movie_id) MINUTE;
+
+ALTER TABLE showing
+    ADD INDEX idx_showing_start_at (start_at),
+    ADD INDEX idx_showing_movie_start_at (movie_id, start_at),
+    ADD INDEX idx_showing_end_at (end_at);
@@ -0,0 +1,24 @@
+-- Indexes for the access paths of the hot queries.
+-- seatreservation (showing_id, seat_id) is covered by migration 0001 and
+-- showing (movie_id, start_at) by migration 0003, which replaces the
+-- showing (movie_id, date) lookups.
+
+-- validate_session_token, invalidate_session_token
+ALTER TABLE account_session
+    ADD INDEX idx_account_session_token (session_token);
+
+-- get_customers_for_booking, booking creation
+ALTER TABLE customer
+    ADD INDEX idx_customer_booking (booking_id);
+
+-- get_customers_for_booking joins reservations on their customer
+ALTER TABLE seatreservation
+    ADD INDEX idx_seatreservation_customer (customer_id);
+
+-- get_bookings_by_account_id
+ALTER TABLE booking
+    ADD INDEX idx_booking_account (account_id);
+
+-- get_movie_poster, get_movie_posters
+ALTER TABLE movieposter
+    ADD INDEX idx_movieposter_movie_primary (movie_id, is_primary);
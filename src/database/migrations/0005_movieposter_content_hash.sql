@@ -0,0 +1,6 @@
+-- Poster images move to the content-addressed poster file store
+-- (python -m src.poster_store extract). content_hash is the SHA-256 of the
+-- image, image becomes nullable so extracted BLOBs can be cleared.
+ALTER TABLE movieposter
+    ADD COLUMN content_hash CHAR(64) NULL,
+    MODIFY image LONGBLOB NULL;
@@ -4,6 +4,7 @@ Email service module for sending booking confirmations with PDF attachments.
 
 import smtplib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
@@ -84,11 +85,10 @@ class EmailService:
         else:
             formatted_time = str(start_time)
         
-        # Format price
+        # Format price (booking prices are stored in euros)
         price = booking_data.get('price', 0)
         if isinstance(price, (int, float)):
-            price_euros = price / 100.0  # Convert cents to euros
-            formatted_price = f"{price_euros:.2f} €"
+            formatted_price = f"{price:.2f} €"
         else:
             formatted_price = f"{price} €"
         
@@ -287,3 +287,7 @@ def send_booking_confirmation_email(booking_data, pdf_content, booker_email, boo
     """
     email_service = EmailService()
     return email_service.send_booking_confirmation(booking_data, pdf_content, booker_email, booker_name)
+
+
+# Background email sending, separate from the PDF rendering worker so a slow SMTP server never delays PDFs
+email_executor = ThreadPoolExecutor(max_workers=get_config().EMAIL_SEND_WORKERS, thread_name_prefix='email')
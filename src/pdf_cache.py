@@ -0,0 +1,190 @@
+"""
+Booking PDF cache for the Cinema application.
+Bookings don't change after creation, so the PDF of a booking is rendered
+once and kept on disk, keyed by booking id and a hash of the rendered
+inputs. The confirmation email, downloads and printing all share it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from .config import get_config
+from .pdf_generator import create_pdf_generator
+from .poster_store import write_atomic
+
+# Get configuration
+config = get_config()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class BookingPDFCache:
+    """Disk cache of booking PDFs with least-recently-used eviction.
+
+    Files are named ``<booking_id>-<input hash>.pdf``; the hash covers the
+    booking and ticket data and whether the expired notice is shown, so a
+    booking whose showing has ended gets a new PDF. Reads refresh the file's
+    modification time, which eviction uses as the recency order. Concurrent
+    requests for the same PDF render it once.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._total_bytes = None
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pdf-cache')
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_generate(self, booking_data, tickets_data, expired):
+        """Return the PDF bytes of a booking, rendering and caching them on a miss"""
+        path = self._path(booking_data, tickets_data, expired)
+
+        try:
+            with open(path, 'rb') as pdf_file:
+                pdf_content = pdf_file.read()
+            os.utime(path)
+            with self._lock:
+                self.hits += 1
+            return pdf_content
+        except OSError:
+            pass
+
+        with self._lock:
+            future = self._pending.get(path)
+            owner = future is None
+            if owner:
+                future = self._pending[path] = Future()
+                self.misses += 1
+
+        if not owner:
+            # Another request is rendering this PDF
+            return future.result()
+
+        try:
+            pdf_content = self._render(booking_data, tickets_data, expired)
+            future.set_result(pdf_content)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(path, None)
+
+        try:
+            self._store(booking_data['id'], path, pdf_content)
+        except OSError as e:
+            logger.warning(f"Could not cache PDF of booking {booking_data['id']}: {e}")
+        return pdf_content
+
+    def generate_in_background(self, booking_data, tickets_data, expired):
+        """Render and cache a booking PDF in the background
+
+        Returns:
+            Future: Resolves to the PDF bytes
+        """
+        return self._executor.submit(self.get_or_generate, booking_data, tickets_data, expired)
+
+    def invalidate(self, booking_id):
+        """Remove every cached PDF of a booking"""
+        for path in self._booking_files(booking_id):
+            self._remove(path)
+
+    def get_stats(self):
+        """Return hit counters and disk usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+    def _render(self, booking_data, tickets_data, expired):
+        pdf_generator = create_pdf_generator()
+        return pdf_generator.generate_booking_pdf(booking_data, tickets_data, include_expired=expired).getvalue()
+
+    def _path(self, booking_data, tickets_data, expired):
+        inputs = json.dumps({'booking': booking_data, 'tickets': tickets_data, 'expired': bool(expired)},
+                            sort_keys=True, default=str)
+        input_hash = hashlib.sha256(inputs.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{booking_data['id']}-{input_hash}.pdf")
+
+    def _booking_files(self, booking_id):
+        prefix = f"{booking_id}-"
+        try:
+            return [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                    if name.startswith(prefix) and name.endswith('.pdf')]
+        except FileNotFoundError:
+            return []
+
+    def _store(self, booking_id, path, pdf_content):
+        # Older renderings of the booking (e.g. from before it expired) are never read again
+        for stale_path in self._booking_files(booking_id):
+            if stale_path != path:
+                self._remove(stale_path)
+
+        write_atomic(path, pdf_content)
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(pdf_content)
+        self._evict()
+
+    def _remove(self, path):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes -= size
+
+    def _evict(self):
+        """Delete the least recently used PDFs while the cache is over max_bytes"""
+        with self._lock:
+            if self._total_bytes is not None and self._total_bytes <= self.max_bytes:
+                return
+
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.pdf'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total_bytes = sum(size for mtime, size, name in entries)
+        evicted = 0
+        for mtime, size, name in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            total_bytes -= size
+            evicted += 1
+
+        with self._lock:
+            self._total_bytes = total_bytes
+            self.evictions += evicted
+
+# Global booking PDF cache instance
+pdf_cache = BookingPDFCache(config.PDF_CACHE_DIR, config.PDF_CACHE_MAX_BYTES)
+
+def get_pdf_cache():
+    """Get the global booking PDF cache instance."""
+    return pdf_cache
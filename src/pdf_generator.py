@@ -12,79 +12,149 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
 from io import BytesIO
+import copy
 import datetime
 from typing import List, Dict, Any, Optional
 import os
 
+def _build_stylesheet():
+    """Build the paragraph styles of the tickets: the sample stylesheet plus custom styles"""
+    styles = getSampleStyleSheet()
+    
+    # Title style
+    styles.add(ParagraphStyle(
+        name='TicketTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=20,
+        alignment=TA_CENTER,
+        textColor=colors.HexColor('#0d6efd')
+    ))
+
+    # Movie title style
+    styles.add(ParagraphStyle(
+        name='MovieTitle',
+        parent=styles['Heading2'],
+        fontSize=18,
+        spaceAfter=12,
+        alignment=TA_LEFT,
+        textColor=colors.HexColor('#212529')
+    ))
+
+    # Section header style
+    styles.add(ParagraphStyle(
+        name='SectionHeader',
+        parent=styles['Heading3'],
+        fontSize=14,
+        spaceAfter=8,
+        spaceBefore=12,
+        alignment=TA_LEFT,
+        textColor=colors.HexColor('#0d6efd')
+    ))
+
+    # Info text style
+    styles.add(ParagraphStyle(
+        name='InfoText',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceAfter=6,
+        alignment=TA_LEFT
+    ))
+
+    # Highlight style for important info
+    styles.add(ParagraphStyle(
+        name='Highlight',
+        parent=styles['Normal'],
+        fontSize=12,
+        spaceAfter=8,
+        alignment=TA_LEFT,
+        textColor=colors.HexColor('#198754'),
+        fontName='Helvetica-Bold'
+    ))
+
+    # Footer style
+    styles.add(ParagraphStyle(
+        name='Footer',
+        parent=styles['Normal'],
+        fontSize=9,
+        alignment=TA_CENTER,
+        textColor=colors.grey
+    ))
+    
+    return styles
+
+# Built once per process and shared by every PDF; ReportLab only reads styles while building
+TICKET_STYLES = _build_stylesheet()
+
+# Booking information and movie details tables
+INFO_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 4),
+])
+
+# Ticket details table of the booking PDF
+TICKET_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('TOPPADDING', (0, 0), (-1, -1), 2),
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f8f9fa')),
+    ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#dee2e6')),
+    ('INNERGRID', (0, 0), (-1, -1), 1, colors.HexColor('#dee2e6')),
+])
+
+# Ticket table of the single ticket PDF
+SINGLE_TICKET_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('BOX', (0, 0), (-1, -1), 2, colors.HexColor('#0d6efd')),
+    ('INNERGRID', (0, 0), (-1, -1), 1, colors.HexColor('#dee2e6')),
+])
+
+def _build_static_paragraphs():
+    """Parse the paragraphs that are the same in every PDF once"""
+    footer_info = [
+        "• Please arrive at least 15 minutes before the showing time",
+        "• Tickets are non-refundable and non-transferable",
+        "• Food and beverages purchased outside are not permitted",
+        "• Mobile phones should be silenced during the movie",
+        "• For assistance, contact our customer service"
+    ]
+    
+    return {
+        'title': Paragraph("🎬 CINEMACOUSAS", TICKET_STYLES['TicketTitle']),
+        'ticket_separator': Paragraph("- " * 50, TICKET_STYLES['Footer']),
+        'footer': [Paragraph("Important Information", TICKET_STYLES['SectionHeader'])]
+                  + [Paragraph(info, TICKET_STYLES['InfoText']) for info in footer_info],
+    }
+
+# Paragraphs keep layout state while a document is built, so each build uses shallow copies
+STATIC_PARAGRAPHS = _build_static_paragraphs()
+
+def _static(name):
+    """Get a fresh copy of a prebuilt paragraph (or list of paragraphs)"""
+    paragraphs = STATIC_PARAGRAPHS[name]
+    if isinstance(paragraphs, list):
+        return [copy.copy(paragraph) for paragraph in paragraphs]
+    return copy.copy(paragraphs)
+
 class TicketPDFGenerator:
-    """Professional PDF generator for cinema tickets"""
+    """Professional PDF generator for cinema tickets
+    
+    Holds no per-document state, so one instance is shared by every thread
+    (see create_pdf_generator).
+    """
     
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.setup_custom_styles()
+        self.styles = TICKET_STYLES
     
-    def setup_custom_styles(self):
-        """Setup custom paragraph styles for ticket formatting"""
-        # Title style
-        self.styles.add(ParagraphStyle(
-            name='TicketTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            spaceAfter=20,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor('#0d6efd')
-        ))
-        
-        # Movie title style
-        self.styles.add(ParagraphStyle(
-            name='MovieTitle',
-            parent=self.styles['Heading2'],
-            fontSize=18,
-            spaceAfter=12,
-            alignment=TA_LEFT,
-            textColor=colors.HexColor('#212529')
-        ))
-        
-        # Section header style
-        self.styles.add(ParagraphStyle(
-            name='SectionHeader',
-            parent=self.styles['Heading3'],
-            fontSize=14,
-            spaceAfter=8,
-            spaceBefore=12,
-            alignment=TA_LEFT,
-            textColor=colors.HexColor('#0d6efd')
-        ))
-        
-        # Info text style
-        self.styles.add(ParagraphStyle(
-            name='InfoText',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            spaceAfter=6,
-            alignment=TA_LEFT
-        ))
-        
-        # Highlight style for important info
-        self.styles.add(ParagraphStyle(
-            name='Highlight',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            spaceAfter=8,
-            alignment=TA_LEFT,
-            textColor=colors.HexColor('#198754'),
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Footer style
-        self.styles.add(ParagraphStyle(
-            name='Footer',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            alignment=TA_CENTER,
-            textColor=colors.grey
-        ))
-
     def generate_booking_pdf(self, booking_data: Dict[str, Any], tickets_data: List[Dict[str, Any]], 
                            include_expired: bool = True) -> BytesIO:
         """
@@ -115,7 +185,7 @@ class TicketPDFGenerator:
         story = []
         
         # Header
-        story.append(Paragraph("🎬 CINEMACOUSAS", self.styles['TicketTitle']))
+        story.append(_static('title'))
         story.append(Spacer(1, 20))
         
         # Booking Information Section
@@ -131,13 +201,7 @@ class TicketPDFGenerator:
         ]
         
         booking_table = Table(booking_info, colWidths=[2*inch, 3*inch])
-        booking_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ]))
+        booking_table.setStyle(INFO_TABLE_STYLE)
         story.append(booking_table)
         story.append(Spacer(1, 20))
         
@@ -153,13 +217,7 @@ class TicketPDFGenerator:
         ]
         
         movie_table = Table(movie_info, colWidths=[2*inch, 3*inch])
-        movie_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ]))
+        movie_table.setStyle(INFO_TABLE_STYLE)
         story.append(movie_table)
         story.append(Spacer(1, 20))
         
@@ -181,7 +239,7 @@ class TicketPDFGenerator:
             # Ticket separator
             if i > 1:
                 story.append(Spacer(1, 15))
-                story.append(Paragraph("- " * 50, self.styles['Footer']))
+                story.append(_static('ticket_separator'))
                 story.append(Spacer(1, 15))
             
             # Ticket header
@@ -196,32 +254,12 @@ class TicketPDFGenerator:
             ]
             
             ticket_table = Table(ticket_info, colWidths=[1.5*inch, 2*inch])
-            ticket_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 0), (-1, -1), 2),
-                ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f8f9fa')),
-                ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#dee2e6')),
-                ('INNERGRID', (0, 0), (-1, -1), 1, colors.HexColor('#dee2e6')),
-            ]))
+            ticket_table.setStyle(TICKET_TABLE_STYLE)
             story.append(ticket_table)
         
         # Footer information
         story.append(Spacer(1, 30))
-        story.append(Paragraph("Important Information", self.styles['SectionHeader']))
-        
-        footer_info = [
-            "• Please arrive at least 15 minutes before the showing time",
-            "• Tickets are non-refundable and non-transferable",
-            "• Food and beverages purchased outside are not permitted",
-            "• Mobile phones should be silenced during the movie",
-            "• For assistance, contact our customer service"
-        ]
-        
-        for info in footer_info:
-            story.append(Paragraph(info, self.styles['InfoText']))
+        story.extend(_static('footer'))
         
         story.append(Spacer(1, 20))
         story.append(Paragraph(
@@ -251,7 +289,7 @@ class TicketPDFGenerator:
         story = []
         
         # Header
-        story.append(Paragraph("🎬 CINEMACOUSAS", self.styles['TicketTitle']))
+        story.append(_static('title'))
         story.append(Paragraph("MOVIE TICKET", self.styles['SectionHeader']))
         story.append(Spacer(1, 20))
         
@@ -269,15 +307,7 @@ class TicketPDFGenerator:
         ]
         
         ticket_table = Table(ticket_info, colWidths=[2*inch, 3*inch])
-        ticket_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOX', (0, 0), (-1, -1), 2, colors.HexColor('#0d6efd')),
-            ('INNERGRID', (0, 0), (-1, -1), 1, colors.HexColor('#dee2e6')),
-        ]))
+        ticket_table.setStyle(SINGLE_TICKET_TABLE_STYLE)
         story.append(ticket_table)
         
         doc.build(story)
@@ -293,8 +323,13 @@ class TicketPDFGenerator:
         return f"{hours:02d}:{minutes:02d}"
     
     def _is_booking_expired(self, booking_data: Dict[str, Any]) -> bool:
-        """Check if a booking is expired"""
+        """Check if a booking is expired (its showing has ended)"""
         try:
+            # Precomputed showing end time (migration 0002) when the caller provides it
+            end_at = booking_data.get('end_at')
+            if end_at:
+                return end_at < datetime.datetime.now()
+            
             booking_date = booking_data.get('date')
             start_time = booking_data.get('starttime', 0)
             
@@ -311,7 +346,62 @@ class TicketPDFGenerator:
         except:
             return False
 
+# Global PDF generator instance, shared by every request
+pdf_generator = TicketPDFGenerator()
+
 # Convenience function for easy import
 def create_pdf_generator() -> TicketPDFGenerator:
-    """Create and return a new PDF generator instance"""
-    return TicketPDFGenerator()
+    """Get the shared PDF generator instance"""
+    return pdf_generator
+
+def build_booking_pdf_data(booking: Dict[str, Any], customers: List[Dict[str, Any]],
+                           current_user: Optional[Dict[str, Any]] = None):
+    """Build the booking and ticket dictionaries the PDF generator takes
+    
+    Args:
+        booking: Booking row from get_booking_by_id
+        customers: Customer rows from get_customers_for_booking
+        current_user: Logged-in user, used when the booking has no booker information
+        
+    Returns:
+        tuple: (booking_data, tickets_data)
+    """
+    # Get proper booker information using correct field names
+    booker_name = f"{booking.get('booker_first_name', '')} {booking.get('booker_last_name', '')}".strip()
+    booker_email = booking.get('booker_email', '')
+    
+    # Fall back to current user if booking doesn't have booker info
+    if not booker_name and current_user:
+        booker_name = f"{current_user.get('first_name', '')} {current_user.get('last_name', '')}".strip()
+        if not booker_email:
+            booker_email = current_user.get('email', '')
+    
+    # Final fallback
+    if not booker_name:
+        booker_name = "Anonymous User"
+    if not booker_email:
+        booker_email = "N/A"
+    
+    booking_data = {
+        'id': booking['id'],
+        'movie_name': booking['movie_name'],
+        'room_name': booking['room_name'],
+        'date': booking['date'],
+        'starttime': booking['starttime'],
+        'duration': booking['duration'],
+        'end_at': booking['end_at'],
+        'price': booking['price'],
+        'booker_name': booker_name,
+        'booker_email': booker_email
+    }
+    
+    tickets_data = []
+    for customer in customers:
+        tickets_data.append({
+            'id': customer.get('id', 'N/A'),
+            'seat_number': f"{customer.get('seat_row', '')}{customer.get('seat_column', '')}",
+            'seat_type': customer.get('seat_type', 'Standard'),
+            'price': booking['price'] / len(customers) if customers else 0  # Divide total price
+        })
+    
+    return booking_data, tickets_data
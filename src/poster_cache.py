@@ -0,0 +1,181 @@
+"""
+Poster image cache for the Cinema application.
+Keeps poster images in a bounded in-memory LRU backed by the on-disk,
+content-addressed poster file store, so repeated poster requests don't read
+the image BLOB from the database again.
+"""
+
+import collections
+import hashlib
+import logging
+import os
+import threading
+from .config import get_config
+from .poster_store import poster_store, write_atomic
+
+# Get configuration
+config = get_config()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class PosterImage:
+    """Image bytes of a poster with their MIME type and SHA-256 content hash."""
+
+    __slots__ = ('content_hash', 'mime_type', 'data')
+
+    def __init__(self, content_hash, mime_type, data):
+        self.content_hash = content_hash
+        self.mime_type = mime_type
+        self.data = data
+
+class PosterCache:
+    """Two-level poster cache: memory LRU bounded in bytes, then disk.
+
+    On disk, images live once per content hash in the poster file store and
+    each poster id points to its image through a small
+    ``<cache_dir>/ids/<poster_id>`` file holding the hash and MIME type.
+    Posters are treated as immutable; call invalidate() when a poster's image
+    is replaced.
+    """
+
+    def __init__(self, cache_dir, max_memory_bytes, store):
+        self.cache_dir = cache_dir
+        self.store = store
+        self.max_memory_bytes = max_memory_bytes
+        self._memory = collections.OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, poster_id, loader):
+        """Get a poster image, calling loader() on a miss
+
+        loader must return a dictionary with mime_type, content_hash and
+        image_data, or None if the poster doesn't exist. image_data may be
+        None for posters already moved to the file store.
+
+        Returns:
+            PosterImage or None
+        """
+        poster_id = int(poster_id)
+
+        with self._lock:
+            image = self._memory.get(poster_id)
+            if image is not None:
+                self._memory.move_to_end(poster_id)
+                self.memory_hits += 1
+                return image
+
+        image = self._read_disk(poster_id)
+        if image is not None:
+            with self._lock:
+                self.disk_hits += 1
+            self._remember(poster_id, image)
+            return image
+
+        poster_data = loader()
+        with self._lock:
+            self.misses += 1
+        if not poster_data:
+            return None
+
+        if poster_data.get('image_data') is None:
+            content_hash = poster_data['content_hash']
+            try:
+                data = self.store.read(content_hash)
+            except OSError as e:
+                logger.error(f"Poster {poster_id} image is missing from the file store: {e}")
+                return None
+        else:
+            data = bytes(poster_data['image_data'])
+            try:
+                content_hash = self.store.put(data)
+            except OSError as e:
+                # Still served, from memory, when the file store can't be written
+                logger.warning(f"Could not write poster {poster_id} to the file store: {e}")
+                content_hash = hashlib.sha256(data).hexdigest()
+
+        image = PosterImage(content_hash, poster_data['mime_type'], data)
+        try:
+            write_atomic(self._id_path(poster_id), f"{image.content_hash}\n{image.mime_type}".encode('utf-8'))
+        except OSError as e:
+            logger.warning(f"Could not write poster {poster_id} to the disk cache: {e}")
+        self._remember(poster_id, image)
+        return image
+
+    def record_not_modified(self):
+        """Count a request answered with 304 Not Modified"""
+        with self._lock:
+            self.not_modified += 1
+
+    def invalidate(self, poster_id):
+        """Forget a poster, e.g. after its image was replaced"""
+        poster_id = int(poster_id)
+        with self._lock:
+            image = self._memory.pop(poster_id, None)
+            if image is not None:
+                self._memory_bytes -= len(image.data)
+        try:
+            os.remove(self._id_path(poster_id))
+        except FileNotFoundError:
+            pass
+
+    def clear_memory(self):
+        """Drop every image held in memory, the disk cache is kept"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def get_stats(self):
+        """Return hit counters and memory usage"""
+        with self._lock:
+            requests = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'max_memory_bytes': self.max_memory_bytes,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+                'hit_rate': (self.memory_hits + self.disk_hits) / requests if requests else 0.0
+            }
+
+    def _remember(self, poster_id, image):
+        size = len(image.data)
+        if size > self.max_memory_bytes:
+            return
+
+        with self._lock:
+            previous = self._memory.pop(poster_id, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous.data)
+            self._memory[poster_id] = image
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_memory_bytes:
+                evicted_id, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted.data)
+
+    def _id_path(self, poster_id):
+        return os.path.join(self.cache_dir, 'ids', str(poster_id))
+
+    def _read_disk(self, poster_id):
+        try:
+            with open(self._id_path(poster_id), encoding='utf-8') as id_file:
+                content_hash, mime_type = id_file.read().split('\n', 1)
+            data = self.store.read(content_hash)
+        except (OSError, ValueError):
+            return None
+        return PosterImage(content_hash, mime_type.strip(), data)
+
+# Global poster cache instance
+poster_cache = PosterCache(config.POSTER_CACHE_DIR, config.POSTER_CACHE_MEMORY_BYTES, poster_store)
+
+def get_poster_cache():
+    """Get the global poster cache instance."""
+    return poster_cache
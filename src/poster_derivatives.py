@@ -0,0 +1,164 @@
+"""
+Poster derivatives for the Cinema application.
+Generates resized JPEG and WebP variants of poster images with Pillow, in a
+process pool, and keeps them in a local derivative store so listings don't
+download full-resolution posters.
+"""
+
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+from .config import get_config
+from .poster_store import write_atomic
+
+# Get configuration
+config = get_config()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Output formats: (file extension, Pillow format, MIME type, save options)
+DERIVATIVE_FORMATS = {
+    'webp': ('webp', 'WEBP', 'image/webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('jpg', 'JPEG', 'image/jpeg', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+
+def render_derivatives(source_data, output_dir, widths):
+    """Write every width and format variant of an image to output_dir
+
+    Runs in the worker processes. Images are never upscaled: buckets wider
+    than the source get a copy at the source width.
+    """
+    with Image.open(io.BytesIO(source_data)) as source:
+        source.load()
+        image = source.convert('RGBA' if source.mode in ('RGBA', 'LA', 'P') else 'RGB')
+
+    for width in widths:
+        if width < image.width:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        else:
+            resized = image
+
+        for extension, pillow_format, mime_type, options in DERIVATIVE_FORMATS.values():
+            # JPEG has no alpha channel
+            output = resized.convert('RGB') if pillow_format == 'JPEG' and resized.mode != 'RGB' else resized
+            buffer = io.BytesIO()
+            output.save(buffer, pillow_format, **options)
+            write_atomic(os.path.join(output_dir, f"{width}.{extension}"), buffer.getvalue())
+
+class PosterDerivativeStore:
+    """Width-bucketed poster variants stored under ``<store_dir>/<content hash>/``.
+
+    Variants are keyed by the content hash of the source image, so a
+    replaced poster gets new variants. They are generated once per image,
+    all widths and formats together, in a process pool created on first use.
+    Requests never wait for the generation: until the variants exist, the
+    caller serves the original image. An image that fails to render is not
+    submitted again for failure_ttl_seconds.
+    """
+
+    def __init__(self, store_dir, widths, max_workers, failure_ttl_seconds=300):
+        # Absolute, as send_file resolves relative paths against the app root
+        self.store_dir = os.path.abspath(store_dir)
+        self.widths = tuple(sorted(widths))
+        self.max_workers = max_workers
+        self._executor = None
+        self.failure_ttl_seconds = failure_ttl_seconds
+        self._pending = {}
+        # Content hash -> monotonic time until which a failed rendering isn't retried
+        self._failed = {}
+        # Reentrant: a done callback runs in the submitting thread if the future has already finished
+        self._lock = threading.RLock()
+
+    def select_width(self, requested_width):
+        """Return the smallest width bucket at least as wide as requested, or the widest"""
+        for width in self.widths:
+            if width >= requested_width:
+                return width
+        return self.widths[-1]
+
+    def get_path(self, image, requested_width, accept_webp):
+        """Get the path and MIME type of the variant closest to requested_width
+
+        Args:
+            image: PosterImage of the source poster (see poster_cache)
+            requested_width: Width in pixels asked by the client
+            accept_webp: Whether the client accepts WebP
+
+        Returns:
+            tuple: (path, mime_type), or None while the variants are being generated
+                or after their generation failed
+        """
+        width = self.select_width(requested_width)
+        extension, pillow_format, mime_type, options = DERIVATIVE_FORMATS['webp' if accept_webp else 'jpeg']
+        output_dir = os.path.join(self.store_dir, image.content_hash)
+        path = os.path.join(output_dir, f"{width}.{extension}")
+
+        if not os.path.exists(path):
+            # Rendered in the background, the next request gets the variant
+            self._generate(image, output_dir)
+            return None
+
+        return path, mime_type
+
+    def _generate(self, image, output_dir):
+        """Submit the generation of an image's variants, once even under concurrent requests
+
+        Returns:
+            Future of the generation, or None while a recent failure is remembered
+        """
+        with self._lock:
+            failed_until = self._failed.get(image.content_hash)
+            if failed_until is not None:
+                if time.monotonic() < failed_until:
+                    return None
+                del self._failed[image.content_hash]
+
+            future = self._pending.get(image.content_hash)
+            if future is None:
+                future = self._get_executor().submit(render_derivatives, image.data, output_dir, self.widths)
+                self._pending[image.content_hash] = future
+                future.add_done_callback(lambda done: self._forget(image.content_hash, done))
+            return future
+
+    def _forget(self, content_hash, future):
+        failed = not future.cancelled() and future.exception() is not None
+        with self._lock:
+            self._pending.pop(content_hash, None)
+            if failed:
+                self._failed[content_hash] = time.monotonic() + self.failure_ttl_seconds
+        if failed:
+            logger.error(f"Failed to generate derivatives of poster image {content_hash}, "
+                         f"not retrying for {self.failure_ttl_seconds}s: {future.exception()}")
+
+    def _get_executor(self):
+        if self._executor is None:
+            # Spawned workers don't inherit the server's threads and open connections
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+# Global poster derivative store instance
+poster_derivatives = PosterDerivativeStore(
+    config.POSTER_DERIVATIVE_DIR,
+    config.POSTER_DERIVATIVE_WIDTHS,
+    max_workers=config.POSTER_DERIVATIVE_WORKERS,
+    failure_ttl_seconds=config.POSTER_DERIVATIVE_FAILURE_TTL_SECONDS
+)
+
+def get_poster_derivatives():
+    """Get the global poster derivative store instance."""
+    return poster_derivatives
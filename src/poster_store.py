@@ -0,0 +1,144 @@
+"""
+Content-addressed poster file store for the Cinema application.
+Poster images are stored once per SHA-256 content hash under
+``<store_dir>/<hash[:2]>/<hash>``. Posters moved out of the movieposter.image
+BLOB column keep their hash in movieposter.content_hash (migration 0005).
+
+Move the BLOBs of existing posters into the store with:
+    python -m src.poster_store extract [--batch-size N] [--clear-blobs]
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+from .config import get_config
+
+# Get configuration
+config = get_config()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class PosterFileStore:
+    """Poster images stored on disk by content hash."""
+
+    def __init__(self, store_dir):
+        # Absolute, as send_file resolves relative paths against the app root
+        self.store_dir = os.path.abspath(store_dir)
+
+    def path_for(self, content_hash):
+        """Path of the image with the given content hash"""
+        return os.path.join(self.store_dir, content_hash[:2], content_hash)
+
+    def relative_path_for(self, content_hash):
+        """Path of the image relative to the store directory, for X-Accel-Redirect"""
+        return f"{content_hash[:2]}/{content_hash}"
+
+    def has(self, content_hash):
+        return os.path.exists(self.path_for(content_hash))
+
+    def put(self, data):
+        """Store image bytes, returns their content hash"""
+        content_hash = hashlib.sha256(data).hexdigest()
+        if not self.has(content_hash):
+            write_atomic(self.path_for(content_hash), data)
+        return content_hash
+
+    def read(self, content_hash):
+        """Return the bytes of a stored image, raises OSError if it is missing"""
+        with open(self.path_for(content_hash), 'rb') as image_file:
+            return image_file.read()
+
+def write_atomic(path, data):
+    """Write a file through a temporary file and a rename, so readers never see it half written"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+# Global poster file store instance
+poster_store = PosterFileStore(config.POSTER_STORE_DIR)
+
+def get_poster_store():
+    """Get the global poster file store instance."""
+    return poster_store
+
+def extract_poster_blobs(batch_size=20, clear_blobs=False):
+    """Move poster BLOBs into the file store and record their content hash
+
+    Posters are processed in batches of batch_size rows, committing after
+    each batch, so the tool can be stopped and run again. With clear_blobs,
+    the image column of posters whose file is in the store is then emptied.
+
+    Returns:
+        tuple: (posters extracted, BLOBs cleared)
+    """
+    from .database import get_db_connection
+
+    extracted = 0
+    cleared = 0
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            while True:
+                cursor.execute("""
+                    SELECT id, image
+                    FROM movieposter
+                    WHERE content_hash IS NULL AND image IS NOT NULL
+                    ORDER BY id
+                    LIMIT %s
+                """, (batch_size,))
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+
+                for poster_id, image in rows:
+                    content_hash = poster_store.put(bytes(image))
+                    cursor.execute("UPDATE movieposter SET content_hash = %s WHERE id = %s", (content_hash, poster_id))
+                conn.commit()
+                extracted += len(rows)
+                print(f"Extracted {extracted} posters")
+
+            if clear_blobs:
+                cursor.execute("SELECT id, content_hash FROM movieposter WHERE content_hash IS NOT NULL AND image IS NOT NULL")
+                for poster_id, content_hash in cursor.fetchall():
+                    # Only drop the BLOB once the file is known to be in the store
+                    if poster_store.has(content_hash):
+                        cursor.execute("UPDATE movieposter SET image = NULL WHERE id = %s", (poster_id,))
+                        cleared += 1
+                conn.commit()
+        finally:
+            cursor.close()
+
+    return extracted, cleared
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cinema poster file store")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    extract_parser = subparsers.add_parser('extract', help="Move poster BLOBs into the file store")
+    extract_parser.add_argument('--batch-size', type=int, default=20)
+    extract_parser.add_argument('--clear-blobs', action='store_true',
+                                help="Empty the image column of posters moved to the store")
+
+    args = parser.parse_args(argv)
+
+    extracted, cleared = extract_poster_blobs(args.batch_size, args.clear_blobs)
+    print(f"✓ Extracted {extracted} posters to {poster_store.store_dir}, cleared {cleared} BLOBs")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
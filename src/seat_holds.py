@@ -0,0 +1,128 @@
+"""
+Temporary seat holds for the Cinema application.
+Keeps the seats a user picked reserved for a short time between seat
+selection and booking confirmation.
+"""
+
+import logging
+import math
+import threading
+import time
+from .config import get_config
+
+# Get configuration
+config = get_config()
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class SeatHoldManager:
+    """In-memory seat holds per (showing, seat, holder) with a TTL.
+
+    Holds are indexed by seat and by showing for O(1) lookups, and bucketed by
+    the second they expire in so the sweeper only visits buckets that are due.
+    Holds live in this process only.
+    """
+
+    def __init__(self, ttl_seconds):
+        self.ttl_seconds = ttl_seconds
+        self._holds = {}
+        self._seats_by_showing = {}
+        self._expiry_buckets = {}
+        self._lock = threading.Lock()
+
+    def hold(self, showing_id, seat_ids, holder):
+        """Hold seats for a holder, replacing the holder's previous holds on the showing
+
+        Returns:
+            bool: True if every seat is now held by the holder, False if one is held by someone else
+        """
+        showing_id = int(showing_id)
+        seat_ids = [int(seat_id) for seat_id in seat_ids]
+        now = time.monotonic()
+        expires_at = now + self.ttl_seconds
+
+        with self._lock:
+            for seat_id in seat_ids:
+                hold = self._holds.get((showing_id, seat_id))
+                if hold is not None and hold[0] != holder and hold[1] > now:
+                    return False
+
+            self._release_locked(showing_id, holder)
+
+            bucket = self._expiry_buckets.setdefault(math.ceil(expires_at), set())
+            showing_seats = self._seats_by_showing.setdefault(showing_id, set())
+            for seat_id in seat_ids:
+                key = (showing_id, seat_id)
+                self._holds[key] = (holder, expires_at)
+                bucket.add(key)
+                showing_seats.add(seat_id)
+            return True
+
+    def release(self, showing_id, holder):
+        """Release every hold of a holder on a showing"""
+        with self._lock:
+            self._release_locked(int(showing_id), holder)
+
+    def get_held_seat_ids(self, showing_id, exclude_holder=None):
+        """Return the ids of seats currently held on a showing by anyone but exclude_holder"""
+        showing_id = int(showing_id)
+        now = time.monotonic()
+
+        with self._lock:
+            held_seat_ids = set()
+            for seat_id in self._seats_by_showing.get(showing_id, ()):
+                holder, expires_at = self._holds[(showing_id, seat_id)]
+                if holder != exclude_holder and expires_at > now:
+                    held_seat_ids.add(seat_id)
+            return held_seat_ids
+
+    def is_any_held(self, showing_id, seat_ids, exclude_holder=None):
+        """Check if any of the seats is held on a showing by anyone but exclude_holder"""
+        showing_id = int(showing_id)
+        now = time.monotonic()
+
+        with self._lock:
+            for seat_id in seat_ids:
+                hold = self._holds.get((showing_id, int(seat_id)))
+                if hold is not None and hold[0] != exclude_holder and hold[1] > now:
+                    return True
+            return False
+
+    def sweep(self):
+        """Drop expired holds, returns the number of holds removed"""
+        now = time.monotonic()
+        removed = 0
+
+        with self._lock:
+            due_seconds = [second for second in self._expiry_buckets if second <= now]
+            for second in due_seconds:
+                for key in self._expiry_buckets.pop(second):
+                    hold = self._holds.get(key)
+                    # The seat may have been held again since, with a later expiry
+                    if hold is not None and hold[1] <= now:
+                        self._remove_locked(key)
+                        removed += 1
+        return removed
+
+    def _release_locked(self, showing_id, holder):
+        for seat_id in list(self._seats_by_showing.get(showing_id, ())):
+            key = (showing_id, seat_id)
+            if self._holds[key][0] == holder:
+                self._remove_locked(key)
+
+    def _remove_locked(self, key):
+        showing_id, seat_id = key
+        del self._holds[key]
+        showing_seats = self._seats_by_showing.get(showing_id)
+        if showing_seats is not None:
+            showing_seats.discard(seat_id)
+            if not showing_seats:
+                del self._seats_by_showing[showing_id]
+
+# Global seat hold manager instance
+seat_hold_manager = SeatHoldManager(ttl_seconds=config.SEAT_HOLD_TTL_SECONDS)
+
+def get_seat_hold_manager():
+    """Get the global seat hold manager instance."""
+    return seat_hold_manager
@@ -9,6 +9,7 @@ from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime
 from .config import get_config
 from .database.database_modify import cleanup_expired_sessions
+from .seat_holds import seat_hold_manager
 
 # Get configuration
 config = get_config()
@@ -35,6 +36,15 @@ class SessionManager:
                 replace_existing=True
             )
             
+            # Schedule expired seat hold sweeping
+            self.scheduler.add_job(
+                func=self._sweep_seat_holds,
+                trigger=IntervalTrigger(seconds=config.SEAT_HOLD_SWEEP_INTERVAL_SECONDS),
+                id='seat_hold_sweep',
+                name='Sweep expired seat holds',
+                replace_existing=True
+            )
+            
             # Start the scheduler
             self.scheduler.start()
             logger.info(f"Session cleanup scheduled every {self.cleanup_interval_hours} hours")
@@ -63,6 +73,15 @@ class SessionManager:
         except Exception as e:
             logger.error(f"Error during session cleanup: {e}")
     
+    def _sweep_seat_holds(self):
+        """Drop expired seat holds."""
+        try:
+            removed = seat_hold_manager.sweep()
+            if removed:
+                logger.info(f"Swept {removed} expired seat holds")
+        except Exception as e:
+            logger.error(f"Error during seat hold sweep: {e}")
+    
     def force_cleanup(self):
         """Force immediate cleanup of expired sessions."""
         self._cleanup_expired_sessions()
@@ -0,0 +1,126 @@
+"""
+Shared fixtures: the testing configuration, a fake database behind the pool
+and a fake cinema with one upcoming showing and a logged-in client.
+"""
+
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+# Must be set before src.config is imported
+os.environ.setdefault('FLASK_ENV', 'testing')
+os.environ.setdefault('DB_POOL_PREWARM', 'False')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from src.database import database as database_core
+from src.database.database_cache import schedule_cache, session_cache, pricing_cache, seat_map_cache
+from src.database.database_pool import ElasticConnectionPool
+from tests.fakes import FakeDatabase
+
+SHOWING_ID = 42
+ACCOUNT_ID = 7
+BOOKING_ID = 900
+RESERVED_SEAT_IDS = {1, 2}
+
+
+def _clear_caches():
+    schedule_cache.clear()
+    session_cache.clear()
+    seat_map_cache.clear()
+    pricing_cache.bump_version()
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """Route get_db_connection to a FakeDatabase through a real ElasticConnectionPool"""
+    database = FakeDatabase()
+    pool = ElasticConnectionPool({}, pool_name='test_pool', pool_size=4, max_overflow=16, pool_timeout=5)
+    monkeypatch.setattr(pool, '_connect', database.connect)
+    monkeypatch.setattr(database_core, 'connection_pool', pool)
+    monkeypatch.setattr(database_core, 'replica_pool', None)
+
+    _clear_caches()
+    yield database
+    _clear_caches()
+
+
+@pytest.fixture
+def app(fake_db):
+    # Answers the connection check app.py runs when it is first imported
+    fake_db.on(r'SELECT COUNT\(\*\) FROM account', rows=[{'count': 0}])
+    from app import app as flask_app
+    flask_app.config['TESTING'] = True
+    return flask_app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def cinema_db(fake_db):
+    """Fake database holding one upcoming showing in a 5x8 room"""
+    day = date.today() + timedelta(days=1)
+    start_at = datetime.combine(day, datetime.min.time()) + timedelta(hours=20)
+    end_at = start_at + timedelta(minutes=120)
+    customer_ids = []
+
+    fake_db.on(r'FROM account_session s', rows=[{
+        'account_id': ACCOUNT_ID, 'expires_at': datetime.now() + timedelta(hours=1),
+        'ip_address': '127.0.0.1', 'user_agent': 'pytest', 'username': 'alice',
+        'email': 'alice@example.com', 'first_name': 'Alice', 'last_name': 'Martin', 'birthday': None,
+    }])
+    fake_db.on(r'FROM showing s\s+INNER JOIN movie m', rows=[
+        {'id': movie_id, 'name': f"Movie {movie_id}", 'duration': 120,
+         'showing_id': movie_id * 10, 'showing_date': day, 'showing_starttime': 72000.0,
+         'showing_baseprice': 1000, 'showing_room_id': 1, 'showing_end_at': end_at}
+        for movie_id in range(1, 13)
+    ])
+    fake_db.on(r'FROM movieposter', rows=[])
+    fake_db.on(r'FROM showing s\s+JOIN movie m', rows=[{
+        'id': SHOWING_ID, 'date': day, 'starttime': 72000.0, 'baseprice': 1000, 'movie_id': 1,
+        'room_id': 1, 'start_at': start_at, 'end_at': end_at, 'movie_name': 'Movie 1', 'duration': 120,
+        'director': 'Director', 'cast': 'Cast', 'synopsis': 'Synopsis', 'room_name': 'Room 1',
+        'nb_rows': 5, 'nb_columns': 8,
+    }])
+    fake_db.on(r'SELECT room_id FROM showing', rows=[{'room_id': 1}])
+    fake_db.on(r'FROM seat\s+WHERE room_id', rows=[
+        {'id': row * 8 + column + 1, 'type': 'standard', 'seat_row': row + 1, 'seat_column': column + 1}
+        for row in range(5) for column in range(8)
+    ])
+    fake_db.on(r'SELECT seat_id FROM seatreservation', handler=lambda conn, operation, params: [
+        {'seat_id': seat_id} for seat_id in sorted(RESERVED_SEAT_IDS) if len(params) == 1 or seat_id in params[1:]
+    ])
+    fake_db.on(r'FROM ageprice', rows=[
+        {'id': 1, 'name': 'Enfant', 'agemin': 0, 'agemax': 11, 'factor': 0.5},
+        {'id': 2, 'name': 'Adulte', 'agemin': 12, 'agemax': 150, 'factor': 1.0},
+    ])
+    fake_db.on(r'SELECT id, baseprice\s+FROM showing', rows=[{'id': SHOWING_ID, 'baseprice': 1000}])
+    fake_db.on(r'INSERT INTO customer', handler=lambda conn, operation, params: customer_ids.extend(
+        fake_db.next_id() for index in range(len(params) // 5)))
+    fake_db.on(r'SELECT id FROM customer', handler=lambda conn, operation, params: [{'id': customer_id} for customer_id in customer_ids])
+    fake_db.on(r'FROM booking b\s+JOIN showing s', rows=[{
+        'id': BOOKING_ID, 'price': 20.0, 'account_id': ACCOUNT_ID, 'showing_id': SHOWING_ID, 'num_spectators': 2,
+        'date': day, 'starttime': 72000.0, 'baseprice': 1000, 'start_at': start_at, 'end_at': end_at,
+        'movie_name': 'Movie 1', 'duration': 120, 'room_name': 'Room 1',
+        'booker_first_name': 'Alice', 'booker_last_name': 'Martin', 'booker_email': 'alice@example.com',
+    }])
+    fake_db.on(r'FROM customer c', rows=[
+        {'id': 1, 'firstname': 'Alice', 'lastname': 'Martin', 'age': 30, 'pmr': 0, 'booking_id': BOOKING_ID,
+         'seat_row': 3, 'seat_column': 4, 'seat_type': 'standard'},
+        {'id': 2, 'firstname': 'Bob', 'lastname': 'Martin', 'age': 8, 'pmr': 0, 'booking_id': BOOKING_ID,
+         'seat_row': 3, 'seat_column': 5, 'seat_type': 'standard'},
+    ])
+    return fake_db
+
+
+@pytest.fixture
+def logged_in_client(client):
+    with client.session_transaction() as session:
+        session['logged_in'] = True
+        session['user_id'] = ACCOUNT_ID
+        session['username'] = 'alice'
+        session['session_token'] = 'budget-test-token'
+    return client
@@ -0,0 +1,146 @@
+"""
+In-memory stand-in for the MySQL server behind the connection pool.
+
+FakeDatabase answers statements from rules registered with on(): the first
+rule whose pattern is found in the SQL gives the result rows, either fixed
+or computed by a handler. Statements no rule matches return no rows. Every
+executed statement is recorded, so tests can count round trips.
+"""
+
+import itertools
+import re
+import threading
+
+
+class FakeDatabase:
+    """Rule-based fake database shared by every FakeConnection it opens."""
+
+    def __init__(self):
+        self.rules = []
+        self.executed = []
+        self.connections_opened = 0
+        self._ids = itertools.count(1000)
+        self._lock = threading.Lock()
+
+    def on(self, pattern, rows=None, handler=None, first=False):
+        """Answer statements matching pattern with rows, or with handler(connection, operation, params)
+
+        Handlers return a list of dictionaries (the result rows) or None, and
+        may raise mysql.connector errors to simulate server failures. With
+        first, the rule takes precedence over the ones already registered.
+        """
+        rule = (re.compile(pattern, re.IGNORECASE | re.DOTALL), rows, handler)
+        if first:
+            self.rules.insert(0, rule)
+        else:
+            self.rules.append(rule)
+
+    def connect(self):
+        with self._lock:
+            self.connections_opened += 1
+        return FakeConnection(self)
+
+    def next_id(self):
+        with self._lock:
+            return next(self._ids)
+
+    def count(self, pattern=None):
+        """Number of executed statements, optionally only those matching pattern"""
+        with self._lock:
+            executed = list(self.executed)
+        if pattern is None:
+            return len(executed)
+        regex = re.compile(pattern, re.IGNORECASE | re.DOTALL)
+        return sum(1 for operation, params in executed if regex.search(operation))
+
+    def reset_counts(self):
+        with self._lock:
+            self.executed.clear()
+
+    def execute(self, connection, operation, params):
+        with self._lock:
+            self.executed.append((operation, params))
+        for regex, rows, handler in self.rules:
+            if regex.search(operation):
+                if handler is not None:
+                    return handler(connection, operation, params)
+                return rows
+        return None
+
+    # Transaction hooks, overridden by fakes that keep table state
+    def commit(self, connection):
+        pass
+
+    def rollback(self, connection):
+        pass
+
+
+class FakeCursor:
+    """Cursor returning FakeDatabase rows as dictionaries or tuples."""
+
+    def __init__(self, connection, dictionary=False):
+        self._connection = connection
+        self._dictionary = dictionary
+        self._rows = []
+        self.column_names = ()
+        self.lastrowid = None
+        self.rowcount = -1
+
+    def execute(self, operation, params=None):
+        connection = self._connection
+        connection.in_transaction = True
+        rows = connection.database.execute(connection, operation, params) or []
+
+        self.column_names = tuple(rows[0].keys()) if rows else ()
+        self._rows = [dict(row) if self._dictionary else tuple(row.values()) for row in rows]
+        is_write = operation.lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE'))
+        self.lastrowid = connection.database.next_id() if operation.lstrip().upper().startswith('INSERT') else None
+        self.rowcount = len(rows) if rows else (1 if is_write else 0)
+
+    def executemany(self, operation, seq_params):
+        for params in seq_params:
+            self.execute(operation, params)
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Connection to a FakeDatabase with the methods the pool and callers use."""
+
+    def __init__(self, database):
+        self.database = database
+        self.in_transaction = False
+
+    def cursor(self, dictionary=False, **kwargs):
+        return FakeCursor(self, dictionary=dictionary)
+
+    def start_transaction(self):
+        self.in_transaction = True
+
+    def commit(self):
+        self.database.commit(self)
+        self.in_transaction = False
+
+    def rollback(self):
+        self.database.rollback(self)
+        self.in_transaction = False
+
+    def reset_session(self):
+        pass
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
@@ -0,0 +1,172 @@
+"""
+Concurrency tests for optimistic seat booking.
+
+SeatReservationDatabase models the unique (showing_id, seat_id) index of
+migration 0001: inserting a seat that another transaction already reserved,
+committed or not, fails with ER_DUP_ENTRY, and rolled back reservations are
+dropped.
+"""
+
+import random
+import threading
+import time
+import pytest
+from mysql.connector import errorcode, errors
+from src.database import database as database_core
+from src.database import database_modify
+from src.database.database_modify import create_complete_booking_secure
+from tests.fakes import FakeDatabase
+
+SHOWING_ID = 1
+SEAT_COUNT = 30
+
+
+class SeatReservationDatabase(FakeDatabase):
+    """Fake database enforcing a unique (showing_id, seat_id) reservation index."""
+
+    def __init__(self):
+        super().__init__()
+        self.reservations = {}
+        self.customers_by_booking = {}
+        self._table_lock = threading.Lock()
+
+        self.on(r'FROM ageprice', rows=[
+            {'id': 1, 'name': 'Enfant', 'agemin': 0, 'agemax': 11, 'factor': 0.5},
+            {'id': 2, 'name': 'Adulte', 'agemin': 12, 'agemax': 150, 'factor': 1.0},
+        ])
+        self.on(r'SELECT id, baseprice\s+FROM showing', rows=[{'id': SHOWING_ID, 'baseprice': 1000}])
+        self.on(r'INSERT INTO customer', handler=self._insert_customers)
+        self.on(r'SELECT id FROM customer', handler=self._select_customers)
+        self.on(r'INSERT INTO seatreservation', handler=self._insert_reservations)
+
+    def _insert_customers(self, connection, operation, params):
+        booking_id = params[4]
+        ids = [self.next_id() for index in range(len(params) // 5)]
+        with self._table_lock:
+            self.customers_by_booking[booking_id] = ids
+
+    def _select_customers(self, connection, operation, params):
+        with self._table_lock:
+            return [{'id': customer_id} for customer_id in self.customers_by_booking.get(params[0], [])]
+
+    def _insert_reservations(self, connection, operation, params):
+        keys = [(params[index + 1], params[index + 2]) for index in range(0, len(params), 3)]
+        with self._table_lock:
+            for key in keys:
+                if key in self.reservations:
+                    raise errors.IntegrityError(msg=f"Duplicate entry '{key[0]}-{key[1]}'", errno=errorcode.ER_DUP_ENTRY)
+            for key in keys:
+                self.reservations[key] = connection
+
+    def commit(self, connection):
+        with self._table_lock:
+            for key, owner in self.reservations.items():
+                if owner is connection:
+                    self.reservations[key] = 'committed'
+
+    def rollback(self, connection):
+        with self._table_lock:
+            for key in [key for key, owner in self.reservations.items() if owner is connection]:
+                del self.reservations[key]
+
+
+@pytest.fixture
+def seat_db(fake_db, monkeypatch):
+    database = SeatReservationDatabase()
+    monkeypatch.setattr(database_core.connection_pool, '_connect', database.connect)
+    monkeypatch.setattr(database_modify.config, 'BOOKING_SEAT_LOCKING', 'optimistic')
+    monkeypatch.setattr(database_modify.config, 'BOOKING_RETRY_BACKOFF_MS', 1)
+    return database
+
+
+def _spectators(count):
+    return [{'firstname': 'Test', 'lastname': f"Spectator{index}", 'age': 30, 'pmr': 0} for index in range(count)]
+
+
+def _book(seats):
+    return create_complete_booking_secure(SHOWING_ID, 1, _spectators(len(seats)), seats, None)
+
+
+def test_taken_seat_is_reported_and_rolled_back(seat_db):
+    assert _book([1, 2])['success']
+
+    result = _book([2, 3])
+
+    assert result == {'success': False, 'error': 'Some seats are no longer available'}
+    assert sorted(seat for showing_id, seat in seat_db.reservations) == [1, 2]
+    assert set(seat_db.reservations.values()) == {'committed'}
+
+
+def test_concurrent_bookings_never_double_book(seat_db):
+    results = []
+    results_lock = threading.Lock()
+    start = threading.Barrier(16)
+
+    def customer(seed):
+        rng = random.Random(seed)
+        start.wait()
+        for attempt in range(25):
+            seats = rng.sample(range(1, SEAT_COUNT + 1), rng.randint(1, 4))
+            result = _book(seats)
+            with results_lock:
+                results.append((seats, result))
+
+    threads = [threading.Thread(target=customer, args=(seed,)) for seed in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    booked_seats = []
+    for seats, result in results:
+        if result['success']:
+            booked_seats.extend(seats)
+        else:
+            assert result['error'] == 'Some seats are no longer available'
+
+    assert any(not result['success'] for seats, result in results)
+    assert len(booked_seats) == len(set(booked_seats))
+    assert sorted(booked_seats) == sorted(seat for showing_id, seat in seat_db.reservations)
+    assert set(seat_db.reservations.values()) == {'committed'}
+    assert database_core.connection_pool.get_stats()['in_use'] == 0
+
+
+def test_deadlock_is_retried_without_holding_a_connection(seat_db, monkeypatch):
+    deadlocks = {'remaining': 2}
+
+    def insert_booking(connection, operation, params):
+        if deadlocks['remaining']:
+            deadlocks['remaining'] -= 1
+            raise errors.DatabaseError(msg="Deadlock found when trying to get lock", errno=errorcode.ER_LOCK_DEADLOCK)
+
+    seat_db.on(r'INSERT INTO booking', handler=insert_booking, first=True)
+
+    connections_in_use_while_sleeping = []
+    real_sleep = time.sleep
+
+    def sleep(seconds):
+        connections_in_use_while_sleeping.append(database_core.connection_pool.get_stats()['in_use'])
+        real_sleep(seconds)
+
+    monkeypatch.setattr(time, 'sleep', sleep)
+
+    result = _book([5, 6])
+
+    assert result['success']
+    assert connections_in_use_while_sleeping == [0, 0]
+    assert sorted(seat for showing_id, seat in seat_db.reservations) == [5, 6]
+
+
+def test_deadlock_retries_are_bounded(seat_db, monkeypatch):
+    monkeypatch.setattr(database_modify.config, 'BOOKING_DEADLOCK_RETRIES', 2)
+
+    def insert_booking(connection, operation, params):
+        raise errors.DatabaseError(msg="Lock wait timeout exceeded", errno=errorcode.ER_LOCK_WAIT_TIMEOUT)
+
+    seat_db.on(r'INSERT INTO booking', handler=insert_booking, first=True)
+
+    result = _book([7])
+
+    assert result == {'success': False, 'error': 'The booking service is busy, please try again'}
+    assert seat_db.count(r'INSERT INTO booking') == 3
+    assert seat_db.reservations == {}
@@ -0,0 +1,43 @@
+"""
+Tests for the confirmation email of PDF_CACHE_EAGER bookings.
+"""
+
+import threading
+from datetime import date
+from tests.conftest import SHOWING_ID
+
+
+def test_eager_confirmation_email_is_sent_from_the_email_executor(app, logged_in_client, cinema_db, monkeypatch, tmp_path):
+    import app as app_module
+    sent = []
+    done = threading.Event()
+
+    def send_booking_confirmation_email(**kwargs):
+        sent.append((threading.current_thread().name, kwargs['pdf_content'][:4]))
+        done.set()
+        return True
+
+    monkeypatch.setattr(app_module.config, 'PDF_CACHE_EAGER', True)
+    monkeypatch.setattr(app_module.pdf_cache, 'cache_dir', str(tmp_path))
+    monkeypatch.setattr(app_module, 'send_booking_confirmation_email', send_booking_confirmation_email)
+
+    birth_year = date.today().year
+    response = logged_in_client.post('/booking/confirm', data={
+        'showing_id': str(SHOWING_ID),
+        'selected_seats': ['20'],
+        'booker_email': 'alice@example.com',
+        'booker_first_name': 'Alice',
+        'booker_last_name': 'Martin',
+        'spectator_0_first_name': 'Alice',
+        'spectator_0_last_name': 'Martin',
+        'spectator_0_birth_date': f"{birth_year - 30}-01-01",
+    })
+
+    assert response.status_code == 302
+    with logged_in_client.session_transaction() as session:
+        assert session['_flashes'] == [('success', 'Booking confirmed successfully! Your confirmation email with your tickets is on its way.')]
+
+    assert done.wait(10)
+    thread_name, pdf_header = sent[0]
+    assert thread_name.startswith('email')
+    assert pdf_header == b'%PDF'
@@ -0,0 +1,75 @@
+"""
+Tests for the MySQL type conversion of CinemaConverter.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+import mysql.connector
+from mysql.connector.constants import FieldType
+from src.database.database_converter import CinemaConverter, uses_converter_class
+from src.database.database_pool import TrackedCursor
+
+
+def _field(name, field_type):
+    return (name, field_type, None, None, None, None, True, 0, 0)
+
+
+def test_time_and_decimal_columns_are_returned_as_floats():
+    converter = CinemaConverter()
+    fields = [
+        _field('starttime', FieldType.TIME),
+        _field('price', FieldType.NEWDECIMAL),
+        _field('factor', FieldType.DECIMAL),
+    ]
+
+    starttime, price, factor = converter.row_to_python((b'20:30:00', b'12.50', b'0.75'), fields)
+
+    assert starttime == 20 * 3600 + 30 * 60 and isinstance(starttime, float)
+    assert price == 12.5 and isinstance(price, float)
+    assert factor == 0.75 and isinstance(factor, float)
+
+
+def test_null_values_are_not_converted():
+    converter = CinemaConverter()
+
+    assert converter.row_to_python((None, None), [_field('starttime', FieldType.TIME), _field('price', FieldType.NEWDECIMAL)]) == (None, None)
+
+
+class NativeCursor:
+    """Cursor returning rows as the C extension converts them natively."""
+
+    description = [_field('starttime', FieldType.TIME), _field('price', FieldType.NEWDECIMAL),
+                   _field('name', FieldType.VAR_STRING)]
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def execute(self, operation, params=None):
+        pass
+
+    def fetchone(self):
+        return self._rows[0]
+
+    def fetchall(self):
+        return list(self._rows)
+
+
+def test_native_rows_get_their_time_and_decimal_columns_converted():
+    rows = [(timedelta(hours=20, minutes=30), Decimal('12.50'), 'Movie'), (None, None, 'Other')]
+    cursor = TrackedCursor(NativeCursor(rows), native_types=True)
+    cursor.execute("SELECT starttime, price, name FROM showing")
+
+    assert cursor.fetchall() == [(73800.0, 12.5, 'Movie'), (None, None, 'Other')]
+
+    cursor = TrackedCursor(NativeCursor([{'starttime': timedelta(hours=1), 'price': Decimal('3'), 'name': 'Movie'}]),
+                           native_types=True)
+    cursor.execute("SELECT starttime, price, name FROM showing")
+
+    row = cursor.fetchone()
+    assert row == {'starttime': 3600.0, 'price': 3.0, 'name': 'Movie'}
+    assert isinstance(row['price'], float)
+
+
+def test_converter_class_is_only_used_by_the_pure_python_connector():
+    assert uses_converter_class({'use_pure': True})
+    assert uses_converter_class({'use_pure': False}) == (not mysql.connector.HAVE_CEXT)
@@ -0,0 +1,50 @@
+"""
+Tests for database call metrics and the slow call EXPLAIN queue.
+"""
+
+import threading
+from src.database import database_metrics
+from src.database.database_metrics import ExplainQueue
+
+
+def test_explain_queue_drops_calls_when_full(monkeypatch):
+    release = threading.Event()
+    running = []
+    explained = []
+    lock = threading.Lock()
+
+    def explain(name, statements):
+        with lock:
+            running.append(name)
+            concurrent = len(running)
+        release.wait(5)
+        with lock:
+            running.remove(name)
+            explained.append((name, concurrent))
+
+    monkeypatch.setattr(database_metrics, '_explain_statements', explain)
+    queue = ExplainQueue(max_pending=2)
+
+    accepted = [queue.submit(f"call_{index}", [("SELECT 1", None)]) for index in range(5)]
+    release.set()
+    queue._executor.shutdown(wait=True)
+
+    assert accepted == [True, True, False, False, False]
+    assert queue.dropped == 3
+    # One worker: EXPLAINs never run concurrently
+    assert explained == [('call_0', 1), ('call_1', 1)]
+
+
+def test_slow_call_is_explained_through_the_queue(monkeypatch):
+    submitted = []
+    monkeypatch.setattr(database_metrics.config, 'DB_METRICS_ENABLED', True)
+    monkeypatch.setattr(database_metrics.config, 'DB_SLOW_QUERY_MS', 0)
+    monkeypatch.setattr(database_metrics.config, 'DB_SLOW_QUERY_EXPLAIN', True)
+    monkeypatch.setattr(database_metrics.explain_queue, 'submit', lambda name, statements: submitted.append((name, statements)))
+
+    with database_metrics.track_call('slow_function') as set_result:
+        database_metrics.record_statement("SELECT * FROM showing WHERE id = %s", (1,))
+        database_metrics.record_statement("UPDATE showing SET baseprice = 0", None)
+        set_result([])
+
+    assert submitted == [('slow_function', [("SELECT * FROM showing WHERE id = %s", (1,))])]
@@ -0,0 +1,31 @@
+"""
+Tests for selecting the migrations to apply.
+"""
+
+import pytest
+from src.database import database_migrate
+from tests.fakes import FakeDatabase
+
+
+@pytest.fixture
+def migration_db(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(database_migrate, '_connect', database.connect)
+    return database
+
+
+@pytest.mark.parametrize('target', ['0004', '4', '0004_hot_path_indexes'])
+def test_upgrade_applies_the_target_migration_itself(migration_db, target):
+    applied = database_migrate.upgrade(target)
+
+    assert applied == [version for version, path in database_migrate.list_migrations()
+                       if database_migrate.migration_number(version) <= 4]
+    assert applied[-1] == '0004_hot_path_indexes'
+
+
+def test_unknown_target_is_rejected_before_connecting(migration_db):
+    with pytest.raises(ValueError):
+        database_migrate.upgrade('0004_hot')
+
+    assert migration_db.connections_opened == 0
+    assert database_migrate.main(['upgrade', '--target', '99']) == 1
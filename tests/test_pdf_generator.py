@@ -0,0 +1,67 @@
+"""
+Tests for building booking PDFs from several threads with the shared generator.
+"""
+
+import datetime
+import threading
+import types
+import pytest
+from reportlab import rl_config
+from src import pdf_generator as pdf_generator_module
+from src.pdf_generator import STATIC_PARAGRAPHS, create_pdf_generator
+
+GENERATED_AT = datetime.datetime(2026, 1, 15, 18, 30)
+
+
+class FixedDatetime(datetime.datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return GENERATED_AT
+
+
+@pytest.fixture(autouse=True)
+def reproducible_pdfs(monkeypatch):
+    """Same bytes for the same booking: fixed timestamps and document id"""
+    monkeypatch.setattr(rl_config, 'invariant', 1)
+    monkeypatch.setattr(pdf_generator_module, 'datetime', types.SimpleNamespace(
+        datetime=FixedDatetime, date=datetime.date, time=datetime.time, timedelta=datetime.timedelta))
+
+
+def _booking(booking_id, ticket_count):
+    booking_data = {
+        'id': booking_id, 'movie_name': f"Movie {booking_id}", 'room_name': 'Room 1',
+        'date': datetime.date(2026, 2, 1), 'starttime': 72000.0, 'duration': 120,
+        'end_at': datetime.datetime(2026, 2, 1, 22, 0), 'price': 10.0 * ticket_count,
+        'booker_name': 'Alice Martin', 'booker_email': 'alice@example.com',
+    }
+    tickets_data = [{'id': number, 'seat_number': f"C{number}", 'seat_type': 'standard', 'price': 10.0}
+                    for number in range(1, ticket_count + 1)]
+    return booking_data, tickets_data
+
+
+def test_concurrent_builds_match_sequential_builds():
+    generator = create_pdf_generator()
+    # Two to five pages, so page breaks fall around the shared title, separator and footer paragraphs
+    bookings = [[_booking(ticket_count, ticket_count) for ticket_count in range(first, 15, 2)] for first in (1, 2)]
+    expected = [[generator.generate_booking_pdf(*booking).getvalue() for booking in thread_bookings]
+                for thread_bookings in bookings]
+    assert all(pdf.startswith(b'%PDF') for thread_pdfs in expected for pdf in thread_pdfs)
+
+    results = {0: [], 1: []}
+    start = threading.Barrier(2)
+
+    def build(index):
+        start.wait()
+        for run in range(5):
+            results[index].append([generator.generate_booking_pdf(*booking).getvalue() for booking in bookings[index]])
+
+    threads = [threading.Thread(target=build, args=(index,)) for index in (0, 1)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for index in (0, 1):
+        assert results[index] == [expected[index]] * 5
+    # The prebuilt paragraphs never get the layout state of a build
+    assert not hasattr(STATIC_PARAGRAPHS['title'], 'blPara')
@@ -0,0 +1,50 @@
+"""
+Tests for serving posters the poster file store could not write.
+"""
+
+import hashlib
+import pytest
+from src.poster_cache import PosterCache
+from src.poster_store import PosterFileStore
+
+IMAGE_DATA = b'\x89PNG poster bytes'
+
+
+class ReadOnlyPosterStore(PosterFileStore):
+    """Poster file store on a disk that can't be written."""
+
+    def put(self, data):
+        raise OSError("No space left on device")
+
+
+@pytest.fixture
+def read_only_store(tmp_path):
+    return ReadOnlyPosterStore(str(tmp_path / 'store'))
+
+
+def _loader():
+    return {'image_data': IMAGE_DATA, 'mime_type': 'image/png', 'content_hash': None}
+
+
+def test_poster_is_served_from_memory_when_the_store_cannot_be_written(tmp_path, read_only_store):
+    cache = PosterCache(str(tmp_path / 'cache'), 1024 * 1024, read_only_store)
+
+    image = cache.get(1, _loader)
+
+    assert image.data == IMAGE_DATA
+    assert image.content_hash == hashlib.sha256(IMAGE_DATA).hexdigest()
+    assert cache.get(1, lambda: None) is image
+
+
+def test_accel_redirect_is_only_used_for_stored_images(app, client, fake_db, tmp_path, read_only_store, monkeypatch):
+    import app as app_module
+    monkeypatch.setattr(app_module, 'poster_cache', PosterCache(str(tmp_path / 'cache'), 1024 * 1024, read_only_store))
+    monkeypatch.setattr(app_module, 'poster_store', read_only_store)
+    monkeypatch.setattr(app_module.config, 'POSTER_ACCEL_REDIRECT_PREFIX', '/protected/posters')
+    fake_db.on(r'FROM movieposter', rows=[{'image': IMAGE_DATA, 'mime_type': 'image/png', 'content_hash': None}])
+
+    response = client.get('/poster/1')
+
+    assert response.status_code == 200
+    assert 'X-Accel-Redirect' not in response.headers
+    assert response.data == IMAGE_DATA
@@ -0,0 +1,75 @@
+"""
+Tests for the background generation of poster derivatives.
+"""
+
+import threading
+import types
+from concurrent.futures import ThreadPoolExecutor
+from src import poster_derivatives
+from src.poster_cache import PosterImage
+from src.poster_derivatives import PosterDerivativeStore
+
+IMAGE = PosterImage('a' * 64, 'image/png', b'png')
+
+
+def test_a_missing_variant_is_rendered_in_the_background(tmp_path, monkeypatch):
+    release = threading.Event()
+    rendered = []
+
+    def render(source_data, output_dir, widths):
+        release.wait(5)
+        for width in widths:
+            (tmp_path / IMAGE.content_hash).mkdir(exist_ok=True)
+            (tmp_path / IMAGE.content_hash / f"{width}.webp").write_bytes(b'webp')
+        rendered.append(widths)
+
+    monkeypatch.setattr(poster_derivatives, 'render_derivatives', render)
+    store = PosterDerivativeStore(str(tmp_path), [160, 320], max_workers=1)
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(store, '_get_executor', lambda: executor)
+
+    # The request doesn't wait for the rendering, the caller serves the original
+    assert store.get_path(IMAGE, 200, accept_webp=True) is None
+    assert store.get_path(IMAGE, 200, accept_webp=True) is None
+
+    release.set()
+    executor.shutdown(wait=True)
+
+    assert rendered == [(160, 320)]
+    assert store.get_path(IMAGE, 200, accept_webp=True) == (str(tmp_path / IMAGE.content_hash / '320.webp'), 'image/webp')
+
+
+def test_a_failed_rendering_is_not_resubmitted_until_its_ttl_expires(tmp_path, monkeypatch):
+    clock = types.SimpleNamespace(now=1000.0)
+    submitted = []
+
+    def render(source_data, output_dir, widths):
+        submitted.append(widths)
+        raise OSError("cannot identify image file")
+
+    monkeypatch.setattr(poster_derivatives, 'render_derivatives', render)
+    monkeypatch.setattr(poster_derivatives, 'time', types.SimpleNamespace(monotonic=lambda: clock.now))
+    store = PosterDerivativeStore(str(tmp_path), [160, 320], max_workers=1, failure_ttl_seconds=60)
+    executors = []
+
+    def get_executor():
+        executors.append(ThreadPoolExecutor(max_workers=1))
+        return executors[-1]
+
+    monkeypatch.setattr(store, '_get_executor', get_executor)
+
+    assert store.get_path(IMAGE, 200, accept_webp=True) is None
+    # Joining the worker also waits for the done callback
+    executors[-1].shutdown(wait=True)
+    assert len(submitted) == 1
+
+    # The failure is remembered: the corrupt poster is served as is, without rendering it again
+    clock.now += 59
+    assert store.get_path(IMAGE, 200, accept_webp=True) is None
+    assert store._pending == {}
+    assert len(submitted) == 1
+
+    clock.now += 2
+    assert store.get_path(IMAGE, 200, accept_webp=True) is None
+    executors[-1].shutdown(wait=True)
+    assert len(submitted) == 2
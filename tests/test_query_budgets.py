@@ -0,0 +1,70 @@
+"""
+Query budget tests for the routes decorated with query_budget.
+
+The testing configuration enables DB_QUERY_BUDGET_STRICT, so a request
+running more statements than its route's budget raises QueryBudgetExceeded.
+"""
+
+from datetime import date, timedelta
+import pytest
+from src.database import QueryBudgetExceeded
+from tests.conftest import SHOWING_ID
+
+
+def _budget(app, endpoint):
+    return app.view_functions[endpoint].query_budget[0]
+
+
+def _statements(response):
+    return int(response.headers['X-DB-Statements'])
+
+
+def test_movies_listing_stays_within_budget(app, client, cinema_db):
+    day = (date.today() + timedelta(days=1)).isoformat()
+
+    response = client.get(f"/movies?date={day}", headers={'X-Requested-With': 'XMLHttpRequest'})
+
+    assert response.status_code == 200
+    assert len(response.get_json()['movies']) == 12
+    assert _statements(response) <= _budget(app, 'movies')
+
+
+def test_seat_map_stays_within_budget(app, logged_in_client, cinema_db):
+    response = logged_in_client.get(f"/showing/{SHOWING_ID}/seats")
+
+    assert response.status_code == 200
+    assert _statements(response) <= _budget(app, 'showing_seats')
+
+
+def test_booking_confirmation_stays_within_budget(app, logged_in_client, cinema_db, monkeypatch, tmp_path):
+    import app as app_module
+    monkeypatch.setattr(app_module.pdf_cache, 'cache_dir', str(tmp_path))
+    monkeypatch.setattr(app_module, 'send_booking_confirmation_email', lambda **kwargs: True)
+
+    birth_year = date.today().year
+    response = logged_in_client.post('/booking/confirm', data={
+        'showing_id': str(SHOWING_ID),
+        'selected_seats': ['20', '21'],
+        'booker_email': 'alice@example.com',
+        'booker_first_name': 'Alice',
+        'booker_last_name': 'Martin',
+        'spectator_0_first_name': 'Alice',
+        'spectator_0_last_name': 'Martin',
+        'spectator_0_birth_date': f"{birth_year - 30}-01-01",
+        'spectator_1_first_name': 'Bob',
+        'spectator_1_last_name': 'Martin',
+        'spectator_1_birth_date': f"{birth_year - 8}-01-01",
+    })
+
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith('/tickets')
+    assert cinema_db.count(r'INSERT INTO seatreservation') == 1
+    assert _statements(response) <= _budget(app, 'booking_confirm')
+
+
+def test_exceeding_a_budget_fails_the_request(app, client, cinema_db, monkeypatch):
+    day = (date.today() + timedelta(days=1)).isoformat()
+    monkeypatch.setattr(app.view_functions['movies'], 'query_budget', (1, None))
+
+    with pytest.raises(QueryBudgetExceeded):
+        client.get(f"/movies?date={day}", headers={'X-Requested-With': 'XMLHttpRequest'})
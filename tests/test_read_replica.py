@@ -0,0 +1,89 @@
+"""
+Tests for routing reads to the read replica and read-your-writes stickiness.
+"""
+
+import types
+import pytest
+from flask import Flask, session
+from src.database import database as database_core
+from src.database.database import get_db_connection
+from src.database.database_pool import ElasticConnectionPool
+from tests.fakes import FakeDatabase
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+def _pool(database, name):
+    pool = ElasticConnectionPool({}, pool_name=name, pool_size=2, max_overflow=0, pool_timeout=5)
+    pool._connect = database.connect
+    return pool
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(database_core, 'time', types.SimpleNamespace(time=clock.time))
+    return clock
+
+
+@pytest.fixture
+def databases(monkeypatch):
+    primary, replica = FakeDatabase(), FakeDatabase()
+    monkeypatch.setattr(database_core, 'connection_pool', _pool(primary, 'primary_pool'))
+    monkeypatch.setattr(database_core, 'replica_pool', _pool(replica, 'replica_pool'))
+    monkeypatch.setattr(database_core.config, 'DB_REQUEST_SCOPED_CONNECTION', False)
+    return primary, replica
+
+
+@pytest.fixture
+def request_context():
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    with app.test_request_context():
+        yield
+
+
+def _read():
+    with get_db_connection(readonly=True) as conn:
+        conn.cursor().execute("SELECT 1")
+
+
+def _write():
+    with get_db_connection() as conn:
+        conn.cursor().execute("UPDATE account SET first_name = 'Alice'")
+        conn.commit()
+
+
+def test_reads_use_the_replica_until_the_user_writes(databases, clock, request_context, monkeypatch):
+    monkeypatch.setattr(database_core.config, 'DB_READ_YOUR_WRITES_SECONDS', 5)
+    primary, replica = databases
+
+    _read()
+    assert (primary.count(), replica.count()) == (0, 1)
+
+    _write()
+    _read()
+    # Sticky: the user's read after a write goes to the primary
+    assert (primary.count(), replica.count()) == (2, 1)
+
+    clock.now += 6
+    _read()
+    assert (primary.count(), replica.count()) == (2, 2)
+
+
+def test_writes_leave_the_session_alone_without_a_replica(databases, clock, request_context, monkeypatch):
+    monkeypatch.setattr(database_core, 'replica_pool', None)
+    primary, replica = databases
+
+    _write()
+    _read()
+
+    assert primary.count() == 2
+    assert '_db_primary_until' not in session
+    assert not session.modified
@@ -0,0 +1,65 @@
+"""
+Query-count regression tests for the daily schedule loader.
+"""
+
+from datetime import date, datetime, timedelta
+import pytest
+from src.database import database_retrieve
+from src.database.database_retrieve import get_movies_with_showings_by_date
+
+
+def _schedule_rows(day, movie_count, showings_per_movie):
+    rows = []
+    for movie_id in range(1, movie_count + 1):
+        for number in range(showings_per_movie):
+            start_seconds = (14 + 2 * number) * 3600
+            start_at = datetime.combine(day, datetime.min.time()) + timedelta(seconds=start_seconds)
+            rows.append({
+                'id': movie_id,
+                'name': f"Movie {movie_id:02d}",
+                'duration': 120,
+                'showing_id': movie_id * 100 + number,
+                'showing_date': day,
+                'showing_starttime': float(start_seconds),
+                'showing_baseprice': 1000,
+                'showing_room_id': 1,
+                'showing_end_at': start_at + timedelta(minutes=120),
+            })
+    return rows
+
+
+def test_schedule_loads_every_movie_in_one_query(fake_db):
+    day = date.today() + timedelta(days=1)
+    fake_db.on(r'FROM showing s\s+INNER JOIN movie m', rows=_schedule_rows(day, movie_count=30, showings_per_movie=4))
+
+    movies = get_movies_with_showings_by_date(day.isoformat())
+
+    assert fake_db.count() == 1
+    assert len(movies) == 30
+    assert [movie['name'] for movie in movies] == [f"Movie {movie_id:02d}" for movie_id in range(1, 31)]
+    assert all(len(movie['showings']) == 4 for movie in movies)
+    assert movies[0]['showings'][0]['id'] == 100
+
+
+def test_cached_schedule_runs_no_query(fake_db):
+    day = date.today() + timedelta(days=1)
+    fake_db.on(r'FROM showing s\s+INNER JOIN movie m', rows=_schedule_rows(day, movie_count=5, showings_per_movie=2))
+
+    get_movies_with_showings_by_date(day.isoformat())
+    fake_db.reset_counts()
+    movies = get_movies_with_showings_by_date(day.isoformat())
+
+    assert fake_db.count() == 0
+    assert len(movies) == 5
+
+
+@pytest.mark.parametrize('row_models', [False, True])
+def test_callers_cannot_change_the_cached_schedule(fake_db, monkeypatch, row_models):
+    monkeypatch.setattr(database_retrieve.config, 'DB_ROW_MODELS', row_models)
+    day = date.today() + timedelta(days=1)
+    fake_db.on(r'FROM showing s\s+INNER JOIN movie m', rows=_schedule_rows(day, movie_count=1, showings_per_movie=1))
+
+    showing = get_movies_with_showings_by_date(day.isoformat())[0]['showings'][0]
+    showing['baseprice'] = 0
+
+    assert get_movies_with_showings_by_date(day.isoformat())[0]['showings'][0]['baseprice'] == 1000
@@ -0,0 +1,187 @@
+"""
+Tests for temporary seat holds and the hold checks of the booking routes.
+
+The hold manager's clock is replaced by a fake one, so expiry is driven by
+the tests rather than by sleeping.
+"""
+
+import threading
+import types
+import pytest
+from src import seat_holds
+from src.seat_holds import SeatHoldManager, seat_hold_manager
+from tests.conftest import SHOWING_ID
+
+TTL_SECONDS = 600
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(seat_holds, 'time', types.SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+@pytest.fixture
+def holds(clock, monkeypatch):
+    """The global hold manager, emptied, as the routes and queries use it"""
+    monkeypatch.setattr(seat_hold_manager, 'ttl_seconds', TTL_SECONDS)
+    monkeypatch.setattr(seat_hold_manager, '_holds', {})
+    monkeypatch.setattr(seat_hold_manager, '_seats_by_showing', {})
+    monkeypatch.setattr(seat_hold_manager, '_expiry_buckets', {})
+    return seat_hold_manager
+
+
+def test_two_holders_compete_for_one_seat(clock):
+    manager = SeatHoldManager(ttl_seconds=TTL_SECONDS)
+
+    assert manager.hold(SHOWING_ID, [1, 2], 'alice')
+    assert not manager.hold(SHOWING_ID, [2, 3], 'bob')
+    assert manager.hold(SHOWING_ID, [3], 'bob')
+
+    assert manager.get_held_seat_ids(SHOWING_ID, exclude_holder='bob') == {1, 2}
+    assert manager.is_any_held(SHOWING_ID, [2], exclude_holder='bob')
+    assert not manager.is_any_held(SHOWING_ID, [2], exclude_holder='alice')
+
+
+def test_only_one_of_many_concurrent_holders_gets_a_seat(clock):
+    manager = SeatHoldManager(ttl_seconds=TTL_SECONDS)
+    start = threading.Barrier(8)
+    results = []
+
+    def hold(holder):
+        start.wait()
+        results.append((holder, manager.hold(SHOWING_ID, [5], holder)))
+
+    threads = [threading.Thread(target=hold, args=(f"holder-{index}",)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    winners = [holder for holder, held in results if held]
+    assert len(winners) == 1
+    assert manager.get_held_seat_ids(SHOWING_ID) == {5}
+    assert not manager.is_any_held(SHOWING_ID, [5], exclude_holder=winners[0])
+
+
+def test_expired_hold_can_be_taken_over_and_is_swept(clock):
+    manager = SeatHoldManager(ttl_seconds=TTL_SECONDS)
+    assert manager.hold(SHOWING_ID, [1, 2], 'alice')
+
+    clock.advance(TTL_SECONDS + 1)
+    assert manager.get_held_seat_ids(SHOWING_ID) == set()
+    assert manager.hold(SHOWING_ID, [2], 'bob')
+    assert not manager.hold(SHOWING_ID, [2], 'alice')
+
+    # Alice's bucket is due: her seat 1 goes, bob's later hold on seat 2 stays
+    assert manager.sweep() == 1
+    assert manager.get_held_seat_ids(SHOWING_ID) == {2}
+
+    clock.advance(TTL_SECONDS + 1)
+    assert manager.sweep() == 1
+    assert manager.get_held_seat_ids(SHOWING_ID) == set()
+
+
+def test_holding_again_replaces_and_release_drops_the_holders_seats(clock):
+    manager = SeatHoldManager(ttl_seconds=TTL_SECONDS)
+    assert manager.hold(SHOWING_ID, [1, 2], 'alice')
+    assert manager.hold(SHOWING_ID, [3], 'bob')
+
+    assert manager.hold(SHOWING_ID, [4], 'alice')
+    assert manager.get_held_seat_ids(SHOWING_ID) == {3, 4}
+
+    manager.release(SHOWING_ID, 'alice')
+    assert manager.get_held_seat_ids(SHOWING_ID) == {3}
+
+
+def _client(app, session_token):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['logged_in'] = True
+        session['user_id'] = 7
+        session['username'] = 'alice'
+        session['session_token'] = session_token
+    return client
+
+
+def _pick_seats(client, seat_ids):
+    return client.post('/booking/spectators', data={'showing_id': str(SHOWING_ID), 'selected_seats': seat_ids})
+
+
+def _confirm(client, seat_ids):
+    return client.post('/booking/confirm', data={
+        'showing_id': str(SHOWING_ID),
+        'selected_seats': seat_ids,
+        'booker_email': 'alice@example.com',
+        'booker_first_name': 'Alice',
+        'booker_last_name': 'Martin',
+        'spectator_0_first_name': 'Alice',
+        'spectator_0_last_name': 'Martin',
+        'spectator_0_birth_date': '1990-01-01',
+    })
+
+
+def _flashes(client):
+    with client.session_transaction() as session:
+        return session.pop('_flashes', [])
+
+
+@pytest.fixture
+def sessions(app, cinema_db, holds, monkeypatch, tmp_path):
+    import app as app_module
+    monkeypatch.setattr(app_module.pdf_cache, 'cache_dir', str(tmp_path))
+    monkeypatch.setattr(app_module, 'send_booking_confirmation_email', lambda **kwargs: True)
+    return _client(app, 'first-session'), _client(app, 'second-session')
+
+
+def test_seat_held_by_another_session_cannot_be_picked(sessions, holds):
+    first, second = sessions
+
+    assert _pick_seats(first, ['20']).status_code == 200
+    response = _pick_seats(second, ['20'])
+
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith(f"/showing/{SHOWING_ID}/seats")
+    assert _flashes(second) == [('error', 'Some selected seats are no longer available.')]
+    assert holds.get_held_seat_ids(SHOWING_ID) == {20}
+
+
+def test_confirm_is_rejected_while_another_session_holds_the_seat(sessions, cinema_db):
+    first, second = sessions
+    assert _pick_seats(first, ['20']).status_code == 200
+
+    response = _confirm(second, ['20'])
+
+    assert response.status_code == 302
+    assert _flashes(second) == [('error', 'Booking failed. Some seats are no longer available.')]
+    assert cinema_db.count(r'INSERT INTO booking') == 0
+
+
+def test_expired_hold_is_taken_over_and_released_after_booking(sessions, cinema_db, clock, holds):
+    first, second = sessions
+    assert _pick_seats(first, ['20']).status_code == 200
+
+    clock.advance(TTL_SECONDS + 1)
+    assert _pick_seats(second, ['20']).status_code == 200
+
+    # The first session's hold is gone, it can't book the seat any more
+    _confirm(first, ['20'])
+    assert _flashes(first) == [('error', 'Booking failed. Some seats are no longer available.')]
+    assert cinema_db.count(r'INSERT INTO booking') == 0
+
+    response = _confirm(second, ['20'])
+    assert response.headers['Location'].endswith('/tickets')
+    assert cinema_db.count(r'INSERT INTO booking') == 1
+    assert holds.get_held_seat_ids(SHOWING_ID) == set()
@@ -0,0 +1,63 @@
+"""
+Tests for the room layout and occupancy bitmap cache.
+"""
+
+from src.database.database_cache import RoomLayout, SeatMapCache
+
+SHOWING_ID = 10
+LAYOUT = RoomLayout(1, [(seat_id, 'standard', 1, seat_id) for seat_id in range(1, 6)])
+
+
+def _occupied(layout, bitmap):
+    return {seat[0] for position, seat in enumerate(layout.seats) if (bitmap >> position) & 1}
+
+
+def test_reload_drops_freed_seats():
+    cache = SeatMapCache(layout_ttl_seconds=3600, occupancy_ttl_seconds=0, max_showings=10)
+
+    assert _occupied(LAYOUT, cache.get_occupancy(SHOWING_ID, LAYOUT, lambda: [1, 2])) == {1, 2}
+    # Seat 2 was freed in the database
+    assert _occupied(LAYOUT, cache.get_occupancy(SHOWING_ID, LAYOUT, lambda: [1])) == {1}
+
+
+def test_seats_marked_during_a_load_are_kept():
+    cache = SeatMapCache(layout_ttl_seconds=3600, occupancy_ttl_seconds=60, max_showings=10)
+
+    def load_reserved_seats():
+        # A booking commits after the reservations were read
+        cache.mark_occupied(SHOWING_ID, [3])
+        return [1]
+
+    assert _occupied(LAYOUT, cache.get_occupancy(SHOWING_ID, LAYOUT, load_reserved_seats)) == {1, 3}
+    assert _occupied(LAYOUT, cache.get_occupancy(SHOWING_ID, LAYOUT, lambda: [])) == {1, 3}
+
+
+def test_mark_occupied_updates_the_cached_bitmap():
+    cache = SeatMapCache(layout_ttl_seconds=3600, occupancy_ttl_seconds=60, max_showings=10)
+    cache.get_occupancy(SHOWING_ID, LAYOUT, lambda: [1])
+
+    cache.mark_occupied(SHOWING_ID, [4])
+
+    assert _occupied(LAYOUT, cache.get_occupancy(SHOWING_ID, LAYOUT, lambda: [])) == {1, 4}
+
+
+def test_room_of_a_showing_expires_and_can_be_invalidated():
+    loads = []
+
+    def load_room():
+        loads.append(1)
+        return 1
+
+    cache = SeatMapCache(layout_ttl_seconds=3600, occupancy_ttl_seconds=60, max_showings=10)
+    cache.get_room_id(SHOWING_ID, load_room)
+    cache.get_room_id(SHOWING_ID, load_room)
+    assert len(loads) == 1
+
+    cache.invalidate_showing(SHOWING_ID)
+    cache.get_room_id(SHOWING_ID, load_room)
+    assert len(loads) == 2
+
+    expiring = SeatMapCache(layout_ttl_seconds=0, occupancy_ttl_seconds=60, max_showings=10)
+    expiring.get_room_id(SHOWING_ID, load_room)
+    expiring.get_room_id(SHOWING_ID, load_room)
+    assert len(loads) == 4
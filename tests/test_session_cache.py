@@ -0,0 +1,69 @@
+"""
+Tests for session validation caching and logout invalidation.
+"""
+
+from datetime import datetime, timedelta
+from src.database.database_cache import session_cache
+from src.database.database_modify import invalidate_session_token
+from src.database.database_retrieve import validate_session_token
+
+TOKEN = 'test-session-token'
+
+
+def _session_row():
+    return {
+        'account_id': 7,
+        'expires_at': datetime.now() + timedelta(hours=1),
+        'ip_address': '127.0.0.1',
+        'user_agent': 'pytest',
+        'username': 'alice',
+        'email': 'alice@example.com',
+        'first_name': 'Alice',
+        'last_name': 'Martin',
+        'birthday': None,
+    }
+
+
+def test_validated_session_is_cached_without_the_token(fake_db):
+    fake_db.on(r'FROM account_session s', rows=[_session_row()])
+
+    first = validate_session_token(TOKEN)
+    second = validate_session_token(TOKEN)
+
+    assert fake_db.count(r'FROM account_session s') == 1
+    assert first == second
+    assert 'session_token' not in second
+
+
+def test_logout_wins_over_a_concurrent_validation(fake_db):
+    active = {'value': True}
+    fake_db.on(r'FROM account_session s', handler=lambda conn, operation, params: [_session_row()] if active['value'] else [])
+
+    def deactivate(conn, operation, params):
+        # Another request validates the token while the UPDATE is not committed yet
+        assert validate_session_token(TOKEN) is not None
+        active['value'] = False
+
+    fake_db.on(r'UPDATE account_session', handler=deactivate)
+
+    assert invalidate_session_token(TOKEN) is True
+    assert validate_session_token(TOKEN) is None
+
+
+def test_validation_read_before_logout_is_not_cached_after_it(fake_db, monkeypatch):
+    active = {'value': True}
+    fake_db.on(r'FROM account_session s', handler=lambda conn, operation, params: [_session_row()] if active['value'] else [])
+    fake_db.on(r'UPDATE account_session', handler=lambda conn, operation, params: active.update(value=False))
+    real_put = session_cache.put
+
+    def put_after_logout(session_token, session_data, generation=None):
+        # The validation read the active row, then the whole logout commits before it caches it
+        assert invalidate_session_token(TOKEN) is True
+        real_put(session_token, session_data, generation)
+
+    monkeypatch.setattr(session_cache, 'put', put_after_logout)
+    assert validate_session_token(TOKEN) is not None
+    monkeypatch.setattr(session_cache, 'put', real_put)
+
+    assert session_cache.get(TOKEN) is None
+    assert validate_session_token(TOKEN) is None
@@ -0,0 +1,79 @@
+"""
+Tests for showing expiry when the precomputed end_at column is NULL.
+"""
+
+from datetime import date, datetime, timedelta
+import pytest
+from src.database.database_retrieve import (
+    SHOWING_END_AT_SQL,
+    encode_booking_cursor,
+    get_booking_totals_by_account_id,
+    get_bookings_by_account_id,
+    get_movies_with_showings_by_date,
+    is_showing_expired,
+)
+
+
+def _showing(day, start_seconds, end_at=None):
+    return {'date': day, 'starttime': float(start_seconds), 'duration': 120, 'end_at': end_at}
+
+
+def test_end_at_is_used_when_present():
+    now = datetime.now()
+
+    assert is_showing_expired({'end_at': now - timedelta(minutes=1)})
+    assert not is_showing_expired({'end_at': now + timedelta(minutes=1)})
+
+
+def test_null_end_at_falls_back_to_start_and_duration():
+    today = date.today()
+
+    assert not is_showing_expired(_showing(today + timedelta(days=1), 20 * 3600))
+    assert is_showing_expired(_showing(today - timedelta(days=1), 20 * 3600))
+
+
+def test_null_end_at_accepts_timedelta_start_times():
+    showing = _showing(date.today() + timedelta(days=1), 0)
+    showing['starttime'] = timedelta(hours=20)
+
+    assert not is_showing_expired(showing)
+
+
+def test_showing_without_any_time_is_expired():
+    assert is_showing_expired(None)
+    assert is_showing_expired({'end_at': None})
+
+
+def test_schedule_skips_showings_without_an_end_time(fake_db):
+    day = date.today() + timedelta(days=1)
+    start_at = datetime.combine(day, datetime.min.time()) + timedelta(hours=20)
+    fake_db.on(r'FROM showing s\s+INNER JOIN movie m', rows=[
+        {'id': 1, 'name': 'Movie 1', 'duration': None, 'showing_id': 10, 'showing_date': day,
+         'showing_starttime': 72000.0, 'showing_baseprice': 1000, 'showing_room_id': 1, 'showing_end_at': None},
+        {'id': 2, 'name': 'Movie 2', 'duration': 120, 'showing_id': 20, 'showing_date': day,
+         'showing_starttime': 72000.0, 'showing_baseprice': 1000, 'showing_room_id': 1,
+         'showing_end_at': start_at + timedelta(minutes=120)},
+    ])
+
+    movies = get_movies_with_showings_by_date(day.isoformat())
+
+    assert [movie['name'] for movie in movies] == ['Movie 2']
+
+
+@pytest.mark.parametrize('expired', [False, True])
+def test_ticket_history_queries_fall_back_when_end_at_is_null(fake_db, expired):
+    fake_db.on(r'SELECT COUNT\(\*\) AS bookings', rows=[{'bookings': 0, 'tickets': 0, 'price': 0}])
+
+    get_bookings_by_account_id(7, expired=expired)
+    get_booking_totals_by_account_id(7, expired=expired)
+
+    statements = [operation for operation, params in fake_db.executed]
+    assert len(statements) == 2
+    assert all(f"WHERE b.account_id = %s AND {SHOWING_END_AT_SQL}" in statement for statement in statements)
+
+
+def test_booking_cursor_falls_back_to_date_and_start_time():
+    booking = {'id': 5, 'start_at': None, 'date': date(2026, 2, 1), 'starttime': 72000.0}
+
+    assert encode_booking_cursor(booking) == '2026-02-01T20:00:00_5'
+    assert encode_booking_cursor({'id': 5, 'start_at': None, 'date': None, 'starttime': None}) is None
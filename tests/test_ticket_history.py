@@ -0,0 +1,45 @@
+"""
+Tests for the ticket history pages.
+"""
+
+from datetime import date, datetime, timedelta
+import pytest
+
+ACCOUNT_ID = 7
+
+
+@pytest.fixture
+def history_db(fake_db):
+    """Fake database holding 25 upcoming bookings, more than one page"""
+    day = date.today() + timedelta(days=1)
+    start_at = datetime.combine(day, datetime.min.time()) + timedelta(hours=20)
+
+    fake_db.on(r'FROM account_session s', rows=[{
+        'account_id': ACCOUNT_ID, 'expires_at': datetime.now() + timedelta(hours=1),
+        'ip_address': '127.0.0.1', 'user_agent': 'pytest', 'username': 'alice',
+        'email': 'alice@example.com', 'first_name': 'Alice', 'last_name': 'Martin', 'birthday': None,
+    }])
+    fake_db.on(r'SELECT COUNT\(\*\) AS bookings', rows=[{'bookings': 25, 'tickets': 50, 'price': 500.0}])
+    fake_db.on(r'FROM booking b\s+JOIN showing s', handler=lambda conn, operation, params: [{
+        'id': booking_id, 'price': 20.0, 'account_id': ACCOUNT_ID, 'showing_id': 42, 'num_spectators': 2,
+        'date': day, 'starttime': 72000.0, 'baseprice': 1000, 'start_at': start_at,
+        'end_at': start_at + timedelta(minutes=120), 'movie_name': 'Movie 1', 'duration': 120, 'room_name': 'Room 1',
+        'booker_first_name': 'Alice', 'booker_last_name': 'Martin', 'booker_email': 'alice@example.com',
+    } for booking_id in range(1, params[-1] + 1)])
+    return fake_db
+
+
+def test_summary_totals_cover_every_page(client, history_db):
+    with client.session_transaction() as session:
+        session['logged_in'] = True
+        session['user_id'] = ACCOUNT_ID
+        session['username'] = 'alice'
+        session['session_token'] = 'history-test-token'
+
+    response = client.get('/my-tickets')
+
+    assert response.status_code == 200
+    page = response.get_data(as_text=True)
+    assert '>25</h3>' in page
+    assert '>50</h3>' in page
+    assert '500.00' in page